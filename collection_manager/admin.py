@@ -1,8 +1,17 @@
 # pokemon_tcg_tracker_project/collection_manager/admin.py
 from django.contrib import admin
-from .models import Expansion, Card, UserCard
+from .models import (
+    Expansion, Card, UserCard, ImportCheckpoint, ImportRun, ImportStep, CatalogVersion,
+    UserCollectionStats, UserExpansionStats,
+)
 
 # Register your models here.
 admin.site.register(Expansion)
 admin.site.register(Card)
-admin.site.register(UserCard)
\ No newline at end of file
+admin.site.register(UserCard)
+admin.site.register(ImportCheckpoint)
+admin.site.register(ImportRun)
+admin.site.register(ImportStep)
+admin.site.register(CatalogVersion)
+admin.site.register(UserCollectionStats)
+admin.site.register(UserExpansionStats)
@@ -1,219 +1,573 @@
 # pokemon_tcg_tracker_project/collection_manager/api_service.py
+import contextvars
+import hashlib
+import json
+import math
 import requests
-from .models import Expansion, Card
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from .models import Expansion, Card, ImportCheckpoint
 from django.conf import settings
+from django.db import connection, transaction
+from .catalog_cache import refresh_catalog_blobs
+from .catalog_version import batch_catalog_changes, catalog_changed
+from .completion import index_set_positions
+from .pokemontcg_client import get_client
+from .search import refresh_search_vectors
+from .telemetry import db_timer, track_step
 import logging
 
 logger = logging.getLogger(__name__)
 
-POKEMON_TCG_BASE_URL = "https://api.pokemontcg.io/v2"
-# POKEMON_TCG_API_KEY = getattr(settings, 'POKEMON_TCG_API_KEY', None) # Si la API Key fuera necesaria
+# Las peticiones HTTP (pool de conexiones, caché en disco, API key) las gestiona pokemontcg_client
+
+# Max page size for pokemontcg.io API
+CARDS_PAGE_SIZE = 250
+# Máximo de páginas de cartas pedidas en paralelo una vez conocido totalCount
+PAGE_FETCH_CONCURRENCY = getattr(settings, 'POKEMON_TCG_PAGE_CONCURRENCY', 4)
+
+# Cada cuántas filas se emite la línea de progreso del camino fila a fila
+PROGRESS_LOG_EVERY = 500
+
+# Tamaño de lote para los INSERT ... ON CONFLICT del modo bulk
+BULK_BATCH_SIZE = 500
+
+# Resultado de save_*_to_db: filas creadas, actualizadas y sin cambios (mismo content_hash)
+SyncCounts = namedtuple('SyncCounts', ['created', 'updated', 'unchanged'])
+# Resultado de import_cards_for_expansion: complete=False si alguna página no se pudo descargar
+ImportResult = namedtuple('ImportResult', ['created', 'updated', 'unchanged', 'complete'])
+# Página de cartas producida por iter_card_pages
+CardPage = namedtuple('CardPage', ['page', 'last_page', 'cards'])
+
+# Campos que se sobrescriben cuando la fila ya existe (api_id es la clave del conflicto)
+EXPANSION_UPDATE_FIELDS = ['name', 'series', 'release_date', 'total_cards', 'symbol_url', 'logo_url']
+CARD_UPDATE_FIELDS = [
+    'name', 'expansion', 'rarity', 'image_url_small', 'image_url_large',
+    'hp', 'types', 'abilities', 'attacks', 'weaknesses', 'resistances',
+    'retreat_cost', 'converted_retreat_cost', 'number', 'artist', 'flavor_text', 'hp_value',
+]
 
 def fetch_expansions_from_api():
     """
     Fetches all expansions from the Pokémon TCG API.
     """
-    url = f"{POKEMON_TCG_BASE_URL}/sets"
-    headers = {}
-    # if POKEMON_TCG_API_KEY:
-    #     headers['X-Api-Key'] = POKEMON_TCG_API_KEY
-
     try:
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status() # Raise an HTTPError for bad responses (4xx or 5xx)
-        data = response.json()
+        data = get_client().get_json('/sets', timeout=10)
         return data.get('data', [])
     except requests.exceptions.RequestException as e:
         logger.error(f"Error fetching expansions from API: {e}")
         return []
 
-def save_expansions_to_db(expansions_data):
+def _expansion_fields_from_api(exp_data):
+    """
+    Maps a raw /sets payload to Expansion field values.
+    Returns None when the payload lacks the required ID or name.
+    """
+    api_id = exp_data.get('id')
+    name = exp_data.get('name')
+    series = exp_data.get('series')
+    release_date = exp_data.get('releaseDate') # <-- Obtiene la fecha como string
+    total_cards = exp_data.get('total')
+    symbol_url = exp_data.get('images', {}).get('symbol')
+    logo_url = exp_data.get('images', {}).get('logo')
+
+    if not api_id or not name:
+        logger.warning(f"Skipping expansion due to missing ID or name: {exp_data}")
+        return None
+
+    # Ensure releaseDate is in 'YYYY-MM-DD' format or None
+    if release_date:
+        try:
+            # CUIDADO AQUÍ: Cambia el formato de '%m/%d/%Y' a '%Y/%m/%d'
+            release_date = datetime.strptime(release_date, '%Y/%m/%d').strftime('%Y-%m-%d')
+        except ValueError:
+            logger.warning(f"Invalid release date format for {name}: {release_date}. Setting to None.")
+            release_date = None
+
+    return {
+        'api_id': api_id,
+        'name': name,
+        'series': series,
+        'release_date': release_date,
+        'total_cards': total_cards,
+        'symbol_url': symbol_url,
+        'logo_url': logo_url,
+    }
+
+def _content_hash(fields):
+    """
+    sha256 of the normalized field values mapped from the upstream payload.
+    Stored per row so a resync can tell which rows actually changed.
+    """
+    normalized = json.dumps(fields, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+def _hashed_expansion_fields(exp_data):
+    """
+    Expansion field values plus their content_hash, or None for invalid payloads.
+    """
+    fields = _expansion_fields_from_api(exp_data)
+    if fields:
+        fields['content_hash'] = _content_hash(fields)
+    return fields
+
+def parse_hp(hp):
+    """HP numérico a partir del texto de la API ('120', '60+'...); None si no es un número"""
+    digits = ''.join(ch for ch in str(hp or '') if ch.isdigit())
+    return int(digits) if digits else None
+
+def _hashed_card_fields(card_data, expansion_api_id):
+    """
+    Card field values plus their content_hash, or None for invalid payloads.
+    'expansion' holds the expansion api_id, which is part of the hash.
+    """
+    fields = _card_fields_from_api(card_data)
+    if fields:
+        fields['expansion'] = expansion_api_id
+        fields['content_hash'] = _content_hash(fields)
+        # Derivado de hp: fuera del hash para no reescribir todo el catálogo en el siguiente sync
+        fields['hp_value'] = parse_hp(fields['hp'])
+    return fields
+
+def _split_by_content_hash(model, rows):
     """
-    Saves or updates expansion data in the database.
+    Compares the content_hash of rows (dict keyed by api_id) against the stored hashes in one query.
+    Returns (new_rows, changed_rows, unchanged_count).
+    """
+    stored = dict(
+        model.objects.filter(api_id__in=list(rows)).values_list('api_id', 'content_hash')
+    )
+    new_rows = []
+    changed_rows = []
+    for api_id, row in rows.items():
+        if api_id not in stored:
+            new_rows.append(row)
+        elif stored[api_id] != row['content_hash']:
+            changed_rows.append(row)
+    return new_rows, changed_rows, len(rows) - len(new_rows) - len(changed_rows)
+
+def _bulk_upsert(model, rows, update_fields):
+    """
+    Writes rows (dicts of field values) with INSERT ... ON CONFLICT (api_id) DO UPDATE.
+    """
+    if not rows:
+        return
+    model.objects.bulk_create(
+        [model(**row) for row in rows],
+        batch_size=BULK_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['api_id'],
+        update_fields=update_fields + ['content_hash', 'updated_at'],
+    )
+
+def _catalog_changed(new_rows, changed_rows, expansion_api_ids=(), expansion_list=False):
+    """
+    Bumps the catalog version (HTTP ETags) once the written rows are committed,
+    or once at the end of the run inside batch_catalog_changes(), and rebuilds the
+    cached JSON blobs of what was written (a cache failure never fails the import).
+    """
+    if new_rows or changed_rows:
+        transaction.on_commit(catalog_changed)
+        transaction.on_commit(lambda: refresh_catalog_blobs(expansion_api_ids, expansion_list=expansion_list))
+
+def _refresh_card_search(api_ids):
+    """Recomputes the full-text search document of the written cards"""
+    if api_ids:
+        refresh_search_vectors(Card.objects.filter(api_id__in=api_ids))
+
+def _index_set_positions(expansion_instance, api_ids):
+    """Re-indexes the collector-number positions (completion bitmaps) of the expansion after writing cards"""
+    if api_ids:
+        index_set_positions([expansion_instance.id])
+
+def _log_progress(label, done, total):
+    """Una línea de progreso agregada cada PROGRESS_LOG_EVERY filas (en lugar de una por fila)"""
+    if done % PROGRESS_LOG_EVERY == 0 and done < total:
+        logger.info(f"Saving {label}: {done}/{total} rows written...")
+
+def save_expansions_to_db(expansions_data, bulk=False):
+    """
+    Saves or updates expansion data in the database. Only expansions that are new or whose
+    upstream payload changed (content_hash) are written.
+    With bulk=True they are written in a few INSERT ... ON CONFLICT statements
+    instead of one update_or_create per expansion.
+    Returns SyncCounts(created, updated, unchanged).
     """
     if not expansions_data:
         logger.info("No expansion data to save.")
-        return
+        return SyncCounts(0, 0, 0)
 
+    rows = {}
     for exp_data in expansions_data:
-        api_id = exp_data.get('id')
-        name = exp_data.get('name')
-        series = exp_data.get('series')
-        release_date = exp_data.get('releaseDate') # <-- Obtiene la fecha como string
-        total_cards = exp_data.get('total')
-        symbol_url = exp_data.get('images', {}).get('symbol')
-        logo_url = exp_data.get('images', {}).get('logo')
-
-        if not api_id or not name:
-            logger.warning(f"Skipping expansion due to missing ID or name: {exp_data}")
-            continue
-
-        # Ensure releaseDate is in 'YYYY-MM-DD' format or None
-        if release_date:
-            try:
-                from datetime import datetime
-                # CUIDADO AQUÍ: Cambia el formato de '%m/%d/%Y' a '%Y/%m/%d'
-                release_date = datetime.strptime(release_date, '%Y/%m/%d').strftime('%Y-%m-%d')
-            except ValueError:
-                logger.warning(f"Invalid release date format for {name}: {release_date}. Setting to None.")
-                release_date = None
+        fields = _hashed_expansion_fields(exp_data)
+        if fields:
+            rows[fields['api_id']] = fields # La última aparición gana, igual que con update_or_create
 
+    new_rows, changed_rows, unchanged = _split_by_content_hash(Expansion, rows)
+
+    if bulk:
+        _bulk_upsert(Expansion, new_rows + changed_rows, EXPANSION_UPDATE_FIELDS)
+        _catalog_changed(new_rows, changed_rows, expansion_list=True)
+        counts = SyncCounts(len(new_rows), len(changed_rows), unchanged)
+        logger.info(f"Bulk upserted expansions: {counts.created} created, {counts.updated} updated, {counts.unchanged} unchanged.")
+        return counts
+
+    to_write = new_rows + changed_rows
+    for done, fields in enumerate(to_write, start=1):
+        api_id = fields.pop('api_id')
         expansion, created = Expansion.objects.update_or_create( 
             api_id=api_id,
-            defaults={
-                'name': name,
-                'series': series,
-                'release_date': release_date,
-                'total_cards': total_cards,
-                'symbol_url': symbol_url,
-                'logo_url': logo_url,
-            }
+            defaults=fields
         )
-        if created:
-            logger.info(f"Created new expansion: {expansion.name}")
-        else:
-            logger.info(f"Updated existing expansion: {expansion.name}")
+        # Log por fila solo en debug: con miles de filas el logging dominaba el tiempo de la importación
+        logger.debug(f"{'Created new' if created else 'Updated existing'} expansion: {expansion.name}")
+        _log_progress('expansions', done, len(to_write))
+    _catalog_changed(new_rows, changed_rows, expansion_list=True)
+    counts = SyncCounts(len(new_rows), len(changed_rows), unchanged)
+    logger.info(f"Saved expansions: {counts.created} created, {counts.updated} updated, {counts.unchanged} unchanged.")
+    return counts
 
-def import_expansions():
+def import_expansions(run=None):
     """
     Main function to orchestrate fetching and saving expansions.
+    With an ImportRun, HTTP/DB timings and row counts are recorded as an ImportStep.
+    Returns SyncCounts(created, updated, unchanged).
     """
     logger.info("Starting expansion import process...")
-    expansions = fetch_expansions_from_api()
-    if expansions:
-        save_expansions_to_db(expansions)
-        logger.info(f"Finished importing {len(expansions)} expansions.")
-    else:
-        logger.warning("No expansions fetched from API to import.")
+    with track_step(run, 'expansions') as metrics:
+        expansions = fetch_expansions_from_api()
+        if not expansions:
+            logger.warning("No expansions fetched from API to import.")
+            return SyncCounts(0, 0, 0)
+
+        with db_timer():
+            counts = save_expansions_to_db(expansions, bulk=True)
+        if metrics is not None:
+            metrics.counts = counts
+        logger.info(
+            f"Finished importing {len(expansions)} expansions ({counts.created} created, "
+            f"{counts.updated} updated, {counts.unchanged} unchanged)."
+        )
+        return counts
 
-def fetch_cards_from_api(set_id):
+def _fetch_cards_page(set_id, page, page_size):
     """
-    Fetches cards for a specific expansion (set_id) from the Pokémon TCG API.
-    Handles pagination to get all cards.
+    Fetches a single page of cards for set_id. Raises requests.exceptions.RequestException on failure.
     """
-    all_cards = []
-    page = 1
-    page_size = 250 # Max page size for pokemontcg.io API
-
-    while True:
-        url = f"{POKEMON_TCG_BASE_URL}/cards"
-        params = {
-            'q': f'set.id:{set_id}',
-            'page': page,
-            'pageSize': page_size
-        }
-        headers = {}
-        # if POKEMON_TCG_API_KEY:
-        #     headers['X-Api-Key'] = POKEMON_TCG_API_KEY
+    params = {
+        'q': f'set.id:{set_id}',
+        'page': page,
+        'pageSize': page_size
+    }
+    return get_client().get_json('/cards', params=params, timeout=30) # Increased timeout for cards
 
-        try:
-            response = requests.get(url, params=params, headers=headers, timeout=30) # Increased timeout for cards
-            response.raise_for_status()
-            data = response.json()
+def iter_card_pages(set_id, page_size=CARDS_PAGE_SIZE, concurrency=None, start_page=1):
+    """
+    Generator that yields the cards of set_id one page at a time, in page order, as
+    CardPage(page, last_page, cards). The import is complete once page == last_page is yielded.
+    start_page (default 1) is fetched first to learn totalCount; the following pages are prefetched
+    in the background through a sliding window of `concurrency` requests, so fetching the next pages
+    overlaps with whatever the consumer does with the current one and memory stays bounded by the window size.
+    Stops at the first failed page, like the original sequential loop.
+    """
+    if concurrency is None:
+        concurrency = PAGE_FETCH_CONCURRENCY
+    concurrency = max(1, concurrency)
+
+    try:
+        first_page = _fetch_cards_page(set_id, start_page, page_size)
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Error fetching cards for set {set_id} from API (page {start_page}): {e}")
+        return
 
-            cards_on_page = data.get('data', [])
-            all_cards.extend(cards_on_page)
+    total_count = first_page.get('totalCount', 0)
+    last_page = max(1, math.ceil(total_count / page_size)) if page_size else 1
 
-            # Check for pagination
-            total_count = data.get('totalCount', 0)
-            if len(all_cards) >= total_count:
-                break # All cards fetched
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=f'cards-{set_id}')
+    pending = deque()
+    next_page = start_page + 1
 
-            page += 1
+    def fill_window():
+        nonlocal next_page
+        while next_page <= last_page and len(pending) < concurrency:
+            # copy_context: los hilos de prefetch registran su tiempo HTTP en el ImportStep activo
+            future = executor.submit(contextvars.copy_context().run, _fetch_cards_page, set_id, next_page, page_size)
+            pending.append((next_page, future))
+            next_page += 1
 
-            # Small delay to be polite to the API, especially if fetching many pages
-            # time.sleep(0.1) # Uncomment if you hit rate limits frequently
+    try:
+        fill_window() # Las páginas siguientes se piden mientras el consumidor procesa la primera
+        yield CardPage(start_page, last_page, first_page.get('data', []))
+        del first_page
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error fetching cards for set {set_id} from API (page {page}): {e}")
-            break # Exit loop on error
+        while pending:
+            page, future = pending.popleft()
+            try:
+                data = future.result()
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Error fetching cards for set {set_id} from API (page {page}): {e}")
+                return # Exit on the first failed page
+            fill_window()
+            yield CardPage(page, last_page, data.get('data', []))
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
 
-    logger.info(f"Fetched {len(all_cards)} cards for set {set_id}.")
+def fetch_cards_from_api(set_id, page_size=CARDS_PAGE_SIZE, concurrency=None):
+    """
+    Fetches cards for a specific expansion (set_id) from the Pokémon TCG API.
+    Handles pagination to get all cards (see iter_card_pages); pages 2..N are fetched
+    concurrently and the cards are returned in page order.
+    """
+    all_cards = []
+    complete = False
+    for card_page in iter_card_pages(set_id, page_size=page_size, concurrency=concurrency):
+        all_cards.extend(card_page.cards)
+        complete = card_page.page >= card_page.last_page
+
+    if complete:
+        logger.info(f"Fetched {len(all_cards)} cards for set {set_id}.")
+    else:
+        logger.warning(f"Partial fetch for set {set_id}: only {len(all_cards)} cards were fetched.")
     return all_cards
 
-def save_cards_to_db(cards_data, expansion_instance):
+def _card_fields_from_api(card_data):
+    """
+    Maps a raw /cards payload to Card field values (without the expansion).
+    Returns None when the payload lacks the required ID or name.
+    """
+    api_id = card_data.get('id')
+    name = card_data.get('name')
+
+    if not api_id or not name:
+        logger.warning(f"Skipping card due to missing ID or name: {card_data}")
+        return None
+
+    return {
+        'api_id': api_id,
+        'name': name,
+        'rarity': card_data.get('rarity'),
+        'image_url_small': card_data.get('images', {}).get('small'),
+        'image_url_large': card_data.get('images', {}).get('large'),
+        # Extracting additional game-related fields
+        'hp': card_data.get('hp'),
+        'types': card_data.get('types'), # List of strings, e.g., ["Fire", "Water"]
+        'abilities': card_data.get('abilities'), # List of dicts
+        'attacks': card_data.get('attacks'), # List of dicts
+        'weaknesses': card_data.get('weaknesses'), # List of dicts
+        'resistances': card_data.get('resistances'), # List of dicts
+        'retreat_cost': card_data.get('retreatCost'), # List of strings, e.g., ["Colorless", "Colorless"]
+        'converted_retreat_cost': card_data.get('convertedRetreatCost'),
+        'number': card_data.get('number'),
+        'artist': card_data.get('artist'),
+        'flavor_text': card_data.get('flavorText'),
+    }
+
+def save_cards_to_db(cards_data, expansion_instance, bulk=False):
     """
     Saves or updates card data in the database, associating them with an Expansion.
+    Only cards that are new or whose upstream payload changed (content_hash) are written,
+    so unchanged cards keep their updated_at.
+    With bulk=True the page/set is written in a few INSERT ... ON CONFLICT statements
+    instead of one update_or_create (SELECT + INSERT/UPDATE) per card.
+    Returns SyncCounts(created, updated, unchanged).
     """
     if not cards_data:
         logger.info(f"No card data to save for expansion {expansion_instance.name}.")
-        return
+        return SyncCounts(0, 0, 0)
 
+    rows = {}
     for card_data in cards_data:
-        api_id = card_data.get('id')
-        name = card_data.get('name')
-        rarity = card_data.get('rarity')
-        image_url_small = card_data.get('images', {}).get('small')
-        image_url_large = card_data.get('images', {}).get('large')
+        fields = _hashed_card_fields(card_data, expansion_instance.api_id)
+        if fields:
+            fields['expansion'] = expansion_instance # Associate with the Expansion instance
+            rows[fields['api_id']] = fields
 
-        # Extracting additional game-related fields
-        hp = card_data.get('hp')
-        types = card_data.get('types') # List of strings, e.g., ["Fire", "Water"]
-        abilities = card_data.get('abilities') # List of dicts
-        attacks = card_data.get('attacks') # List of dicts
-        weaknesses = card_data.get('weaknesses') # List of dicts
-        resistances = card_data.get('resistances') # List of dicts
-        retreat_cost = card_data.get('retreatCost') # List of strings, e.g., ["Colorless", "Colorless"]
-        converted_retreat_cost = card_data.get('convertedRetreatCost')
-        number = card_data.get('number')
-        artist = card_data.get('artist')
-        flavor_text = card_data.get('flavorText')
-
-        if not api_id or not name:
-            logger.warning(f"Skipping card due to missing ID or name: {card_data}")
-            continue
+    new_rows, changed_rows, unchanged = _split_by_content_hash(Card, rows)
+    written_ids = [row['api_id'] for row in new_rows + changed_rows]
 
+    if bulk:
+        _bulk_upsert(Card, new_rows + changed_rows, CARD_UPDATE_FIELDS)
+        _refresh_card_search(written_ids)
+        _index_set_positions(expansion_instance, written_ids)
+        _catalog_changed(new_rows, changed_rows, [expansion_instance.api_id])
+        counts = SyncCounts(len(new_rows), len(changed_rows), unchanged)
+        logger.info(
+            f"Bulk upserted cards for {expansion_instance.name}: {counts.created} created, "
+            f"{counts.updated} updated, {counts.unchanged} unchanged."
+        )
+        return counts
+
+    to_write = new_rows + changed_rows
+    for done, fields in enumerate(to_write, start=1):
+        api_id = fields.pop('api_id')
         card, created = Card.objects.update_or_create(
             api_id=api_id,
-            defaults={
-                'name': name,
-                'expansion': expansion_instance, # Associate with the Expansion instance
-                'rarity': rarity,
-                'image_url_small': image_url_small,
-                'image_url_large': image_url_large,
-                'hp': hp,
-                'types': types,
-                'abilities': abilities,
-                'attacks': attacks,
-                'weaknesses': weaknesses,
-                'resistances': resistances,
-                'retreat_cost': retreat_cost,
-                'converted_retreat_cost': converted_retreat_cost,
-                'number': number,
-                'artist': artist,
-                'flavor_text': flavor_text,
-            }
+            defaults=fields
         )
-        if created:
-            logger.info(f"Created new card: {card.name} (ID: {card.api_id}) for {expansion_instance.name}")
-        else:
-            logger.debug(f"Updated existing card: {card.name} (ID: {card.api_id}) for {expansion_instance.name}") # Use debug for less verbose output on updates
+        # Log por carta solo en debug; en INFO queda una línea de progreso cada PROGRESS_LOG_EVERY filas
+        logger.debug(f"{'Created new' if created else 'Updated existing'} card: {card.name} (ID: {card.api_id}) for {expansion_instance.name}")
+        _log_progress(f"cards for {expansion_instance.name}", done, len(to_write))
+    _refresh_card_search(written_ids)
+    _index_set_positions(expansion_instance, written_ids)
+    _catalog_changed(new_rows, changed_rows, [expansion_instance.api_id])
+    counts = SyncCounts(len(new_rows), len(changed_rows), unchanged)
+    logger.info(
+        f"Saved cards for {expansion_instance.name}: {counts.created} created, "
+        f"{counts.updated} updated, {counts.unchanged} unchanged."
+    )
+    return counts
 
-def import_cards_for_expansion(expansion_api_id):
+def import_cards_for_expansion(expansion_api_id, page_size=CARDS_PAGE_SIZE, resume=False, run=None):
     """
     Main function to orchestrate fetching and saving cards for a specific expansion.
+    Progress is checkpointed per page (ImportCheckpoint). With resume=True the import continues
+    after the last committed page of a previous interrupted run, and an expansion already
+    completed is skipped. With an ImportRun, timings and counts are recorded as an ImportStep.
+    Returns ImportResult(created, updated, unchanged, complete), or None if the expansion is not in the database.
+    complete is False when a page could not be fetched (partial import).
     """
     try:
         expansion_instance = Expansion.objects.get(api_id=expansion_api_id)
     except Expansion.DoesNotExist:
         logger.error(f"Expansion with API ID '{expansion_api_id}' not found in database. Cannot import cards.")
-        return
+        return None
+
+    with track_step(run, expansion_api_id, expansion=expansion_instance) as metrics:
+        result = _import_card_pages(expansion_instance, page_size, resume)
+        if metrics is not None:
+            metrics.counts = result
+            if not result.complete:
+                metrics.error = 'Partial import: a page could not be fetched'
+        return result
 
-    logger.info(f"Starting card import process for expansion: {expansion_instance.name} (API ID: {expansion_api_id})...")
-    cards = fetch_cards_from_api(expansion_api_id)
-    if cards:
-        save_cards_to_db(cards, expansion_instance)
-        logger.info(f"Finished importing {len(cards)} cards for expansion: {expansion_instance.name}.")
+def _import_card_pages(expansion_instance, page_size, resume):
+    """
+    Fetch -> save pipeline of import_cards_for_expansion, with per-page checkpoints.
+    """
+    expansion_api_id = expansion_instance.api_id
+    checkpoint, _ = ImportCheckpoint.objects.get_or_create(
+        expansion=expansion_instance, defaults={'page_size': page_size}
+    )
+    start_page = 1
+    if resume and checkpoint.page_size == page_size:
+        if checkpoint.status == ImportCheckpoint.STATUS_COMPLETE:
+            logger.info(f"Skipping expansion {expansion_instance.name}: already imported (checkpoint).")
+            return ImportResult(0, 0, 0, True)
+        start_page = checkpoint.last_page + 1
+    checkpoint.page_size = page_size
+    checkpoint.last_page = start_page - 1
+    checkpoint.status = ImportCheckpoint.STATUS_RUNNING
+    checkpoint.error = None
+    checkpoint.save()
+
+    logger.info(
+        f"Starting card import process for expansion: {expansion_instance.name} "
+        f"(API ID: {expansion_api_id}) from page {start_page}..."
+    )
+    fetched = 0
+    counts = SyncCounts(0, 0, 0)
+    complete = False
+    # Pipeline: fetch (iter_card_pages) -> transform + write (save_cards_to_db) página a página.
+    # Cada página se confirma en su propia transacción junto con el checkpoint, así un fallo
+    # a mitad del set conserva lo ya escrito y se puede reanudar desde la página siguiente.
+    for card_page in iter_card_pages(expansion_api_id, page_size=page_size, start_page=start_page):
+        complete = card_page.page >= card_page.last_page
+        with db_timer(), transaction.atomic():
+            if card_page.cards:
+                page_counts = save_cards_to_db(card_page.cards, expansion_instance, bulk=True)
+                counts = SyncCounts(*(total + page for total, page in zip(counts, page_counts)))
+            checkpoint.last_page = card_page.page
+            checkpoint.total_pages = card_page.last_page
+            if complete:
+                checkpoint.status = ImportCheckpoint.STATUS_COMPLETE
+            checkpoint.save()
+        fetched += len(card_page.cards)
+
+    if not complete:
+        checkpoint.status = ImportCheckpoint.STATUS_PARTIAL
+        checkpoint.error = f"Fetch failed after page {checkpoint.last_page}"
+        checkpoint.save()
+        logger.warning(
+            f"Partial import for expansion: {expansion_instance.name} (API ID: {expansion_api_id}): "
+            f"stopped after page {checkpoint.last_page} of {checkpoint.total_pages or '?'}."
+        )
+    elif fetched:
+        logger.info(
+            f"Finished importing {fetched} cards for expansion: {expansion_instance.name} ({counts.created} created, "
+            f"{counts.updated} updated, {counts.unchanged} unchanged)."
+        )
     else:
         logger.warning(f"No cards fetched from API for expansion: {expansion_instance.name} (API ID: {expansion_api_id}) to import.")
+    return ImportResult(*counts, complete)
+
+def _import_expansion_in_worker(expansion_api_id, resume=False, run=None):
+    """
+    Runs import_cards_for_expansion inside a pool thread.
+    Django opens one connection per thread, so it is closed here to avoid leaking it when the thread is reused.
+    """
+    try:
+        return import_cards_for_expansion(expansion_api_id, resume=resume, run=run)
+    finally:
+        connection.close()
 
 # Optional: A function to import cards for ALL expansions (useful for bulk initial import)
-def import_all_expansions_cards():
+def import_all_expansions_cards(workers=1, expansion_api_ids=None, resume=False, run=None):
     """
-    Imports cards for all expansions currently in the database.
+    Imports cards for all expansions currently in the database (or only expansion_api_ids).
+    With workers > 1 expansions are imported concurrently by a bounded thread pool,
+    each worker with its own DB connection. A failing expansion does not stop the run.
+    With resume=True an interrupted sync continues from the per-expansion checkpoints.
+    With an ImportRun, one ImportStep is recorded per expansion.
+    Returns a summary dict: {'expansions', 'created', 'updated', 'unchanged',
+    'partial': [api_id, ...], 'failed': {api_id: error}}.
     """
-    all_expansions = Expansion.objects.all()
-    logger.info(f"Starting import of cards for {len(all_expansions)} expansions...")
-    for expansion in all_expansions:
-        import_cards_for_expansion(expansion.api_id)
-    logger.info("Finished importing cards for all expansions.")
\ No newline at end of file
+    with batch_catalog_changes(): # Una sola versión nueva del catálogo por ejecución
+        return _import_all_expansions_cards(workers, expansion_api_ids, resume, run)
+
+def _import_all_expansions_cards(workers, expansion_api_ids, resume, run):
+    api_ids = list(expansion_api_ids) if expansion_api_ids is not None else list(
+        Expansion.objects.values_list('api_id', flat=True)
+    )
+    summary = {'expansions': len(api_ids), 'created': 0, 'updated': 0, 'unchanged': 0, 'partial': [], 'failed': {}}
+    logger.info(f"Starting import of cards for {len(api_ids)} expansions with {workers} worker(s)...")
+
+    def collect(api_id, result=None, error=None):
+        if error is None and result is None:
+            error = 'Expansion not found in database'
+        if error is not None:
+            logger.error(f"Import failed for expansion {api_id}: {error}")
+            summary['failed'][api_id] = str(error)
+            return
+        summary['created'] += result[0]
+        summary['updated'] += result[1]
+        summary['unchanged'] += result[2]
+        if not result.complete:
+            summary['partial'].append(api_id)
+
+    if workers <= 1:
+        for api_id in api_ids:
+            try:
+                collect(api_id, result=import_cards_for_expansion(api_id, resume=resume, run=run))
+            except Exception as exc: # pylint: disable=broad-except
+                collect(api_id, error=exc)
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='catalog-import') as executor:
+            futures = {
+                # copy_context: los workers apuntan sus cambios en el lote de batch_catalog_changes
+                executor.submit(contextvars.copy_context().run, _import_expansion_in_worker, api_id, resume=resume, run=run): api_id
+                for api_id in api_ids
+            }
+            for future in as_completed(futures):
+                api_id = futures[future]
+                try:
+                    collect(api_id, result=future.result())
+                except Exception as exc: # pylint: disable=broad-except
+                    collect(api_id, error=exc)
+
+    logger.info(
+        f"Finished importing cards for all expansions: {summary['created']} created, "
+        f"{summary['updated']} updated, {summary['unchanged']} unchanged, "
+        f"{len(summary['partial'])} partial, {len(summary['failed'])} failed."
+    )
+    return summary
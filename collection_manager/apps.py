@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class CollectionManagerConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'collection_manager'
+
+    def ready(self):
+        # Señales de UserCard que mantienen UserCollectionStats / UserExpansionStats
+        from . import collection_stats  # noqa: F401 pylint: disable=unused-import,import-outside-toplevel
+        # Posición en su expansión de las cartas creadas fuera de las importaciones
+        from . import completion  # noqa: F401 pylint: disable=unused-import,import-outside-toplevel
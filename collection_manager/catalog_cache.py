@@ -0,0 +1,106 @@
+# pokemon_tcg_tracker_project/collection_manager/catalog_cache.py
+"""
+Blobs JSON precalculados del catálogo: la lista de expansiones y la lista de cartas de cada
+expansión se guardan ya renderizadas (bytes) en la caché de Django, así un acierto es un único
+cache.get() y se sirve sin ORM ni serializer.
+
+Las claves son fijas (catalog:expansions, catalog:cards:<api_id>) y las mantiene quien escribe en
+el catálogo: al confirmar cada importación se reconstruyen con set() los blobs de lo que escribió
+(refresh_catalog_blobs); el resto siguen calientes. Un fallo se rellena con add(), que no pisa un
+blob que una importación haya escrito mientras tanto, así un worker que renderizó datos anteriores
+al commit no deja un blob viejo. Los cambios hechos a mano (admin) no invalidan: se ven tras la
+siguiente importación o al caducar el blob (CATALOG_BLOB_TIMEOUT).
+
+Usa la caché settings.CATALOG_BLOB_CACHE (por defecto 'catalog'); si no está configurada se
+usa una LocMemCache del proceso. La reconstrucción que hace el comando de importación solo llega
+a los workers web si esa caché es compartida entre procesos (ver CACHES en settings).
+"""
+import logging
+
+from django.conf import settings
+from django.core.cache import InvalidCacheBackendError, caches
+from django.core.cache.backends.locmem import LocMemCache
+
+from .models import Card, Expansion
+from .renderers import ORJSONRenderer
+from .serializers import CardSerializer, ExpansionSerializer
+
+logger = logging.getLogger(__name__)
+
+_fallback_cache = LocMemCache('catalog-blobs', {})
+
+
+def get_blob_cache():
+    try:
+        return caches[getattr(settings, 'CATALOG_BLOB_CACHE', 'catalog')]
+    except InvalidCacheBackendError:
+        return _fallback_cache
+
+
+def blob_timeout():
+    """Segundos que vive un blob en la caché (CATALOG_BLOB_TIMEOUT, un día por defecto)"""
+    return getattr(settings, 'CATALOG_BLOB_TIMEOUT', 60 * 60 * 24)
+
+
+EXPANSION_LIST_KEY = 'catalog:expansions'
+
+
+def card_list_key(expansion_api_id):
+    return f'catalog:cards:{expansion_api_id}'
+
+
+def render_expansion_list():
+    return ORJSONRenderer().render(ExpansionSerializer(Expansion.objects.all(), many=True).data)
+
+
+def render_card_list(expansion_api_id):
+    """JSON de las cartas de la expansión, o None si la expansión no existe"""
+    if not Expansion.objects.filter(api_id=expansion_api_id).exists():
+        return None
+    cards = Card.objects.filter(expansion__api_id=expansion_api_id).select_related('expansion')
+    return ORJSONRenderer().render(CardSerializer(cards, many=True).data)
+
+
+def get_expansion_list_blob():
+    """JSON (bytes) de la lista de expansiones"""
+    cache = get_blob_cache()
+    blob = cache.get(EXPANSION_LIST_KEY)
+    if blob is None:
+        blob = render_expansion_list()
+        cache.add(EXPANSION_LIST_KEY, blob, blob_timeout())
+    return blob
+
+
+def get_card_list_blob(expansion_api_id):
+    """
+    JSON (bytes) de las cartas de una expansión, o None si la expansión no existe
+    (no se guardan blobs para api_ids arbitrarios de la URL).
+    """
+    cache = get_blob_cache()
+    blob = cache.get(card_list_key(expansion_api_id))
+    if blob is None:
+        blob = render_card_list(expansion_api_id)
+        if blob is not None:
+            cache.add(card_list_key(expansion_api_id), blob, blob_timeout())
+    return blob
+
+
+def refresh_catalog_blobs(expansion_api_ids=(), expansion_list=False):
+    """
+    Reconstruye los blobs de las expansiones indicadas (y la lista de expansiones si
+    expansion_list=True) tras confirmar una importación. Un fallo de la caché no falla la importación.
+    """
+    cache = get_blob_cache()
+    try:
+        if expansion_list:
+            cache.set(EXPANSION_LIST_KEY, render_expansion_list(), blob_timeout())
+        for expansion_api_id in expansion_api_ids:
+            blob = render_card_list(expansion_api_id)
+            if blob is None:
+                cache.delete(card_list_key(expansion_api_id))
+            else:
+                cache.set(card_list_key(expansion_api_id), blob, blob_timeout())
+    except Exception as e:
+        logger.warning(f"Could not rebuild catalog cache blobs: {e}")
+        return
+    logger.debug(f"Rebuilt catalog blobs for {list(expansion_api_ids)} (expansion list: {expansion_list})")
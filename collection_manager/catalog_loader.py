@@ -0,0 +1,300 @@
+# pokemon_tcg_tracker_project/collection_manager/catalog_loader.py
+"""
+Carga offline del catálogo (Expansion + Card) desde los volcados JSON estáticos de la API
+(https://github.com/PokemonTCG/pokemon-tcg-data), sin acceso a red:
+
+    <dump_dir>/sets/<lang>.json         -> lista de expansiones
+    <dump_dir>/cards/<lang>/<set>.json  -> lista de cartas de cada expansión
+
+Los ficheros se leen con un parser incremental (no se cargan enteros en memoria).
+En PostgreSQL las filas se envían con COPY a una tabla temporal y se fusionan con un único
+INSERT ... ON CONFLICT por tabla; en otros motores se usa el upsert bulk de api_service.
+En ambos casos solo se escriben las filas nuevas o cuyo content_hash cambió.
+"""
+import csv
+import io
+import json
+import logging
+from pathlib import Path
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .api_service import (
+    SyncCounts, CARD_UPDATE_FIELDS, EXPANSION_UPDATE_FIELDS,
+    _bulk_upsert, _hashed_card_fields, _hashed_expansion_fields, _split_by_content_hash,
+)
+from .catalog_cache import refresh_catalog_blobs
+from .catalog_version import bump_catalog_version
+from .completion import index_set_positions
+from .models import Card, Expansion
+from .search import refresh_search_vectors
+
+logger = logging.getLogger(__name__)
+
+# Filas por bloque de COPY / upsert: limita la memoria usada durante la carga
+LOAD_CHUNK_SIZE = 5000
+JSON_READ_SIZE = 64 * 1024
+
+
+def iter_json_array(path, read_size=JSON_READ_SIZE):
+    """
+    Generator over the elements of a top-level JSON array, reading the file in chunks.
+    Only the element being decoded (plus one read buffer) is kept in memory.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, encoding='utf-8') as fh:
+        buffer = ''
+        eof = False
+
+        def read_more():
+            nonlocal buffer, eof
+            chunk = fh.read(read_size)
+            if not chunk:
+                eof = True
+                return False
+            buffer += chunk
+            return True
+
+        buffer = buffer.lstrip()
+        while not buffer:
+            if not read_more():
+                raise ValueError(f"{path}: empty file")
+            buffer = buffer.lstrip()
+        if buffer[0] != '[':
+            raise ValueError(f"{path}: expected a top-level JSON array")
+        buffer = buffer[1:]
+
+        while True:
+            buffer = buffer.lstrip(' \t\r\n,')
+            if not buffer:
+                if not read_more():
+                    raise ValueError(f"{path}: unexpected end of JSON array")
+                continue
+            if buffer[0] == ']':
+                return
+
+            try:
+                item, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                # Elemento incompleto en el buffer: leer más y reintentar
+                if not read_more():
+                    raise ValueError(f"{path}: invalid or truncated JSON element")
+                continue
+
+            if end == len(buffer) and not isinstance(item, (dict, list)) and not eof:
+                # Un número al final del buffer puede continuar en el siguiente bloque
+                if read_more():
+                    continue
+
+            yield item
+            buffer = buffer[end:]
+
+
+def dump_paths(dump_dir, language='en'):
+    """Devuelve (fichero de sets, lista de ficheros de cartas) del volcado"""
+    dump_dir = Path(dump_dir)
+    sets_path = dump_dir / 'sets' / f'{language}.json'
+    cards_paths = sorted((dump_dir / 'cards' / language).glob('*.json'))
+    return sets_path, cards_paths
+
+
+def iter_expansion_rows(sets_path):
+    for exp_data in iter_json_array(sets_path):
+        fields = _hashed_expansion_fields(exp_data)
+        if fields:
+            yield fields
+
+
+def iter_card_rows(cards_paths):
+    """Filas de Card de todos los ficheros; 'expansion' es el api_id del set (nombre del fichero)"""
+    for path in cards_paths:
+        for card_data in iter_json_array(path):
+            set_id = (card_data.get('set') or {}).get('id') or path.stem
+            fields = _hashed_card_fields(card_data, set_id)
+            if fields:
+                yield fields
+
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ---------------------------------------------------------------------------
+# PostgreSQL: COPY a tabla temporal + un único INSERT ... ON CONFLICT
+# ---------------------------------------------------------------------------
+
+def _staging_columns(model, fields):
+    """(campo, tipo SQL de la columna staging) para los campos dados"""
+    columns = []
+    for name in fields:
+        if name == 'expansion':
+            columns.append((name, 'text')) # api_id de la expansión; se resuelve en el merge
+            continue
+        field = model._meta.get_field(name)
+        columns.append((name, field.db_type(connection))) # JSONField -> jsonb
+    return columns
+
+
+def _copy_rows(cursor, staging_table, columns, rows, first_seq=0):
+    """
+    Envía un bloque de filas a la tabla staging con COPY ... FROM STDIN (CSV).
+    seq es el orden de la fila en el volcado: con api_id repetidos gana la última, como en la sync por API.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC) # None -> vacío sin comillas = NULL
+    for seq, row in enumerate(rows, start=first_seq):
+        values = [seq]
+        for name, sql_type in columns:
+            value = row.get(name)
+            if sql_type == 'jsonb' and value is not None:
+                value = json.dumps(value)
+            values.append(value)
+        writer.writerow(values)
+    buffer.seek(0)
+    column_list = ', '.join(['seq'] + [name for name, _ in columns])
+    cursor.copy_expert(f"COPY {staging_table} ({column_list}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def _copy_merge(model, rows, update_fields, chunk_size):
+    """
+    COPY de todas las filas a una tabla temporal y merge con un único INSERT ... ON CONFLICT (api_id).
+    Solo se reescriben las filas cuyo content_hash cambió; con api_id repetidos gana la última fila.
+    Returns (SyncCounts(created, updated, unchanged), skipped): skipped son las cartas de una
+    expansión que no existe, que no se cargan.
+    """
+    fields = ['api_id'] + update_fields + ['content_hash']
+    columns = _staging_columns(model, fields)
+    table = model._meta.db_table
+    staging_table = f"{table}_staging"
+    now = timezone.now()
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {staging_table}")
+        cursor.execute(
+            f"CREATE TEMP TABLE {staging_table} (seq bigint, {', '.join(f'{name} {sql_type}' for name, sql_type in columns)}) "
+            f"ON COMMIT DROP"
+        )
+        staged = 0
+        for chunk in _chunks(rows, chunk_size):
+            _copy_rows(cursor, staging_table, columns, chunk, first_seq=staged)
+            staged += len(chunk)
+
+        select_columns = []
+        target_columns = []
+        joins = ''
+        for name, _ in columns:
+            target_columns.append(model._meta.get_field(name).column)
+            if name == 'expansion':
+                select_columns.append('e.id')
+                joins = f"JOIN {Expansion._meta.db_table} e ON e.api_id = s.expansion"
+            else:
+                select_columns.append(f"s.{name}")
+        updates = ', '.join(f"{column} = EXCLUDED.{column}" for column in target_columns[1:])
+        # Última aparición de cada api_id en el volcado
+        latest = f"SELECT DISTINCT ON (api_id) * FROM {staging_table} ORDER BY api_id, seq DESC"
+
+        skipped = 0
+        if joins:
+            cursor.execute(
+                f"SELECT COUNT(*) FROM ({latest}) s LEFT {joins} WHERE e.id IS NULL"
+            )
+            skipped = cursor.fetchone()[0]
+        cursor.execute(f"SELECT COUNT(DISTINCT api_id) FROM {staging_table}")
+        distinct = cursor.fetchone()[0]
+
+        cursor.execute(
+            f"""
+            INSERT INTO {table} ({', '.join(target_columns)}, created_at, updated_at)
+            SELECT {', '.join(select_columns)}, %s, %s
+            FROM ({latest}) s {joins}
+            ON CONFLICT (api_id) DO UPDATE SET {updates}, updated_at = EXCLUDED.updated_at
+            WHERE {table}.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+            RETURNING (xmax = 0)
+            """,
+            [now, now],
+        )
+        written = [inserted for (inserted,) in cursor.fetchall()]
+
+    created = sum(1 for inserted in written if inserted)
+    updated = len(written) - created
+    if skipped:
+        logger.warning(f"Skipped {skipped} {model.__name__} rows of unknown expansions")
+    return SyncCounts(created, updated, distinct - skipped - len(written)), skipped
+
+
+# ---------------------------------------------------------------------------
+# Otros motores (SQLite en desarrollo/tests): upsert bulk de api_service por bloques
+# ---------------------------------------------------------------------------
+
+def _bulk_merge(model, rows, update_fields, chunk_size):
+    """
+    Same result as _copy_merge using the content_hash split + bulk upsert of api_service, one chunk at a time.
+    Returns (SyncCounts(created, updated, unchanged), skipped).
+    """
+    counts = SyncCounts(0, 0, 0)
+    skipped = 0
+    for chunk in _chunks(rows, chunk_size):
+        rows_by_id = {row['api_id']: row for row in chunk}
+
+        if model is Card:
+            expansions = Expansion.objects.in_bulk(
+                {row['expansion'] for row in chunk}, field_name='api_id'
+            )
+            for api_id, row in list(rows_by_id.items()):
+                if row['expansion'] not in expansions:
+                    logger.warning(f"Skipping card {api_id} of unknown expansion {row['expansion']}")
+                    del rows_by_id[api_id]
+                    skipped += 1
+                    continue
+                row['expansion'] = expansions[row['expansion']]
+
+        new_rows, changed_rows, unchanged = _split_by_content_hash(model, rows_by_id)
+        _bulk_upsert(model, new_rows + changed_rows, update_fields)
+        counts = SyncCounts(
+            counts.created + len(new_rows), counts.updated + len(changed_rows), counts.unchanged + unchanged
+        )
+    return counts, skipped
+
+
+def load_catalog_dump(dump_dir, language='en', chunk_size=LOAD_CHUNK_SIZE):
+    """
+    Carga expansiones y cartas desde un volcado local, en una única transacción.
+    Returns {'expansions': SyncCounts, 'cards': SyncCounts, 'skipped_cards': int}; skipped_cards son
+    las cartas de expansiones que no están en el volcado ni en la BD (no se cargan).
+    """
+    sets_path, cards_paths = dump_paths(dump_dir, language)
+    if not sets_path.exists():
+        raise FileNotFoundError(f"Sets file not found: {sets_path}")
+
+    started_at = timezone.now()
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            merge = _copy_merge
+        else:
+            merge = _bulk_merge
+        expansions, _ = merge(Expansion, iter_expansion_rows(sets_path), EXPANSION_UPDATE_FIELDS, chunk_size)
+        cards, skipped = merge(Card, iter_card_rows(cards_paths), CARD_UPDATE_FIELDS, chunk_size)
+        # Documento de búsqueda de las cartas escritas (updated_at >= inicio de la carga)
+        refresh_search_vectors(Card.objects.filter(updated_at__gte=started_at))
+        # Posiciones por número de coleccionista (bitmaps de compleción) de las expansiones tocadas
+        touched = set(Card.objects.filter(updated_at__gte=started_at).values_list('expansion_id', flat=True).distinct())
+        index_set_positions(touched)
+
+    if expansions.created or expansions.updated or cards.created or cards.updated:
+        bump_catalog_version()
+        # Blobs JSON de las expansiones con cartas escritas y de la lista de expansiones
+        refresh_catalog_blobs(
+            Expansion.objects.filter(id__in=touched).values_list('api_id', flat=True),
+            expansion_list=bool(expansions.created or expansions.updated),
+        )
+
+    logger.info(f"Loaded catalog dump {dump_dir}: expansions {expansions}, cards {cards}, {skipped} cards skipped")
+    return {'expansions': expansions, 'cards': cards, 'skipped_cards': skipped}
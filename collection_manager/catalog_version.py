@@ -0,0 +1,86 @@
+# pokemon_tcg_tracker_project/collection_manager/catalog_version.py
+"""
+Versión del catálogo (Expansion + Card) para la caché HTTP de los endpoints públicos.
+
+Todo lo que escribe en el catálogo (api_service, catalog_loader, comandos load_*) llama a
+bump_catalog_version(); las vistas comparan If-None-Match / If-Modified-Since con la versión
+actual y responden 304 sin tocar el serializer.
+
+Una sincronización completa escribe cientos de páginas: dentro de batch_catalog_changes() cada
+catalog_changed() solo se apunta y la versión sube una vez al salir del bloque (una por ejecución).
+
+La versión se lee de la caché de blobs del catálogo (CATALOG_VERSION_KEY), así un acierto de los
+endpoints del catálogo no consulta la BD: bump_catalog_version() borra la clave y la vuelve a
+escribir al confirmar; un fallo la rellena desde la BD con add().
+"""
+import contextvars
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .catalog_cache import blob_timeout, get_blob_cache
+from .models import CatalogVersion
+
+CATALOG_VERSION_PK = 1
+CATALOG_VERSION_KEY = 'catalog:version'
+
+# {'changed': bool} del lote activo; los hilos de importación lo heredan con copy_context()
+_pending = contextvars.ContextVar('catalog_version_pending', default=None)
+
+
+def _read_catalog_version():
+    return CatalogVersion.objects.filter(pk=CATALOG_VERSION_PK).values_list('version', 'updated_at').first() or (0, None)
+
+
+def get_catalog_version():
+    """(versión, fecha de la última modificación o None) sin escribir en la BD"""
+    cache = get_blob_cache()
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        version = _read_catalog_version()
+        cache.add(CATALOG_VERSION_KEY, version, blob_timeout())
+    return version
+
+
+def _cache_catalog_version():
+    get_blob_cache().set(CATALOG_VERSION_KEY, _read_catalog_version(), blob_timeout())
+
+
+def bump_catalog_version():
+    """Incrementa la versión del catálogo de forma atómica (seguro entre workers)"""
+    with transaction.atomic():
+        updated = CatalogVersion.objects.filter(pk=CATALOG_VERSION_PK).update(
+            version=F('version') + 1, updated_at=timezone.now()
+        )
+        if not updated:
+            CatalogVersion.objects.get_or_create(pk=CATALOG_VERSION_PK, defaults={'version': 1})
+    # Hasta el commit las demás conexiones leen la versión anterior de la BD; entonces se publica
+    get_blob_cache().delete(CATALOG_VERSION_KEY)
+    transaction.on_commit(_cache_catalog_version)
+
+
+@contextmanager
+def batch_catalog_changes():
+    """Agrupa los cambios del catálogo del bloque en un único bump al final (si hubo alguno)"""
+    if _pending.get() is not None:
+        yield # Ya dentro de un lote: sube la versión el bloque exterior
+        return
+    pending = {'changed': False}
+    token = _pending.set(pending)
+    try:
+        yield
+    finally:
+        _pending.reset(token)
+        if pending['changed']:
+            bump_catalog_version()
+
+
+def catalog_changed():
+    """Cambio confirmado en el catálogo: sube la versión ya o al cerrar el lote activo"""
+    pending = _pending.get()
+    if pending is None:
+        bump_catalog_version()
+    else:
+        pending['changed'] = True
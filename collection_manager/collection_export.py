@@ -0,0 +1,105 @@
+# pokemon_tcg_tracker_project/collection_manager/collection_export.py
+"""
+Exportación de la colección de un usuario en CSV o NDJSON (una línea JSON por UserCard).
+
+Las filas se leen con values_list().iterator(chunk_size=EXPORT_CHUNK_SIZE): en PostgreSQL es un
+cursor con nombre en el servidor, así nunca hay más de un bloque de filas en memoria, y se
+escriben en trozos de bytes que sirven igual para StreamingHttpResponse (UserCardExportView) que
+para un fichero (comando export_collection). La cabecera del CSV sale antes de la primera consulta.
+"""
+import csv
+import io
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import UserCard
+
+try:
+    import orjson
+except ImportError: # orjson es opcional: sin él se usa json de la stdlib
+    orjson = None
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+# (columna exportada, ruta ORM)
+EXPORT_COLUMNS = [
+    ('id', 'id'),
+    ('card_api_id', 'card__api_id'),
+    ('card_name', 'card__name'),
+    ('card_number', 'card__number'),
+    ('rarity', 'card__rarity'),
+    ('expansion_api_id', 'card__expansion__api_id'),
+    ('expansion_name', 'card__expansion__name'),
+    ('quantity', 'quantity'),
+    ('language', 'language'),
+    ('condition', 'condition'),
+    ('is_holographic', 'is_holographic'),
+    ('is_first_edition', 'is_first_edition'),
+    ('is_signed', 'is_signed'),
+    ('grade', 'grade'),
+    ('notes', 'notes'),
+    ('is_favorite', 'is_favorite'),
+    ('created_at', 'created_at'),
+    ('updated_at', 'updated_at'),
+]
+HEADER = [name for name, _ in EXPORT_COLUMNS]
+
+
+def export_rows(user_id, chunk_size=EXPORT_CHUNK_SIZE):
+    """Tuplas de EXPORT_COLUMNS de las UserCards del usuario, por id, leídas en bloques"""
+    return UserCard.objects.filter(user_id=user_id).order_by('id').values_list( # pylint: disable=no-member
+        *[path for _, path in EXPORT_COLUMNS]
+    ).iterator(chunk_size=chunk_size)
+
+
+def _batches(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_csv(rows, chunk_size=EXPORT_CHUNK_SIZE):
+    """CSV (bytes UTF-8): la cabecera y luego un trozo por cada bloque de filas"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(HEADER)
+    yield buffer.getvalue().encode()
+    for batch in _batches(rows, chunk_size):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            [value.isoformat() if hasattr(value, 'isoformat') else value for value in row] for row in batch
+        )
+        yield buffer.getvalue().encode()
+
+
+def _dumps(item):
+    if orjson is not None:
+        return orjson.dumps(item)
+    return json.dumps(item, cls=DjangoJSONEncoder, ensure_ascii=False).encode()
+
+
+def iter_ndjson(rows, chunk_size=EXPORT_CHUNK_SIZE):
+    """NDJSON (bytes UTF-8): un objeto por fila, un trozo por cada bloque de filas"""
+    for batch in _batches(rows, chunk_size):
+        yield b''.join(_dumps(dict(zip(HEADER, row))) + b'\n' for row in batch)
+
+
+def export_collection(user_id, export_format, chunk_size=EXPORT_CHUNK_SIZE):
+    """Trozos de bytes de la colección del usuario en `export_format` ('csv' o 'ndjson')"""
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {export_format}")
+    rows = export_rows(user_id, chunk_size)
+    if export_format == 'csv':
+        return iter_csv(rows, chunk_size)
+    return iter_ndjson(rows, chunk_size)
@@ -0,0 +1,172 @@
+# pokemon_tcg_tracker_project/collection_manager/collection_stats.py
+"""
+Estadísticas precalculadas de la colección: UserCollectionStats (totales del usuario) y
+UserExpansionStats (totales por usuario y expansión).
+
+Cada cambio de UserCard recalcula, en la misma transacción, las filas de las expansiones
+afectadas (solo las cartas del usuario en esas expansiones) y a partir de ellas los totales del
+usuario (una fila por expansión con cartas). El coste depende del tamaño de la expansión, no de
+la colección, y las vistas leen los totales por clave primaria.
+
+- Cambios de una fila (vistas, admin, shell): señales post_save / post_delete de UserCard.
+- Rutas en bloque (user_collection.apply_operations): dentro de batch_collection_stats() las señales
+  solo apuntan las cartas tocadas y el recálculo se hace una vez al salir.
+- Borrados en cascada desde otra tabla (usuario, carta) no recalculan: si se borra el usuario sus
+  estadísticas se borran con él; para cartas del catálogo está rebuild_collection_stats.
+
+Cada fila por expansión guarda también el bitmap de cartas poseídas (bit = Card.set_position) que
+usa completion.py para el porcentaje de compleción y las cartas que faltan.
+
+La fila del usuario se bloquea (SELECT ... FOR UPDATE) antes de recalcular, así dos transacciones
+del mismo usuario se serializan y la segunda ve los cambios de la primera.
+"""
+import contextvars
+from collections import Counter
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .models import Card, UserCard, UserCollectionStats, UserExpansionStats
+
+COUNTERS = ['unique_cards', 'total_copies', 'variants', 'favorites']
+UNKNOWN_RARITY = 'Unknown'
+
+# {user_id: {card_id, ...}} pendientes de recalcular dentro de batch_collection_stats()
+_pending = contextvars.ContextVar('collection_stats_pending', default=None)
+
+
+def encode_bitmap(bits):
+    """int -> bytes (little-endian) para UserExpansionStats.owned_bitmap"""
+    return bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+
+
+def decode_bitmap(data):
+    return int.from_bytes(bytes(data or b''), 'little')
+
+
+def _expansion_rows(user_id, expansion_ids):
+    """Totales, rarezas y bitmap de cartas de las cartas del usuario en esas expansiones"""
+    owned = UserCard.objects.filter(user_id=user_id, card__expansion_id__in=expansion_ids) # pylint: disable=no-member
+    rows = {
+        row.pop('card__expansion_id'): dict(row, rarity_counts={})
+        for row in owned.values('card__expansion_id').annotate(
+            unique_cards=Count('card_id', distinct=True),
+            total_copies=Sum('quantity'),
+            variants=Count('id'),
+            favorites=Count('id', filter=Q(is_favorite=True)),
+        ).order_by()
+    }
+    # Una fila por carta distinta: rareza y posición en la expansión (bit del bitmap, ver completion.py)
+    bitmaps = dict.fromkeys(rows, 0)
+    for expansion_id, _, rarity, position in owned.values_list(
+        'card__expansion_id', 'card_id', 'card__rarity', 'card__set_position'
+    ).distinct().order_by():
+        rarity_counts = rows[expansion_id]['rarity_counts']
+        rarity_counts[rarity or UNKNOWN_RARITY] = rarity_counts.get(rarity or UNKNOWN_RARITY, 0) + 1
+        if position is not None:
+            bitmaps[expansion_id] |= 1 << position
+    for expansion_id, bits in bitmaps.items():
+        rows[expansion_id]['owned_bitmap'] = encode_bitmap(bits)
+    return rows
+
+
+def refresh_collection_stats(user_id, expansion_ids):
+    """Recalcula las estadísticas del usuario en esas expansiones y sus totales"""
+    expansion_ids = set(expansion_ids)
+    with transaction.atomic():
+        user_stats, _ = UserCollectionStats.objects.select_for_update().get_or_create(user_id=user_id)
+
+        if expansion_ids:
+            rows = _expansion_rows(user_id, expansion_ids)
+            UserExpansionStats.objects.filter(
+                user_id=user_id, expansion_id__in=expansion_ids - set(rows)
+            ).delete()
+            UserExpansionStats.objects.bulk_create(
+                [UserExpansionStats(user_id=user_id, expansion_id=expansion_id, **values)
+                 for expansion_id, values in rows.items()],
+                update_conflicts=True,
+                unique_fields=['user', 'expansion'],
+                update_fields=[*COUNTERS, 'rarity_counts', 'owned_bitmap', 'updated_at'],
+            )
+
+        # Totales del usuario: suma de sus filas por expansión
+        rarity_counts = Counter()
+        totals = dict.fromkeys(COUNTERS, 0)
+        expansions = 0
+        for row in UserExpansionStats.objects.filter(user_id=user_id).values(*COUNTERS, 'rarity_counts'):
+            expansions += 1
+            rarity_counts.update(row.pop('rarity_counts'))
+            for name, value in row.items():
+                totals[name] += value
+        for name, value in totals.items():
+            setattr(user_stats, name, value)
+        user_stats.expansions = expansions
+        user_stats.rarity_counts = dict(rarity_counts)
+        user_stats.save()
+    return user_stats
+
+
+def refresh_for_cards(user_id, card_ids):
+    """Recalcula las expansiones de esas cartas (una consulta para resolverlas)"""
+    expansion_ids = Card.objects.filter(id__in=set(card_ids)).values_list('expansion_id', flat=True).distinct() # pylint: disable=no-member
+    return refresh_collection_stats(user_id, set(expansion_ids))
+
+
+def rebuild_user_stats(user_id):
+    """Recalcula todas las estadísticas de un usuario desde cero"""
+    with transaction.atomic():
+        UserExpansionStats.objects.filter(user_id=user_id).delete()
+        expansion_ids = UserCard.objects.filter(user_id=user_id).values_list( # pylint: disable=no-member
+            'card__expansion_id', flat=True
+        ).distinct()
+        return refresh_collection_stats(user_id, set(expansion_ids))
+
+
+@contextmanager
+def batch_collection_stats():
+    """Agrupa el recálculo de varias escrituras de UserCard en uno por usuario al final del bloque"""
+    if _pending.get() is not None:
+        yield # Ya dentro de un lote: lo recalcula el bloque exterior
+        return
+    pending = {}
+    token = _pending.set(pending)
+    try:
+        yield
+    finally:
+        _pending.reset(token)
+    for user_id, card_ids in pending.items():
+        refresh_for_cards(user_id, card_ids)
+
+
+def mark_changed(user_id, card_ids):
+    """Cartas del usuario que han cambiado: se recalculan ya o al cerrar el lote activo"""
+    pending = _pending.get()
+    if pending is None:
+        refresh_for_cards(user_id, card_ids)
+    else:
+        pending.setdefault(user_id, set()).update(card_ids)
+
+
+@receiver(post_init, sender=UserCard)
+def _user_card_loaded(sender, instance, **kwargs):
+    # Carta con la que se cargó la fila: si un update la cambia hay que recalcular las dos expansiones
+    instance._stats_card_id = instance.__dict__.get('card_id')
+
+
+@receiver(post_save, sender=UserCard)
+def _user_card_saved(sender, instance, **kwargs):
+    card_ids = {instance.card_id}
+    if instance._stats_card_id is not None:
+        card_ids.add(instance._stats_card_id)
+    instance._stats_card_id = instance.card_id
+    mark_changed(instance.user_id, card_ids)
+
+
+@receiver(post_delete, sender=UserCard)
+def _user_card_deleted(sender, instance, origin=None, **kwargs):
+    # Solo borrados de UserCard; en cascada desde el usuario o el catálogo no (ver docstring)
+    if isinstance(origin, UserCard) or getattr(origin, 'model', None) is UserCard:
+        mark_changed(instance.user_id, {instance.card_id})
@@ -0,0 +1,163 @@
+# pokemon_tcg_tracker_project/collection_manager/completion.py
+"""
+Compleción de expansiones: qué porcentaje de cada set tiene el usuario y qué cartas le faltan.
+
+Cada carta del catálogo tiene una posición densa dentro de su expansión (Card.set_position,
+0..n-1 por número de coleccionista), que index_set_positions() recalcula al importar. Con esa
+posición la colección del usuario en una expansión es un entero de n bits
+(UserExpansionStats.owned_bitmap, mantenido por collection_stats en cada cambio de UserCard) y:
+
+- poseídas = bits.bit_count()
+- compleción = poseídas / n
+- faltan = los bits de ((1 << n) - 1) & ~bits
+
+El resumen de expansiones (n por expansión) es una consulta agregada y las cartas de una expansión
+en orden de posición otra (por el índice (expansion, set_position)), así la compleción de todos los
+sets de un usuario son dos consultas (sus bitmaps y el resumen) más operaciones de bits.
+
+Una carta creada fuera de las importaciones (admin, ORM) recibe al guardarse la siguiente posición
+libre de su expansión y borrar una carta deja un hueco; la siguiente importación de esa expansión
+vuelve a numerarlas por número de coleccionista. Mientras tanto las posiciones no son densas: las
+cartas se buscan por posición (get_set_cards) y los bitmaps se recortan a la posición máxima. Un bit
+nunca apunta a una carta borrada: sus UserCards se borran en cascada y eso recalcula el bitmap.
+"""
+import re
+
+from django.db.models import Count, F, Max, Q
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .collection_stats import decode_bitmap, refresh_collection_stats
+from .models import Card, Expansion, UserCard, UserExpansionStats
+
+# Campos de cada carta en las listas de poseídas / faltan
+CARD_FIELDS = ['id', 'api_id', 'name', 'number', 'rarity', 'image_url_small']
+
+_NUMBER_PATTERN = re.compile(r'^(\D*)(\d*)(.*)$')
+
+
+def collector_number_key(number):
+    """
+    Clave de orden de un número de coleccionista: '2' < '10' < '10a' < 'H1' < 'SV2' < 'SV10'.
+    Primero los números puramente numéricos, luego por prefijo; sin número al final.
+    """
+    if not number:
+        return (2, '', 0, '')
+    prefix, digits, rest = _NUMBER_PATTERN.match(number.strip()).groups()
+    return (1 if prefix else 0, prefix.upper(), int(digits) if digits else -1, rest)
+
+
+def index_set_positions(expansion_ids):
+    """
+    Recalcula Card.set_position de las expansiones indicadas. Si una carta que ya tenía posición
+    se mueve (p. ej. llega una carta intermedia), se recalculan los bitmaps de los usuarios que
+    tienen cartas de esa expansión; si una carta sin posición que alguien ya tiene la recibe, los
+    de esos usuarios. Devuelve el número de cartas cuya posición cambió.
+    """
+    changed = []
+    shifted_expansions = set()
+    positioned = []
+    cards = Card.objects.filter(expansion_id__in=set(expansion_ids)).only('id', 'expansion_id', 'api_id', 'number', 'set_position') # pylint: disable=no-member
+    by_expansion = {}
+    for card in cards:
+        by_expansion.setdefault(card.expansion_id, []).append(card)
+
+    for expansion_id, expansion_cards in by_expansion.items():
+        expansion_cards.sort(key=lambda card: (collector_number_key(card.number), card.api_id))
+        for position, card in enumerate(expansion_cards):
+            if card.set_position != position:
+                if card.set_position is not None:
+                    shifted_expansions.add(expansion_id)
+                else:
+                    positioned.append(card.id)
+                card.set_position = position
+                changed.append(card)
+
+    if changed:
+        Card.objects.bulk_update(changed, ['set_position'], batch_size=1000) # pylint: disable=no-member
+    stale = set(UserExpansionStats.objects.filter(expansion_id__in=shifted_expansions).values_list('user_id', 'expansion_id'))
+    if positioned:
+        stale.update(UserCard.objects.filter(card_id__in=positioned).values_list('user_id', 'card__expansion_id')) # pylint: disable=no-member
+    for user_id, expansion_id in stale:
+        refresh_collection_stats(user_id, {expansion_id})
+    return len(changed)
+
+
+@receiver(post_save, sender=Card)
+def _card_saved(sender, instance, created, raw=False, **kwargs):
+    """Carta creada sin posición (admin, ORM): la siguiente libre de su expansión"""
+    if not created or raw or instance.set_position is not None:
+        return
+    last = Card.objects.filter(expansion_id=instance.expansion_id).aggregate(last=Max('set_position'))['last'] # pylint: disable=no-member
+    instance.set_position = 0 if last is None else last + 1
+    Card.objects.filter(pk=instance.pk).update(set_position=instance.set_position) # pylint: disable=no-member
+
+
+def get_set_summary():
+    """Expansiones (por fecha de salida) con su número de cartas indexadas; una consulta"""
+    return list(
+        Expansion.objects.order_by('release_date', 'name').annotate( # pylint: disable=no-member
+            expansion_id=F('id'), expansion_api_id=F('api_id'), expansion_name=F('name'),
+            total=Count('cards', filter=Q(cards__set_position__isnull=False)),
+            last_position=Max('cards__set_position'),
+        ).values('expansion_id', 'expansion_api_id', 'expansion_name', 'series', 'release_date', 'total', 'last_position')
+    )
+
+
+def get_set_cards(expansion):
+    """{set_position: carta} de la expansión en orden de posición: la carta en la posición i es el bit i"""
+    rows = Card.objects.filter(expansion=expansion, set_position__isnull=False).order_by( # pylint: disable=no-member
+        'set_position'
+    ).values_list('set_position', *CARD_FIELDS)
+    return {row[0]: dict(zip(CARD_FIELDS, row[1:])) for row in rows}
+
+
+def _completion(owned, total):
+    return round(100 * owned / total, 2) if total else 0.0
+
+
+def iter_bits(bits):
+    """Posiciones de los bits a 1, de menor a mayor"""
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
+
+
+def completion_for_user(user_id, started_only=False):
+    """
+    Compleción de todas las expansiones para el usuario: una consulta para sus bitmaps y otra
+    para el resumen del catálogo. Con started_only=True solo las expansiones en las que tiene alguna carta.
+    """
+    bitmaps = dict(UserExpansionStats.objects.filter(user_id=user_id).values_list('expansion_id', 'owned_bitmap'))
+    results = []
+    for expansion in get_set_summary():
+        total, last_position = expansion['total'], expansion.pop('last_position')
+        mask = (1 << (last_position + 1)) - 1 if last_position is not None else 0
+        owned = (decode_bitmap(bitmaps.get(expansion['expansion_id'])) & mask).bit_count()
+        if started_only and not owned:
+            continue
+        results.append(dict(expansion, owned=owned, missing=total - owned, completion=_completion(owned, total)))
+    return results
+
+
+def expansion_completion(user_id, expansion):
+    """Compleción de una expansión con las listas de cartas poseídas y que faltan"""
+    cards = get_set_cards(expansion)
+    full = 0 # Bits de las posiciones con carta (puede haber huecos)
+    for position in cards:
+        full |= 1 << position
+    bitmap = UserExpansionStats.objects.filter(user_id=user_id, expansion=expansion).values_list('owned_bitmap', flat=True).first()
+    owned = decode_bitmap(bitmap) & full
+    owned_count = owned.bit_count()
+    return {
+        'expansion_id': expansion.id,
+        'expansion_api_id': expansion.api_id,
+        'expansion_name': expansion.name,
+        'total': len(cards),
+        'owned_count': owned_count,
+        'missing_count': len(cards) - owned_count,
+        'completion': _completion(owned_count, len(cards)),
+        'owned': [cards[position] for position in iter_bits(owned)],
+        'missing': [cards[position] for position in iter_bits(full & ~owned)],
+    }
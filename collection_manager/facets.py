@@ -0,0 +1,251 @@
+# pokemon_tcg_tracker_project/collection_manager/facets.py
+"""
+Filtro de cartas por facetas y recuento de cada faceta.
+
+Facetas: tipo de energía (types, JSON), rareza, HP (hp_value, por rangos), coste de retirada
+(converted_retreat_cost), artista y serie de la expansión. Los parámetros admiten listas separadas
+por comas (?types=Fire,Water&rarity=Rare); dentro de una faceta los valores se combinan con OR
+y entre facetas con AND.
+
+Los recuentos son disyuntivos: los de cada faceta se calculan con todos los filtros salvo los de
+esa misma faceta, así indican cuántas cartas quedarían al añadir ese valor a la selección (con
+?types=Fire, el recuento de Water es el de las cartas Fire o Water que cumplen el resto de filtros
+y no solo las que son Fire y Water). El total sí aplica todos los filtros. El rango de HP
+(hp_min/hp_max) es el filtro de la faceta hp.
+
+En PostgreSQL salen de una única consulta con GROUPING SETS (un grupo por faceta más el total):
+cada filtro es una columna booleana y cada recuento un agregado FILTER con los filtros de las
+demás facetas. En otros motores (SQLite en desarrollo) se hace una consulta por faceta.
+"""
+import json
+
+from django.db import connection
+from django.db.models import BooleanField, Count, ExpressionWrapper, Q
+from rest_framework.exceptions import ValidationError
+
+ENERGY_TYPES = [
+    'Colorless', 'Darkness', 'Dragon', 'Fairy', 'Fighting', 'Fire',
+    'Grass', 'Lightning', 'Metal', 'Psychic', 'Water',
+]
+
+# (etiqueta, mínimo, máximo) de hp_value; los HP de las cartas van de 10 en 10
+HP_BUCKETS = [
+    ('0-50', 0, 50),
+    ('60-90', 60, 90),
+    ('100-150', 100, 150),
+    ('160-200', 160, 200),
+    ('210+', 210, None),
+]
+
+# faceta -> columna agrupada (lookup del ORM)
+GROUPED_FACETS = {
+    'rarity': 'rarity',
+    'artist': 'artist',
+    'retreat_cost': 'converted_retreat_cost',
+    'series': 'expansion__series',
+}
+
+
+def _param_list(params, name):
+    """Valores de ?name=a,b&name=c como lista, sin vacíos"""
+    return [
+        value.strip()
+        for raw in params.getlist(name)
+        for value in raw.split(',')
+        if value.strip()
+    ]
+
+
+def _param_int(params, name):
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValidationError({name: 'Debe ser un número entero.'})
+
+
+def _type_condition(energy_type):
+    # PostgreSQL: types @> '["Fire"]' (índice GIN card_types_gin); SQLite guarda el JSON como texto
+    if connection.vendor == 'postgresql':
+        return Q(types__contains=[energy_type])
+    return Q(types__icontains=f'"{energy_type}"')
+
+
+def _hp_condition(low, high):
+    condition = Q(hp_value__gte=low)
+    if high is not None:
+        condition &= Q(hp_value__lte=high)
+    return condition
+
+
+def facet_filters(params):
+    """
+    {faceta: Q} de los filtros de `params` (QueryDict), solo las facetas pedidas. Dentro de una
+    faceta los valores se combinan con OR; hp es el rango hp_min/hp_max.
+    """
+    filters = {}
+    types = _param_list(params, 'types')
+    if types:
+        canonical = {energy_type.lower(): energy_type for energy_type in ENERGY_TYPES}
+        unknown = [value for value in types if value.lower() not in canonical]
+        if unknown:
+            raise ValidationError({'types': f"Tipos desconocidos: {', '.join(unknown)}."})
+        condition = Q()
+        for value in types:
+            condition |= _type_condition(canonical[value.lower()])
+        filters['types'] = condition
+
+    for facet in ('rarity', 'artist', 'series'):
+        values = _param_list(params, facet)
+        if values:
+            filters[facet] = Q(**{f'{GROUPED_FACETS[facet]}__in': values})
+
+    retreat_costs = _param_list(params, 'retreat_cost')
+    if retreat_costs:
+        try:
+            retreat_costs = [int(value) for value in retreat_costs]
+        except ValueError:
+            raise ValidationError({'retreat_cost': 'Debe ser una lista de números enteros.'})
+        filters['retreat_cost'] = Q(converted_retreat_cost__in=retreat_costs)
+
+    hp_min, hp_max = _param_int(params, 'hp_min'), _param_int(params, 'hp_max')
+    if hp_min is not None or hp_max is not None:
+        condition = Q()
+        if hp_min is not None:
+            condition &= Q(hp_value__gte=hp_min)
+        if hp_max is not None:
+            condition &= Q(hp_value__lte=hp_max)
+        filters['hp'] = condition
+    return filters
+
+
+def apply_facet_filters(queryset, filters, skip=None):
+    """El queryset con los filtros de `filters` salvo el de la faceta `skip`"""
+    for facet, condition in filters.items():
+        if facet != skip:
+            queryset = queryset.filter(condition)
+    return queryset
+
+
+def filter_cards(queryset, params):
+    """Aplica al queryset de cartas los filtros de facetas de `params` (QueryDict)"""
+    return apply_facet_filters(queryset, facet_filters(params))
+
+
+def _sorted_counts(counts):
+    """[{'value', 'count'}] de mayor a menor recuento, sin valores nulos ni recuentos a cero"""
+    items = [(value, count) for value, count in counts if value is not None and count]
+    items.sort(key=lambda item: (-item[1], str(item[0])))
+    return [{'value': value, 'count': count} for value, count in items]
+
+
+def _fixed_counts(labels, counts):
+    """Facetas de valores fijos (tipos, rangos de HP): en su orden, sin recuentos a cero"""
+    return [{'value': label, 'count': count} for label, count in zip(labels, counts) if count]
+
+
+def _postgres_facet_counts(queryset, filters):
+    # Una columna booleana por filtro: m0, m1... en el orden de `filters`
+    matches = {facet: f'm{index}' for index, facet in enumerate(filters)}
+    base = queryset.order_by().annotate(**{
+        column: ExpressionWrapper(filters[facet], output_field=BooleanField()) for facet, column in matches.items()
+    }).values(
+        'rarity', 'artist', 'converted_retreat_cost', 'expansion__series', 'types', 'hp_value', *matches.values(),
+    )
+    base_sql, base_params = base.query.sql_with_params()
+
+    def others(facet=None):
+        """Condición SQL: todos los filtros salvo el de `facet`"""
+        return ' AND '.join(column for name, column in matches.items() if name != facet) or 'TRUE'
+
+    count_aggregates = [f'COUNT(*) FILTER (WHERE {others(facet)})' for facet in (None, *GROUPED_FACETS)]
+    type_aggregates = [f"COUNT(*) FILTER (WHERE {others('types')} AND types @> %s::jsonb)"] * len(ENERGY_TYPES)
+    type_params = [json.dumps([energy_type]) for energy_type in ENERGY_TYPES]
+    hp_aggregates, hp_params = [], []
+    for _, low, high in HP_BUCKETS:
+        if high is None:
+            hp_aggregates.append(f"COUNT(*) FILTER (WHERE {others('hp')} AND hp_value >= %s)")
+            hp_params.append(low)
+        else:
+            hp_aggregates.append(f"COUNT(*) FILTER (WHERE {others('hp')} AND hp_value BETWEEN %s AND %s)")
+            hp_params.extend([low, high])
+    # Una carta que falla dos o más filtros no cuenta en ninguna faceta
+    misses = ' + '.join(f'({column} IS NOT TRUE)::int' for column in matches.values()) or '0'
+
+    columns = ', '.join(['rarity', 'artist', 'retreat_cost', 'series', 'types', 'hp_value', *matches.values()])
+    sql = f"""
+        WITH filtered ({columns}) AS ({base_sql})
+        SELECT GROUPING(rarity), GROUPING(artist), GROUPING(retreat_cost), GROUPING(series),
+               rarity, artist, retreat_cost, series,
+               {', '.join(count_aggregates + type_aggregates + hp_aggregates)}
+        FROM filtered
+        WHERE {misses} <= 1
+        GROUP BY GROUPING SETS ((rarity), (artist), (retreat_cost), (series), ())
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*base_params, *type_params, *hp_params])
+        rows = cursor.fetchall()
+
+    grouped = {facet: [] for facet in GROUPED_FACETS}
+    total, type_counts, hp_counts = 0, [], []
+    for row in rows:
+        flags, values = row[:4], row[4:8]
+        counts, extra = row[8:13], row[13:]
+        if all(flags):
+            # () : el total y los agregados FILTER de tipos y HP
+            total = counts[0]
+            type_counts, hp_counts = extra[:len(ENERGY_TYPES)], extra[len(ENERGY_TYPES):]
+            continue
+        for index, (facet, flag, value) in enumerate(zip(GROUPED_FACETS, flags, values)):
+            if not flag:
+                grouped[facet].append((value, counts[index + 1]))
+    return total, type_counts, hp_counts, grouped
+
+
+def _generic_facet_counts(queryset, filters):
+    queryset = queryset.order_by()
+    types_base = apply_facet_filters(queryset, filters, skip='types')
+    hp_base = apply_facet_filters(queryset, filters, skip='hp')
+    type_counts = types_base.aggregate(**{
+        f'type_{index}': Count('id', filter=_type_condition(energy_type)) for index, energy_type in enumerate(ENERGY_TYPES)
+    })
+    hp_counts = hp_base.aggregate(**{
+        f'hp_{index}': Count('id', filter=_hp_condition(low, high)) for index, (_, low, high) in enumerate(HP_BUCKETS)
+    })
+
+    grouped = {
+        facet: list(
+            apply_facet_filters(queryset, filters, skip=facet)
+            .values(column).annotate(count=Count('id')).values_list(column, 'count')
+        )
+        for facet, column in GROUPED_FACETS.items()
+    }
+    return (
+        apply_facet_filters(queryset, filters).count(),
+        [type_counts[f'type_{index}'] for index in range(len(ENERGY_TYPES))],
+        [hp_counts[f'hp_{index}'] for index in range(len(HP_BUCKETS))],
+        grouped,
+    )
+
+
+def facet_counts(queryset, filters=None):
+    """
+    (total, facetas) de las cartas de `queryset` con los filtros `filters` (ver facet_filters).
+    facetas es un dict {faceta: [{'value': ..., 'count': ...}, ...]} con types, hp, rarity, artist,
+    retreat_cost y series; los recuentos de cada faceta ignoran el filtro de esa faceta.
+    """
+    filters = filters or {}
+    if connection.vendor == 'postgresql':
+        total, type_counts, hp_counts, grouped = _postgres_facet_counts(queryset, filters)
+    else:
+        total, type_counts, hp_counts, grouped = _generic_facet_counts(queryset, filters)
+
+    facets = {
+        'types': _fixed_counts(ENERGY_TYPES, type_counts),
+        'hp': _fixed_counts([label for label, _, _ in HP_BUCKETS], hp_counts),
+    }
+    for facet, counts in grouped.items():
+        facets[facet] = _sorted_counts(counts)
+    return total, facets
@@ -0,0 +1,149 @@
+import tempfile
+import time
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from collection_manager.api_service import import_cards_for_expansion, import_expansions, save_expansions_to_db
+from collection_manager.management.commands.benchmark_upsert import QueryCounter, fake_card_payload
+from collection_manager.pokemontcg_client import PokemonTCGClient, override_client
+from collection_manager.stub_api import load_recordings, start_stub_server, write_recordings
+
+SCENARIOS = ['import_expansions', 'import_cards_for_expansion', 'import_cards_resync',
+             'load_expansions', 'load_cards_by_expansion']
+
+
+def reset_peak_rss():
+    """Reinicia el pico de RSS del proceso (Linux >= 4.0); devuelve False si no es posible"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as fh:
+            fh.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb():
+    """Pico de RSS del proceso (VmHWM) en MB, o None fuera de Linux"""
+    try:
+        with open('/proc/self/status') as fh:
+            for line in fh:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def synthetic_recordings(recordings_dir, sets, cards_per_set):
+    """Graba un catálogo sintético (misma forma que /v2/sets y /v2/cards) en recordings_dir"""
+    expansions = [
+        {
+            'id': f'bench{i}',
+            'name': f'Benchmark Set {i}',
+            'series': 'Benchmark',
+            'releaseDate': '2024/01/01',
+            'total': cards_per_set,
+            'images': {'symbol': f'https://images.example.com/bench{i}/symbol.png',
+                       'logo': f'https://images.example.com/bench{i}/logo.png'},
+        }
+        for i in range(sets)
+    ]
+    cards = {
+        expansion['id']: [fake_card_payload(expansion['id'], n) for n in range(1, cards_per_set + 1)]
+        for expansion in expansions
+    }
+    write_recordings(recordings_dir, expansions, cards)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the ingest paths (api_service imports and load_* commands) against a local stub of the API'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recordings', type=str,
+                            help='Directory with recorded sets/<lang>.json and cards/<lang>/<set>.json '
+                                 '(default: a synthetic catalog)')
+        parser.add_argument('--sets', type=int, default=4, help='Synthetic expansions to generate')
+        parser.add_argument('--cards-per-set', type=int, default=600, help='Synthetic cards per expansion')
+        parser.add_argument('--latency-ms', type=float, default=0, help='Latency added by the stub to every response')
+        parser.add_argument('--throttle-every', type=int, default=0,
+                            help='Stub answers 429 (Retry-After: 0) to every Nth request (0 = never)')
+        parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=SCENARIOS,
+                            help='Scenarios to run (default: all)')
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory(prefix='pokemontcg-bench-') as tmp_dir:
+            recordings_dir = options['recordings']
+            if not recordings_dir:
+                recordings_dir = tmp_dir
+                synthetic_recordings(recordings_dir, options['sets'], options['cards_per_set'])
+            try:
+                sets, cards = load_recordings(recordings_dir)
+            except (OSError, ValueError) as e:
+                raise CommandError(f'❌ No se pudieron leer las grabaciones: {e}') from e
+
+            self.sets = [expansion for expansion in sets if expansion['id'] in cards]
+            self.cards = cards
+            with start_stub_server(recordings_dir, options['latency_ms'] / 1000, options['throttle_every']) as stub:
+                client = PokemonTCGClient(base_url=stub.base_url, max_retries=5, backoff_base=0.01)
+                self.stdout.write(
+                    f"🧪 Stub en {stub.base_url}: {len(self.sets)} expansiones, "
+                    f"{sum(len(cards[e['id']]) for e in self.sets)} cartas, latencia {options['latency_ms']:.0f}ms, "
+                    f"429 cada {options['throttle_every'] or '∞'} peticiones"
+                )
+                if not reset_peak_rss():
+                    self.stdout.write(self.style.WARNING('⚠️ No se puede reiniciar el pico de RSS: se muestra el del proceso'))
+                with override_client(client):
+                    for scenario in options['scenarios']:
+                        self.report(scenario, *self.run_scenario(scenario))
+
+        self.stdout.write(self.style.SUCCESS('✅ Benchmark completado (cambios revertidos)'))
+
+    def run_scenario(self, scenario):
+        """Ejecuta un escenario en una transacción revertida; devuelve (segundos, queries, filas, pico RSS)"""
+        with transaction.atomic():
+            # Preparación (no medida): los escenarios de cartas necesitan las expansiones
+            if scenario not in ('import_expansions', 'load_expansions'):
+                save_expansions_to_db(self.sets, bulk=True)
+            if scenario == 'import_cards_resync':
+                for expansion in self.sets:
+                    import_cards_for_expansion(expansion['id'])
+
+            reset_peak_rss()
+            counter = QueryCounter()
+            with connection.execute_wrapper(counter):
+                start = time.perf_counter()
+                rows = getattr(self, f'run_{scenario}')()
+                elapsed = time.perf_counter() - start
+            transaction.set_rollback(True)
+        return elapsed, counter.count, rows, peak_rss_mb()
+
+    def run_import_expansions(self):
+        import_expansions()
+        return len(self.sets)
+
+    def run_import_cards_for_expansion(self):
+        rows = 0
+        for expansion in self.sets:
+            result = import_cards_for_expansion(expansion['id'])
+            rows += result.created + result.updated + result.unchanged
+        return rows
+
+    run_import_cards_resync = run_import_cards_for_expansion
+
+    def run_load_expansions(self):
+        call_command('load_expansions', stdout=StringIO())
+        return len(self.sets)
+
+    def run_load_cards_by_expansion(self):
+        for expansion in self.sets:
+            call_command('load_cards_by_expansion', expansion['id'],
+                         '--limit', str(len(self.cards[expansion['id']])), stdout=StringIO())
+        return sum(len(self.cards[expansion['id']]) for expansion in self.sets)
+
+    def report(self, scenario, elapsed, queries, rows, rss):
+        rate = rows / elapsed if elapsed else float('inf')
+        rss = f"{rss:8.1f} MB" if rss is not None else '       n/a'
+        self.stdout.write(
+            f"{scenario:27} {elapsed:8.3f}s {queries:7d} queries {rate:10.0f} rows/s {rss} peak RSS  ({rows} rows)"
+        )
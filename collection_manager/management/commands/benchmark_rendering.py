@@ -0,0 +1,96 @@
+import gzip
+import time
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+from collection_manager.models import Card, Expansion, UserCard
+from collection_manager.renderers import ORJSONRenderer
+from collection_manager.serializers import UserCardSerializer
+from collection_manager.views import UserCardsGroupedView
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+LANGUAGES = [code for code, _ in UserCard.LANGUAGE_CHOICES]
+
+
+def best_of(repeat, func):
+    """Menor tiempo de `repeat` ejecuciones (menos ruido que la media) y el último resultado"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+class Command(BaseCommand):
+    help = 'Compare stdlib JSON vs orjson rendering and gzip/brotli sizes for a large user collection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help='Number of UserCard rows in the synthetic collection')
+        parser.add_argument('--repeat', type=int, default=3, help='Renders per renderer (the best time is reported)')
+
+    def create_collection(self, rows):
+        """Colección sintética: cada carta en varios idiomas para llegar a `rows` UserCards"""
+        user = get_user_model().objects.create_user(username='benchmark-rendering', password='unused')
+        expansion = Expansion.objects.create(api_id='benchrender', name='Benchmark Rendering Set')
+        per_card = len(LANGUAGES)
+        cards = Card.objects.bulk_create([
+            Card(api_id=f'benchrender-{i}', name=f'Bench Card {i}', expansion=expansion, number=str(i),
+                 rarity='Common', image_url_small=f'https://images.example.com/benchrender/{i}.png')
+            for i in range((rows + per_card - 1) // per_card)
+        ])
+        UserCard.objects.bulk_create([
+            UserCard(user=user, card=cards[i // per_card], language=LANGUAGES[i % per_card],
+                     quantity=1 + i % 3, condition='NM', notes='Benchmark copy')
+            for i in range(rows)
+        ], batch_size=2000)
+        return user
+
+    def payloads(self, user):
+        list_data = UserCardSerializer(
+            UserCard.objects.filter(user=user).select_related('card__expansion'), many=True
+        ).data
+        request = APIRequestFactory().get('/api/user-cards/grouped/')
+        force_authenticate(request, user=user)
+        grouped_data = UserCardsGroupedView.as_view()(request).data
+        return [('user-cards', list_data), ('user-cards/grouped', grouped_data)]
+
+    def handle(self, *args, **options):
+        repeat = max(1, options['repeat'])
+        with transaction.atomic():
+            user = self.create_collection(options['rows'])
+            payloads = self.payloads(user)
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"📦 {options['rows']} UserCards (mejor de {repeat} renderizados)")
+        for label, data in payloads:
+            stdlib_time, stdlib_body = best_of(repeat, lambda: JSONRenderer().render(data))
+            orjson_time, orjson_body = best_of(repeat, lambda: ORJSONRenderer().render(data))
+            gzip_time, gzipped = best_of(repeat, lambda: gzip.compress(orjson_body, compresslevel=6))
+
+            self.stdout.write(f"\n{label}")
+            self.stdout.write(f"  render json (stdlib) {stdlib_time * 1000:9.1f} ms {len(stdlib_body):12,d} bytes")
+            self.stdout.write(
+                f"  render orjson        {orjson_time * 1000:9.1f} ms {len(orjson_body):12,d} bytes "
+                f"({stdlib_time / orjson_time if orjson_time else float('inf'):.1f}x)"
+            )
+            self.stdout.write(
+                f"  gzip                 {gzip_time * 1000:9.1f} ms {len(gzipped):12,d} bytes "
+                f"({len(gzipped) / len(orjson_body):.1%} del original)"
+            )
+            if brotli is not None:
+                brotli_time, compressed = best_of(repeat, lambda: brotli.compress(orjson_body, quality=5))
+                self.stdout.write(
+                    f"  brotli (q=5)         {brotli_time * 1000:9.1f} ms {len(compressed):12,d} bytes "
+                    f"({len(compressed) / len(orjson_body):.1%} del original)"
+                )
+            else:
+                self.stdout.write('  brotli               no instalado (pip install Brotli)')
+
+        self.stdout.write(self.style.SUCCESS('\n✅ Benchmark completado (cambios revertidos)'))
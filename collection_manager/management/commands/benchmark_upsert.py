@@ -0,0 +1,97 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from collection_manager.api_service import save_cards_to_db
+from collection_manager.models import Expansion
+
+
+def fake_card_payload(set_id, index):
+    """Genera un payload con la misma forma que /v2/cards para el benchmark"""
+    return {
+        'id': f'{set_id}-{index}',
+        'name': f'Bench Card {index}',
+        'rarity': 'Common',
+        'images': {
+            'small': f'https://images.example.com/{set_id}/{index}.png',
+            'large': f'https://images.example.com/{set_id}/{index}_hires.png',
+        },
+        'hp': '60',
+        'types': ['Lightning'],
+        'attacks': [{'name': 'Thunder Shock', 'cost': ['Lightning'], 'damage': '10'}],
+        'weaknesses': [{'type': 'Fighting', 'value': '×2'}],
+        'retreatCost': ['Colorless'],
+        'convertedRetreatCost': 1,
+        'number': str(index),
+        'artist': 'Bench Artist',
+        'flavorText': 'Synthetic card used by benchmark_upsert.',
+    }
+
+
+class QueryCounter:
+    """execute_wrapper que cuenta las queries sin guardarlas (no depende de DEBUG ni del límite de connection.queries)"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = 'Compare per-row update_or_create against the bulk upsert path of save_cards_to_db'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cards', type=int, default=3000, help='Number of synthetic cards to write')
+        parser.add_argument('--set-size', type=int, default=250, help='Cards per synthetic expansion (one save call per set)')
+
+    def run_mode(self, expansions, bulk):
+        """Escribe todas las cartas dos veces (carga inicial + resync) y mide tiempo y queries"""
+        results = []
+        for phase in ('insert', 'resync'):
+            if phase == 'resync':
+                # Cambia un 10% de las cartas para que el resync tenga filas que escribir
+                for _, payload in expansions:
+                    for card in payload[::10]:
+                        card['hp'] = str(int(card['hp']) + 10)
+            counter = QueryCounter()
+            with connection.execute_wrapper(counter):
+                start = time.perf_counter()
+                created = updated = unchanged = 0
+                for expansion, payload in expansions:
+                    counts = save_cards_to_db(payload, expansion, bulk=bulk)
+                    created += counts.created
+                    updated += counts.updated
+                    unchanged += counts.unchanged
+                elapsed = time.perf_counter() - start
+            results.append((phase, elapsed, counter.count, created, updated, unchanged))
+        return results
+
+    def handle(self, *args, **options):
+        total = options['cards']
+        set_size = options['set_size']
+
+        for bulk in (False, True):
+            label = 'bulk' if bulk else 'per-row'
+            # Todo se ejecuta en una transacción que se revierte al final: la BD queda intacta
+            with transaction.atomic():
+                expansions = []
+                for set_index, offset in enumerate(range(0, total, set_size)):
+                    expansion = Expansion.objects.create(
+                        api_id=f'bench{set_index}', name=f'Benchmark Set {set_index}'
+                    )
+                    payload = [
+                        fake_card_payload(expansion.api_id, i)
+                        for i in range(offset, min(offset + set_size, total))
+                    ]
+                    expansions.append((expansion, payload))
+
+                for phase, elapsed, queries, created, updated, unchanged in self.run_mode(expansions, bulk):
+                    rate = total / elapsed if elapsed else float('inf')
+                    self.stdout.write(
+                        f"{label:8} {phase:7} {elapsed:8.3f}s {queries:7d} queries "
+                        f"{rate:10.0f} cards/s  ({created} created, {updated} updated, {unchanged} unchanged)"
+                    )
+                transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS('✅ Benchmark completado (cambios revertidos)'))
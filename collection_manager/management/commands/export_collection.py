@@ -0,0 +1,31 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from collection_manager.collection_export import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, export_collection
+
+
+class Command(BaseCommand):
+    help = 'Export the collection of a user as CSV or NDJSON (streamed, constant memory)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', type=str, help='Owner of the collection')
+        parser.add_argument('--format', dest='export_format', choices=sorted(EXPORT_FORMATS), default='csv',
+                            help='Output format (default: csv)')
+        parser.add_argument('--output', type=str, help='File to write (default: stdout)')
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE,
+                            help=f'Rows fetched per round trip (default: {EXPORT_CHUNK_SIZE})')
+
+    def handle(self, *args, **options):
+        user_id = get_user_model().objects.filter(username=options['username']).values_list('pk', flat=True).first()
+        if user_id is None:
+            raise CommandError(f"❌ No existe el usuario {options['username']}")
+
+        chunks = export_collection(user_id, options['export_format'], options['chunk_size'])
+        if not options['output']:
+            for chunk in chunks:
+                self.stdout.write(chunk.decode(), ending='')
+            return
+
+        with open(options['output'], 'wb') as output:
+            for chunk in chunks:
+                output.write(chunk)
+        self.stderr.write(self.style.SUCCESS(f"✅ Colección de {options['username']} exportada en {options['output']}"))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+from collection_manager.models import ImportRun
+
+
+def format_bytes(size):
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f"{size:.0f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GB"
+
+
+class Command(BaseCommand):
+    help = 'Show the slowest steps of an import run (default: the latest one)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--run', type=int, help='ImportRun ID (default: latest run)')
+        parser.add_argument('--limit', type=int, default=10, help='Number of steps to show')
+
+    def handle(self, *args, **options):
+        runs = ImportRun.objects.all()
+        run = runs.filter(pk=options['run']).first() if options['run'] else runs.first()
+        if run is None:
+            raise CommandError('❌ No hay ejecuciones de importación registradas.')
+
+        steps = run.steps.order_by('-duration_seconds')
+        self.stdout.write(
+            f"📊 {run.command} #{run.pk} ({run.status}) — iniciada {run.started_at:%Y-%m-%d %H:%M:%S}, "
+            f"{steps.count()} pasos"
+        )
+        self.stdout.write(
+            f"{'step':20} {'total':>8} {'http':>8} {'db':>8} {'req':>5} {'rows':>7} {'rows/s':>9} {'bytes':>8} {'err':>4}"
+        )
+        for step in steps[:options['limit']]:
+            rows = step.rows_created + step.rows_updated + step.rows_unchanged
+            self.stdout.write(
+                f"{step.name[:20]:20} {step.duration_seconds:7.2f}s {step.http_seconds:7.2f}s {step.db_seconds:7.2f}s "
+                f"{step.http_requests:5d} {rows:7d} {step.rows_per_second:9.0f} {format_bytes(step.bytes_downloaded):>8} "
+                f"{step.error_count:4d}"
+            )
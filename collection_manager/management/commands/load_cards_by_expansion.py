@@ -1,6 +1,13 @@
 import requests
 from django.core.management.base import BaseCommand
-from collection_manager.models import Expansion, Card
+from collection_manager.api_service import SyncCounts, parse_hp
+from collection_manager.models import Expansion, Card, ImportRun
+from collection_manager.catalog_cache import refresh_catalog_blobs
+from collection_manager.catalog_version import bump_catalog_version
+from collection_manager.completion import index_set_positions
+from collection_manager.pokemontcg_client import get_client
+from collection_manager.search import refresh_search_vectors
+from collection_manager.telemetry import db_timer, finish_run, start_run, track_step
 
 class Command(BaseCommand):
     help = 'Load cards from a specific expansion'
@@ -47,10 +54,12 @@ class Command(BaseCommand):
         identifier = options['expansion_identifier']
         limit = options['limit']
         
+        run = start_run('load_cards_by_expansion')
         # Buscar la expansión
         expansion = self.find_expansion(identifier)
         
         if not expansion:
+            finish_run(run, ImportRun.STATUS_FAILED)
             self.stdout.write(
                 self.style.ERROR(f'❌ Expansión "{identifier}" no encontrada.')
             )
@@ -61,57 +70,66 @@ class Command(BaseCommand):
 
         self.stdout.write(f"🔍 Cargando cartas para: {expansion.name} (api_id: {expansion.api_id})")
         
-        url = f"https://api.pokemontcg.io/v2/cards"
         params = {
             'q': f'set.id:{expansion.api_id}',
             'pageSize': limit
         }
         
         try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
+            with track_step(run, 'cards', expansion=expansion) as metrics:
+                data = get_client().get_json('/cards', params=params, timeout=30)
             
-            created_count = 0
-            updated_count = 0
+                created_count = 0
+                updated_count = 0
             
-            for card_data in data['data']:
-                # ← USAR SOLO CAMPOS QUE EXISTEN EN TU MODELO
-                card, created = Card.objects.get_or_create(
-                    api_id=card_data['id'],
-                    defaults={
-                        'name': card_data['name'],
-                        'expansion': expansion,
-                        'number': card_data.get('number', ''),
-                        'rarity': card_data.get('rarity', ''),
+                with db_timer():
+                    for card_data in data['data']:
+                        # ← USAR SOLO CAMPOS QUE EXISTEN EN TU MODELO
+                        card, created = Card.objects.get_or_create(
+                            api_id=card_data['id'],
+                            defaults={
+                                'name': card_data['name'],
+                                'expansion': expansion,
+                                'number': card_data.get('number', ''),
+                                'rarity': card_data.get('rarity', ''),
                         
-                        # ← CAMPOS DE IMAGEN (existen en tu modelo)
-                        'image_url_small': card_data.get('images', {}).get('small', ''),
-                        'image_url_large': card_data.get('images', {}).get('large', ''),
+                                # ← CAMPOS DE IMAGEN (existen en tu modelo)
+                                'image_url_small': card_data.get('images', {}).get('small', ''),
+                                'image_url_large': card_data.get('images', {}).get('large', ''),
                         
-                        # ← CAMPOS DE ATRIBUTOS POKÉMON (existen en tu modelo)
-                        'hp': card_data.get('hp'),
-                        'types': card_data.get('types', []),  # JSONField
-                        'abilities': card_data.get('abilities', []),  # JSONField
-                        'attacks': card_data.get('attacks', []),  # JSONField
-                        'weaknesses': card_data.get('weaknesses', []),  # JSONField
-                        'resistances': card_data.get('resistances', []),  # JSONField
-                        'retreat_cost': card_data.get('retreatCost', []),  # JSONField
-                        'converted_retreat_cost': card_data.get('convertedRetreatCost'),
+                                # ← CAMPOS DE ATRIBUTOS POKÉMON (existen en tu modelo)
+                                'hp': card_data.get('hp'),
+                                'hp_value': parse_hp(card_data.get('hp')),
+                                'types': card_data.get('types', []),  # JSONField
+                                'abilities': card_data.get('abilities', []),  # JSONField
+                                'attacks': card_data.get('attacks', []),  # JSONField
+                                'weaknesses': card_data.get('weaknesses', []),  # JSONField
+                                'resistances': card_data.get('resistances', []),  # JSONField
+                                'retreat_cost': card_data.get('retreatCost', []),  # JSONField
+                                'converted_retreat_cost': card_data.get('convertedRetreatCost'),
                         
-                        # ← CAMPOS DE METADATOS (existen en tu modelo)
-                        'artist': card_data.get('artist', ''),
-                        'flavor_text': card_data.get('flavorText', ''),
-                    }
-                )
+                                # ← CAMPOS DE METADATOS (existen en tu modelo)
+                                'artist': card_data.get('artist', ''),
+                                'flavor_text': card_data.get('flavorText', ''),
+                            }
+                        )
                 
-                if created:
-                    created_count += 1
-                    if created_count <= 10:  # Mostrar solo las primeras 10
-                        self.stdout.write(f"✅ {card.name} ({card.number}) - {card.rarity}")
-                else:
-                    updated_count += 1
-                    
+                        if created:
+                            created_count += 1
+                            if created_count <= 10:  # Mostrar solo las primeras 10
+                                self.stdout.write(f"✅ {card.name} ({card.number}) - {card.rarity}")
+                        else:
+                            updated_count += 1
+
+                    if created_count:
+                        refresh_search_vectors(Card.objects.filter(expansion=expansion, search_vector__isnull=True))
+                        index_set_positions([expansion.id])
+                        bump_catalog_version() # Invalida los ETag de los endpoints públicos del catálogo
+                        refresh_catalog_blobs([expansion.api_id])
+                # get_or_create no modifica las existentes: cuentan como sin cambios
+                metrics.counts = SyncCounts(created_count, 0, updated_count)
+
+            finish_run(run, ImportRun.STATUS_SUCCESS)
             self.stdout.write(
                 self.style.SUCCESS(
                     f'✅ {expansion.name}: {created_count} cartas creadas, {updated_count} ya existían'
@@ -119,10 +137,12 @@ class Command(BaseCommand):
             )
             
         except requests.RequestException as e:
+            finish_run(run, ImportRun.STATUS_FAILED)
             self.stdout.write(
                 self.style.ERROR(f'❌ Error al conectar con la API: {e}')
             )
         except Exception as e:
+            finish_run(run, ImportRun.STATUS_FAILED)
             self.stdout.write(
                 self.style.ERROR(f'❌ Error inesperado: {e}')
             )
\ No newline at end of file
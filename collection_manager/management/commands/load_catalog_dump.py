@@ -0,0 +1,42 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from collection_manager.catalog_loader import LOAD_CHUNK_SIZE, load_catalog_dump
+from collection_manager.models import ImportRun
+from collection_manager.telemetry import db_timer, finish_run, start_run, track_step
+
+
+class Command(BaseCommand):
+    help = 'Load expansions and cards from a local pokemon-tcg-data JSON dump (no network access)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('dump_dir', type=str,
+                            help='Directory with sets/<lang>.json and cards/<lang>/<set>.json')
+        parser.add_argument('--language', type=str, default='en', help='Dump language folder (default: en)')
+        parser.add_argument('--chunk-size', type=int, default=LOAD_CHUNK_SIZE,
+                            help='Rows sent per COPY/upsert block')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        run = start_run('load_catalog_dump')
+        try:
+            with track_step(run, 'catalog dump') as metrics, db_timer():
+                result = load_catalog_dump(options['dump_dir'], options['language'], options['chunk_size'])
+                metrics.counts = result['cards']
+        except (FileNotFoundError, ValueError) as e:
+            finish_run(run, ImportRun.STATUS_FAILED)
+            raise CommandError(f'❌ No se pudo cargar el volcado: {e}') from e
+        except Exception:
+            finish_run(run, ImportRun.STATUS_FAILED)
+            raise
+        finish_run(run, ImportRun.STATUS_SUCCESS)
+        elapsed = time.perf_counter() - start
+
+        for label, counts in (('Expansiones', result['expansions']), ('Cartas', result['cards'])):
+            self.stdout.write(
+                f"📦 {label}: {counts.created} creadas, {counts.updated} actualizadas, {counts.unchanged} sin cambios"
+            )
+        if result['skipped_cards']:
+            self.stdout.write(self.style.WARNING(
+                f"⚠️ {result['skipped_cards']} cartas omitidas: su expansión no existe"
+            ))
+        self.stdout.write(self.style.SUCCESS(f'✅ Volcado cargado en {elapsed:.1f}s'))
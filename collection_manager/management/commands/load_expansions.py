@@ -1,6 +1,11 @@
 import requests
 from django.core.management.base import BaseCommand
-from collection_manager.models import Expansion
+from collection_manager.api_service import SyncCounts
+from collection_manager.models import Expansion, ImportRun
+from collection_manager.catalog_cache import refresh_catalog_blobs
+from collection_manager.catalog_version import bump_catalog_version
+from collection_manager.pokemontcg_client import get_client
+from collection_manager.telemetry import db_timer, finish_run, start_run, track_step
 from datetime import datetime
 
 class Command(BaseCommand):
@@ -17,38 +22,44 @@ class Command(BaseCommand):
             return None
 
     def handle(self, *args, **options):
-        url = "https://api.pokemontcg.io/v2/sets"
-        
+        run = start_run('load_expansions')
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            data = response.json()
-            
-            created_count = 0
-            updated_count = 0
-            
-            for set_data in data['data']:
-                # Convertir fecha al formato correcto
-                release_date = self.convert_date_format(set_data.get('releaseDate'))
+            with track_step(run, 'expansions') as metrics:
+                data = get_client().get_json('/sets')
                 
-                expansion, created = Expansion.objects.get_or_create(
-                    api_id=set_data['id'],
-                    defaults={
-                        'name': set_data['name'],
-                        'series': set_data.get('series', ''),
-                        'release_date': release_date,  # ← Usar fecha convertida
-                        'total_cards': set_data.get('total', 0),
-                        'symbol_url': set_data.get('images', {}).get('symbol', ''),
-                        'logo_url': set_data.get('images', {}).get('logo', ''),
-                    }
-                )
+                created_count = 0
+                updated_count = 0
                 
-                if created:
-                    created_count += 1
-                    self.stdout.write(f"✅ Creada: {expansion.name} ({expansion.api_id}) - {release_date}")
-                else:
-                    updated_count += 1
+                with db_timer():
+                    for set_data in data['data']:
+                        # Convertir fecha al formato correcto
+                        release_date = self.convert_date_format(set_data.get('releaseDate'))
+                        
+                        expansion, created = Expansion.objects.get_or_create(
+                            api_id=set_data['id'],
+                            defaults={
+                                'name': set_data['name'],
+                                'series': set_data.get('series', ''),
+                                'release_date': release_date,  # ← Usar fecha convertida
+                                'total_cards': set_data.get('total', 0),
+                                'symbol_url': set_data.get('images', {}).get('symbol', ''),
+                                'logo_url': set_data.get('images', {}).get('logo', ''),
+                            }
+                        )
+                        
+                        if created:
+                            created_count += 1
+                            self.stdout.write(f"✅ Creada: {expansion.name} ({expansion.api_id}) - {release_date}")
+                        else:
+                            updated_count += 1
+                # get_or_create no modifica las existentes: cuentan como sin cambios
+                metrics.counts = SyncCounts(created_count, 0, updated_count)
+
+            if created_count:
+                bump_catalog_version() # Invalida los ETag de los endpoints públicos del catálogo
+                refresh_catalog_blobs(expansion_list=True)
                     
+            finish_run(run, ImportRun.STATUS_SUCCESS)
             self.stdout.write(
                 self.style.SUCCESS(
                     f'✅ Proceso completado: {created_count} expansiones creadas, {updated_count} ya existían'
@@ -56,10 +67,12 @@ class Command(BaseCommand):
             )
             
         except requests.RequestException as e:
+            finish_run(run, ImportRun.STATUS_FAILED)
             self.stdout.write(
                 self.style.ERROR(f'❌ Error al conectar con la API: {e}')
             )
         except Exception as e:
+            finish_run(run, ImportRun.STATUS_FAILED)
             self.stdout.write(
                 self.style.ERROR(f'❌ Error inesperado: {e}')
             )
\ No newline at end of file
@@ -0,0 +1,23 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from collection_manager.collection_stats import rebuild_user_stats
+
+
+class Command(BaseCommand):
+    help = 'Rebuild UserCollectionStats / UserExpansionStats from UserCard (all users or one)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=str, help='Username to rebuild (default: every user)')
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.order_by('pk')
+        if options['user']:
+            users = users.filter(username=options['user'])
+            if not users.exists():
+                raise CommandError(f"❌ No existe el usuario {options['user']}")
+
+        rebuilt = 0
+        for user_id in users.values_list('pk', flat=True).iterator():
+            rebuild_user_stats(user_id)
+            rebuilt += 1
+        self.stdout.write(self.style.SUCCESS(f'✅ Estadísticas recalculadas para {rebuilt} usuarios'))
@@ -0,0 +1,69 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from collection_manager.api_service import import_all_expansions_cards, import_expansions
+from collection_manager.catalog_version import batch_catalog_changes
+from collection_manager.models import ImportRun
+from collection_manager.telemetry import finish_run, start_run
+
+
+class Command(BaseCommand):
+    help = 'Sync expansions and cards from the Pokemon TCG API, importing several expansions concurrently'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4,
+                            help='Number of expansions imported concurrently (1 = serial)')
+        parser.add_argument('--expansions', nargs='+', metavar='API_ID',
+                            help='Only sync cards for these expansion API IDs (e.g., base1 jungle)')
+        parser.add_argument('--skip-expansions', action='store_true',
+                            help='Do not refresh the expansion list before importing cards')
+        parser.add_argument('--resume', action='store_true',
+                            help='Resume an interrupted sync from the per-expansion page checkpoints')
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        if workers < 1:
+            raise CommandError('--workers debe ser al menos 1')
+
+        start = time.perf_counter()
+        run = start_run('sync_catalog')
+        try:
+            with batch_catalog_changes(): # Expansiones y cartas: una sola versión nueva del catálogo
+                summary = self.sync(run, workers, options)
+        except Exception:
+            finish_run(run, ImportRun.STATUS_FAILED)
+            raise
+        elapsed = time.perf_counter() - start
+        finish_run(run, ImportRun.STATUS_PARTIAL if summary['partial'] or summary['failed'] else ImportRun.STATUS_SUCCESS)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ {summary['expansions'] - len(summary['failed'])}/{summary['expansions']} expansiones sincronizadas: "
+                f"{summary['created']} cartas creadas, {summary['updated']} actualizadas, "
+                f"{summary['unchanged']} sin cambios en {elapsed:.1f}s"
+            )
+        )
+
+        if summary['partial']:
+            self.stdout.write(self.style.WARNING(
+                f"⚠️ {len(summary['partial'])} expansiones importadas parcialmente (usa --resume para continuar): "
+                f"{', '.join(sorted(summary['partial']))}"
+            ))
+
+        if summary['failed']:
+            self.stdout.write(self.style.ERROR(f"❌ {len(summary['failed'])} expansiones fallaron:"))
+            for api_id, error in sorted(summary['failed'].items()):
+                self.stdout.write(f"   - {api_id}: {error}")
+
+        self.stdout.write(f"📊 Telemetría: python manage.py import_stats --run {run.pk}")
+
+    def sync(self, run, workers, options):
+        if not options['skip_expansions']:
+            counts = import_expansions(run=run)
+            self.stdout.write(
+                f"📦 Expansiones: {counts.created} creadas, {counts.updated} actualizadas, {counts.unchanged} sin cambios"
+            )
+
+        self.stdout.write(f"🔄 Importando cartas con {workers} worker(s)...")
+        return import_all_expansions_cards(
+            workers=workers, expansion_api_ids=options['expansions'], resume=options['resume'], run=run
+        )
@@ -0,0 +1,59 @@
+# pokemon_tcg_tracker_project/collection_manager/middleware.py
+import re
+
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import cc_delim_re, patch_vary_headers
+
+try:
+    import brotli
+except ImportError: # Brotli es opcional: sin él solo se comprime con gzip
+    brotli = None
+
+re_accepts_brotli = re.compile(r'\bbr\b')
+
+
+def carries_no_secrets(request, response):
+    """
+    La respuesta no puede contener secretos del usuario: petición sin credenciales (ni Authorization
+    ni cookies) o respuesta pública (Cache-Control: public), y sin Set-Cookie.
+    """
+    if response.cookies:
+        return False
+    anonymous = 'HTTP_AUTHORIZATION' not in request.META and not request.COOKIES
+    return anonymous or 'public' in cc_delim_re.split(response.get('Cache-Control', ''))
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Comprime las respuestas a partir de RESPONSE_COMPRESSION_MIN_BYTES: brotli si el cliente lo
+    acepta y el paquete está instalado, si no gzip (GZipMiddleware de Django, que también cubre
+    las respuestas streaming). Los ETag fuertes pasan a débiles para que los 304 sigan funcionando.
+
+    Contra BREACH, el gzip de Django añade bytes aleatorios en la cabecera (max_random_bytes);
+    brotli no tiene dónde meterlos, así que solo se usa en respuestas sin secretos
+    (carries_no_secrets) y las autenticadas van con gzip.
+    """
+
+    def process_response(self, request, response):
+        min_bytes = getattr(settings, 'RESPONSE_COMPRESSION_MIN_BYTES', 1024)
+        if not response.streaming and len(response.content) < min_bytes:
+            return response
+        if response.streaming or brotli is None or response.has_header('Content-Encoding'):
+            return super().process_response(request, response)
+        if not carries_no_secrets(request, response):
+            return super().process_response(request, response)
+        if not re_accepts_brotli.search(request.META.get('HTTP_ACCEPT_ENCODING', '')):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        compressed = brotli.compress(response.content, quality=getattr(settings, 'RESPONSE_BROTLI_QUALITY', 5))
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(compressed))
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+        return response
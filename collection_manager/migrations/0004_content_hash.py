@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-17 23:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('collection_manager', '0003_usercard_is_favorite'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='card',
+            name='content_hash',
+            field=models.CharField(blank=True, help_text='sha256 of the normalized upstream payload, used to skip unchanged rows on sync', max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='expansion',
+            name='content_hash',
+            field=models.CharField(blank=True, help_text='sha256 of the normalized upstream payload, used to skip unchanged rows on sync', max_length=64, null=True),
+        ),
+    ]
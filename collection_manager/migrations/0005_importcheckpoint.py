@@ -0,0 +1,31 @@
+# Generated by Django 5.2.3 on 2026-10-17 23:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('collection_manager', '0004_content_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('page_size', models.PositiveIntegerField(default=250, help_text='Page size used by the import; a different size restarts from page 1.')),
+                ('last_page', models.PositiveIntegerField(default=0, help_text='Last page whose cards were committed.')),
+                ('total_pages', models.PositiveIntegerField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('running', 'Running'), ('partial', 'Partial'), ('complete', 'Complete')], default='running', max_length=10)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('expansion', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='import_checkpoint', to='collection_manager.expansion')),
+            ],
+            options={
+                'verbose_name': 'Import Checkpoint',
+                'verbose_name_plural': 'Import Checkpoints',
+            },
+        ),
+    ]
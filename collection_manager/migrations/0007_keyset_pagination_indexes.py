@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-17 23:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('collection_manager', '0006_importrun_importstep'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='card',
+            index=models.Index(fields=['expansion', 'name', 'id'], name='card_expansion_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usercard',
+            index=models.Index(fields=['user', 'id'], name='usercard_user_id_idx'),
+        ),
+    ]
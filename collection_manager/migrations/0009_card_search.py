@@ -0,0 +1,84 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import TextField
+from django.db.models.expressions import RawSQL
+
+
+SEARCH_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS card_search_vector_gin ON collection_manager_card USING gin (search_vector)",
+    "CREATE INDEX IF NOT EXISTS card_name_trgm_gin ON collection_manager_card USING gin (name gin_trgm_ops)",
+]
+
+
+def create_search_indexes(apps, schema_editor):
+    # Índices GIN solo en PostgreSQL; en SQLite (desarrollo) la búsqueda hace un icontains
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for sql in SEARCH_INDEXES:
+        schema_editor.execute(sql)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS card_search_vector_gin")
+    schema_editor.execute("DROP INDEX IF EXISTS card_name_trgm_gin")
+
+
+def _json_names(column):
+    # Nombres ("name") de una lista JSON de la carta (attacks, abilities) separados por espacios
+    return RawSQL(
+        f"""(SELECT string_agg(elem->>'name', ' ') FROM jsonb_array_elements(
+                CASE WHEN jsonb_typeof("{column}") = 'array' THEN "{column}" ELSE '[]'::jsonb END
+            ) AS elem)""",
+        [],
+        output_field=TextField(),
+    )
+
+
+def backfill_search_vectors(apps, schema_editor):
+    # Documento de búsqueda tal como era en esta migración (search.card_search_vector puede cambiar)
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Card = apps.get_model('collection_manager', 'Card')
+    Card.objects.update(search_vector=(
+        SearchVector('name', weight='A', config='simple')
+        + SearchVector(_json_names('attacks'), _json_names('abilities'), weight='B', config='simple')
+        + SearchVector('artist', weight='C', config='simple')
+        + SearchVector('flavor_text', weight='D', config='simple')
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('collection_manager', '0008_catalogversion'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='card',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, help_text='Full-text document (name, attacks/abilities, artist, flavor text); see search.py', null=True),
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='card',
+                    index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='card_search_vector_gin'),
+                ),
+                migrations.AddIndex(
+                    model_name='card',
+                    index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='card_name_trgm_gin', opclasses=['gin_trgm_ops']),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(create_search_indexes, drop_search_indexes),
+            ],
+        ),
+        migrations.RunPython(backfill_search_vectors, migrations.RunPython.noop),
+    ]
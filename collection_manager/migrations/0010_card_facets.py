@@ -0,0 +1,75 @@
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+def create_types_index(apps, schema_editor):
+    # GIN sobre el JSON de tipos solo en PostgreSQL (filtro types @> '["Fire"]')
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS card_types_gin ON collection_manager_card USING gin (types)"
+    )
+
+
+def drop_types_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS card_types_gin")
+
+
+def parse_hp(hp):
+    # Copia de api_service.parse_hp en el momento de esta migración: '120' -> 120, '60+' -> 60
+    digits = ''.join(ch for ch in str(hp or '') if ch.isdigit())
+    return int(digits) if digits else None
+
+
+def backfill_hp_value(apps, schema_editor):
+    Card = apps.get_model('collection_manager', 'Card')
+    batch = []
+    for card in Card.objects.exclude(hp__isnull=True).exclude(hp='').only('id', 'hp').iterator(chunk_size=2000):
+        card.hp_value = parse_hp(card.hp)
+        batch.append(card)
+        if len(batch) >= 2000:
+            Card.objects.bulk_update(batch, ['hp_value'])
+            batch = []
+    if batch:
+        Card.objects.bulk_update(batch, ['hp_value'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('collection_manager', '0009_card_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='card',
+            name='hp_value',
+            field=models.PositiveIntegerField(blank=True, db_index=True, help_text='Numeric HP parsed from hp, for range filters', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='card',
+            index=models.Index(fields=['rarity'], name='card_rarity_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='card',
+            index=models.Index(fields=['artist'], name='card_artist_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='card',
+            index=models.Index(fields=['converted_retreat_cost'], name='card_retreat_cost_idx'),
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='card',
+                    index=django.contrib.postgres.indexes.GinIndex(fields=['types'], name='card_types_gin'),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(create_types_index, drop_types_index),
+            ],
+        ),
+        migrations.RunPython(backfill_hp_value, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,91 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def build_collection_stats(apps, schema_editor):
+    # Colecciones existentes, con los modelos históricos (mismo cálculo que collection_stats)
+    from django.db.models import Count, Q, Sum
+    UserCard = apps.get_model('collection_manager', 'UserCard')
+    UserCollectionStats = apps.get_model('collection_manager', 'UserCollectionStats')
+    UserExpansionStats = apps.get_model('collection_manager', 'UserExpansionStats')
+    counters = ['unique_cards', 'total_copies', 'variants', 'favorites']
+
+    rarities = {}
+    for user_id, expansion_id, rarity, count in UserCard.objects.values_list(
+        'user_id', 'card__expansion_id', 'card__rarity'
+    ).annotate(count=Count('card_id', distinct=True)).order_by().iterator():
+        rarities.setdefault((user_id, expansion_id), {})[rarity or 'Unknown'] = count
+
+    totals = {}
+    rows = []
+    for row in UserCard.objects.values('user_id', 'card__expansion_id').annotate(
+        unique_cards=Count('card_id', distinct=True),
+        total_copies=Sum('quantity'),
+        variants=Count('id'),
+        favorites=Count('id', filter=Q(is_favorite=True)),
+    ).order_by().iterator():
+        user_id, expansion_id = row.pop('user_id'), row.pop('card__expansion_id')
+        rarity_counts = rarities.get((user_id, expansion_id), {})
+        rows.append(UserExpansionStats(user_id=user_id, expansion_id=expansion_id, rarity_counts=rarity_counts, **row))
+
+        user_totals = totals.setdefault(user_id, {**dict.fromkeys(counters, 0), 'expansions': 0, 'rarity_counts': {}})
+        for name in counters:
+            user_totals[name] += row[name]
+        user_totals['expansions'] += 1
+        for rarity, count in rarity_counts.items():
+            user_totals['rarity_counts'][rarity] = user_totals['rarity_counts'].get(rarity, 0) + count
+
+    UserExpansionStats.objects.bulk_create(rows, batch_size=1000)
+    UserCollectionStats.objects.bulk_create(
+        [UserCollectionStats(user_id=user_id, **values) for user_id, values in totals.items()], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('collection_manager', '0010_card_facets'),
+        ('users', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserCollectionStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='collection_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('unique_cards', models.PositiveIntegerField(default=0, help_text='Distinct cards owned (any variant).')),
+                ('total_copies', models.PositiveIntegerField(default=0, help_text='Sum of quantities.')),
+                ('variants', models.PositiveIntegerField(default=0, help_text='UserCard rows.')),
+                ('favorites', models.PositiveIntegerField(default=0, help_text='UserCard rows marked as favorite.')),
+                ('expansions', models.PositiveIntegerField(default=0, help_text='Expansions with at least one owned card.')),
+                ('rarity_counts', models.JSONField(blank=True, default=dict, help_text='Distinct cards owned per rarity.')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'User Collection Stats',
+                'verbose_name_plural': 'User Collection Stats',
+            },
+        ),
+        migrations.CreateModel(
+            name='UserExpansionStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('unique_cards', models.PositiveIntegerField(default=0)),
+                ('total_copies', models.PositiveIntegerField(default=0)),
+                ('variants', models.PositiveIntegerField(default=0)),
+                ('favorites', models.PositiveIntegerField(default=0)),
+                ('rarity_counts', models.JSONField(blank=True, default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('expansion', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='user_stats', to='collection_manager.expansion')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='expansion_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'User Expansion Stats',
+                'verbose_name_plural': 'User Expansion Stats',
+                'unique_together': {('user', 'expansion')},
+            },
+        ),
+        migrations.RunPython(build_collection_stats, migrations.RunPython.noop),
+    ]
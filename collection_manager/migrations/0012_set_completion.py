@@ -0,0 +1,67 @@
+import re
+
+from django.db import migrations, models
+
+
+NUMBER_PATTERN = re.compile(r'^(\D*)(\d*)(.*)$')
+
+
+def collector_number_key(number):
+    # Copia de completion.collector_number_key: la migración no depende del código de la app
+    if not number:
+        return (2, '', 0, '')
+    prefix, digits, rest = NUMBER_PATTERN.match(number.strip()).groups()
+    return (1 if prefix else 0, prefix.upper(), int(digits) if digits else -1, rest)
+
+
+def build_set_positions(apps, schema_editor):
+    # Posiciones de todo el catálogo y bitmaps de las colecciones existentes, con los modelos históricos
+    Card = apps.get_model('collection_manager', 'Card')
+    UserCard = apps.get_model('collection_manager', 'UserCard')
+    UserExpansionStats = apps.get_model('collection_manager', 'UserExpansionStats')
+
+    by_expansion = {}
+    for pk, expansion_id, api_id, number in Card.objects.values_list('id', 'expansion_id', 'api_id', 'number').iterator():
+        by_expansion.setdefault(expansion_id, []).append((collector_number_key(number), api_id, pk))
+    positioned = []
+    for cards in by_expansion.values():
+        cards.sort()
+        positioned.extend(Card(id=pk, set_position=position) for position, (_, _, pk) in enumerate(cards))
+    Card.objects.bulk_update(positioned, ['set_position'], batch_size=1000)
+
+    bitmaps = {}
+    for user_id, expansion_id, position in UserCard.objects.values_list(
+        'user_id', 'card__expansion_id', 'card__set_position'
+    ).distinct().order_by().iterator():
+        bitmaps[(user_id, expansion_id)] = bitmaps.get((user_id, expansion_id), 0) | 1 << position
+    stats = []
+    for row in UserExpansionStats.objects.only('id', 'user_id', 'expansion_id').iterator():
+        bits = bitmaps.get((row.user_id, row.expansion_id), 0)
+        row.owned_bitmap = bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+        stats.append(row)
+    UserExpansionStats.objects.bulk_update(stats, ['owned_bitmap'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('collection_manager', '0011_collection_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='card',
+            name='set_position',
+            field=models.PositiveIntegerField(blank=True, editable=False, help_text='0-based position in the expansion ordered by collector number; bit index of the completion bitmaps (completion.py)', null=True),
+        ),
+        migrations.AddField(
+            model_name='userexpansionstats',
+            name='owned_bitmap',
+            field=models.BinaryField(blank=True, default=b'', help_text='Bit i set = owns the card with set_position i (little-endian int)'),
+        ),
+        migrations.AddIndex(
+            model_name='card',
+            index=models.Index(fields=['expansion', 'set_position'], name='card_expansion_position_idx'),
+        ),
+        migrations.RunPython(build_set_positions, migrations.RunPython.noop),
+    ]
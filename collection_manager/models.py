@@ -1,6 +1,8 @@
 # pokemon_tcg_tracker_project/collection_manager/models.py
 from django.db import models
 from django.conf import settings # Necesario para referenciar el modelo de Usuario
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.contrib.postgres.fields import ArrayField # Para listas de strings/int si es necesario, aunque JSONField suele ser más flexible para esto.
 import json # Necesario para los JSONField defaults
 
@@ -12,6 +14,7 @@ class Expansion(models.Model):
     total_cards = models.IntegerField(blank=True, null=True)
     symbol_url = models.URLField(max_length=500, blank=True, null=True)
     logo_url = models.URLField(max_length=500, blank=True, null=True)
+    content_hash = models.CharField(max_length=64, blank=True, null=True, help_text="sha256 of the normalized upstream payload, used to skip unchanged rows on sync")
     updated_at = models.DateTimeField(auto_now=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -33,6 +36,7 @@ class Card(models.Model):
     image_url_large = models.URLField(max_length=500, blank=True, null=True)
     
     hp = models.CharField(max_length=10, blank=True, null=True)
+    hp_value = models.PositiveIntegerField(blank=True, null=True, db_index=True, help_text="Numeric HP parsed from hp, for range filters")
     types = models.JSONField(blank=True, null=True, help_text="Energy types of the card (e.g., ['Grass', 'Fire'])")
     abilities = models.JSONField(blank=True, null=True, help_text="Abilities of the card")
     attacks = models.JSONField(blank=True, null=True, help_text="Attacks of the card")
@@ -41,8 +45,11 @@ class Card(models.Model):
     retreat_cost = models.JSONField(blank=True, null=True, help_text="Retreat cost of the card")
     converted_retreat_cost = models.IntegerField(blank=True, null=True)
     number = models.CharField(max_length=20, blank=True, null=True, help_text="Card number within the expansion (e.g., '1/100')")
+    set_position = models.PositiveIntegerField(blank=True, null=True, editable=False, help_text="0-based position in the expansion ordered by collector number; bit index of the completion bitmaps (completion.py)")
     artist = models.CharField(max_length=255, blank=True, null=True)
     flavor_text = models.TextField(blank=True, null=True)
+    content_hash = models.CharField(max_length=64, blank=True, null=True, help_text="sha256 of the normalized upstream payload, used to skip unchanged rows on sync")
+    search_vector = SearchVectorField(blank=True, null=True, editable=False, help_text="Full-text document (name, attacks/abilities, artist, flavor text); see search.py")
 
     updated_at = models.DateTimeField(auto_now=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -51,11 +58,121 @@ class Card(models.Model):
         verbose_name = "Card"
         verbose_name_plural = "Cards"
         ordering = ['name']
+        indexes = [
+            # Listado de cartas de una expansión paginado por cursor (name, id)
+            models.Index(fields=['expansion', 'name', 'id'], name='card_expansion_name_id_idx'),
+            # Búsqueda (search.py): full-text y trigramas sobre el nombre (solo PostgreSQL)
+            GinIndex(fields=['search_vector'], name='card_search_vector_gin'),
+            GinIndex(fields=['name'], name='card_name_trgm_gin', opclasses=['gin_trgm_ops']),
+            # Filtros por facetas (facets.py): types @> '["Fire"]' usa el GIN (solo PostgreSQL)
+            GinIndex(fields=['types'], name='card_types_gin'),
+            models.Index(fields=['rarity'], name='card_rarity_idx'),
+            models.Index(fields=['artist'], name='card_artist_idx'),
+            models.Index(fields=['converted_retreat_cost'], name='card_retreat_cost_idx'),
+            models.Index(fields=['expansion', 'set_position'], name='card_expansion_position_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.expansion.name})"
 
 
+class ImportCheckpoint(models.Model):
+    """Progreso persistido de la importación de cartas de una expansión (última página confirmada)"""
+    STATUS_RUNNING = 'running'
+    STATUS_PARTIAL = 'partial'
+    STATUS_COMPLETE = 'complete'
+    STATUS_CHOICES = [
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_PARTIAL, 'Partial'),
+        (STATUS_COMPLETE, 'Complete'),
+    ]
+
+    expansion = models.OneToOneField(Expansion, on_delete=models.CASCADE, related_name='import_checkpoint')
+    page_size = models.PositiveIntegerField(default=250, help_text="Page size used by the import; a different size restarts from page 1.")
+    last_page = models.PositiveIntegerField(default=0, help_text="Last page whose cards were committed.")
+    total_pages = models.PositiveIntegerField(blank=True, null=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_RUNNING)
+    error = models.TextField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Import Checkpoint"
+        verbose_name_plural = "Import Checkpoints"
+
+    def __str__(self):
+        return f"{self.expansion.api_id}: page {self.last_page}/{self.total_pages or '?'} ({self.status})"
+
+
+class CatalogVersion(models.Model):
+    """
+    Fila única (pk=1) con la versión del catálogo: la ruta de importación la incrementa cada vez
+    que crea o modifica expansiones/cartas. Las vistas públicas del catálogo derivan de ella su ETag.
+    """
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Catalog Version"
+        verbose_name_plural = "Catalog Version"
+
+    def __str__(self):
+        return f"v{self.version} ({self.updated_at:%Y-%m-%d %H:%M:%S})"
+
+
+class ImportRun(models.Model):
+    """Una ejecución de un comando de importación del catálogo"""
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCESS = 'success'
+    STATUS_PARTIAL = 'partial'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_SUCCESS, 'Success'),
+        (STATUS_PARTIAL, 'Partial'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    command = models.CharField(max_length=50)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_RUNNING)
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        verbose_name = "Import Run"
+        verbose_name_plural = "Import Runs"
+        ordering = ['-started_at']
+
+    def __str__(self):
+        return f"{self.command} #{self.pk} ({self.status})"
+
+
+class ImportStep(models.Model):
+    """Métricas de un paso de una ImportRun (la lista de expansiones o las cartas de una expansión)"""
+    run = models.ForeignKey(ImportRun, on_delete=models.CASCADE, related_name='steps')
+    expansion = models.ForeignKey(Expansion, on_delete=models.SET_NULL, blank=True, null=True, related_name='import_steps')
+    name = models.CharField(max_length=100, help_text="Expansion API ID, or the kind of step (e.g. 'expansions')")
+    started_at = models.DateTimeField()
+    duration_seconds = models.FloatField(default=0)
+    http_seconds = models.FloatField(default=0, help_text="Time spent waiting on the upstream API (summed over concurrent requests)")
+    http_requests = models.PositiveIntegerField(default=0)
+    bytes_downloaded = models.BigIntegerField(default=0)
+    db_seconds = models.FloatField(default=0, help_text="Time spent writing rows to the database")
+    rows_created = models.PositiveIntegerField(default=0)
+    rows_updated = models.PositiveIntegerField(default=0)
+    rows_unchanged = models.PositiveIntegerField(default=0)
+    rows_per_second = models.FloatField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, null=True)
+
+    class Meta:
+        verbose_name = "Import Step"
+        verbose_name_plural = "Import Steps"
+        ordering = ['-duration_seconds']
+
+    def __str__(self):
+        return f"{self.name} ({self.duration_seconds:.2f}s)"
+
+
 class UserCard(models.Model):
     CONDITION_CHOICES = [
         ('NM', 'Near Mint'),
@@ -107,7 +224,55 @@ class UserCard(models.Model):
         unique_together = ('user', 'card', 'language', 'is_holographic', 'is_first_edition', 'condition')
         verbose_name = "User's Card"
         verbose_name_plural = "User's Cards"
+        indexes = [
+            # Colección del usuario paginada por cursor (id)
+            models.Index(fields=['user', 'id'], name='usercard_user_id_idx'),
+        ]
 
         def __str__(self):
             return f"{self.user.username}'s {self.card.name} ({self.language}, Qty: {self.quantity})" # pylint: disable=no-member
 
+
+
+class UserCollectionStats(models.Model):
+    """
+    Totales de la colección de un usuario (una fila por usuario, clave = user_id).
+    Se mantienen al día en la misma transacción que cada cambio de UserCard (collection_stats.py);
+    el comando rebuild_collection_stats los recalcula desde cero.
+    """
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name='collection_stats')
+    unique_cards = models.PositiveIntegerField(default=0, help_text="Distinct cards owned (any variant).")
+    total_copies = models.PositiveIntegerField(default=0, help_text="Sum of quantities.")
+    variants = models.PositiveIntegerField(default=0, help_text="UserCard rows.")
+    favorites = models.PositiveIntegerField(default=0, help_text="UserCard rows marked as favorite.")
+    expansions = models.PositiveIntegerField(default=0, help_text="Expansions with at least one owned card.")
+    rarity_counts = models.JSONField(default=dict, blank=True, help_text="Distinct cards owned per rarity.")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "User Collection Stats"
+        verbose_name_plural = "User Collection Stats"
+
+    def __str__(self):
+        return f"{self.user_id}: {self.unique_cards} cards, {self.total_copies} copies"
+
+
+class UserExpansionStats(models.Model):
+    """Totales de la colección de un usuario en una expansión (solo expansiones con cartas)"""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='expansion_stats')
+    expansion = models.ForeignKey(Expansion, on_delete=models.CASCADE, related_name='user_stats')
+    unique_cards = models.PositiveIntegerField(default=0)
+    total_copies = models.PositiveIntegerField(default=0)
+    variants = models.PositiveIntegerField(default=0)
+    favorites = models.PositiveIntegerField(default=0)
+    rarity_counts = models.JSONField(default=dict, blank=True)
+    owned_bitmap = models.BinaryField(default=b'', blank=True, help_text="Bit i set = owns the card with set_position i (little-endian int)")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('user', 'expansion')
+        verbose_name = "User Expansion Stats"
+        verbose_name_plural = "User Expansion Stats"
+
+    def __str__(self):
+        return f"{self.user_id} / {self.expansion_id}: {self.unique_cards} cards"
@@ -0,0 +1,148 @@
+# pokemon_tcg_tracker_project/collection_manager/pagination.py
+import base64
+import binascii
+import json
+from functools import reduce
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación por cursor (keyset) opcional, ordenada por `ordering` (por defecto (name, id)).
+
+    Solo se activa si la petición trae ?cursor= (vacío = primera página) o ?page_size=;
+    sin ellos la vista devuelve la lista completa como siempre.
+    Cada página filtra por "clave > última clave vista" en lugar de usar OFFSET, así que el
+    coste de una página no depende de cuántas filas haya antes. Respuesta:
+    {"next": <url o null>, "results": [...]}.
+    """
+    ordering = ('name', 'id')
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    page_size = 100
+    max_page_size = 500
+
+    def is_requested(self, request):
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def encode_cursor(self, values):
+        return base64.urlsafe_b64encode(json.dumps(values).encode('utf-8')).decode('ascii')
+
+    def decode_cursor(self, cursor):
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        except (binascii.Error, UnicodeError, ValueError):
+            raise NotFound('Invalid cursor')
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound('Invalid cursor')
+        return values
+
+    def coerce_cursor(self, model, values):
+        """Convierte cada valor del cursor al tipo de su campo de ordenación (404 si no encaja)"""
+        coerced = []
+        for path, value in zip(self.ordering, values):
+            field, opts = None, model._meta
+            for name in path.split('__'):
+                field = opts.get_field(name)
+                if field.is_relation:
+                    opts = field.related_model._meta
+            if value is None:
+                raise NotFound('Invalid cursor')
+            try:
+                coerced.append(field.to_python(value))
+            except (ValidationError, TypeError, ValueError):
+                raise NotFound('Invalid cursor')
+        return coerced
+
+    def after(self, values):
+        """
+        Filtro "(f1, f2, ...) > (v1, v2, ...)". Se escribe como f1 >= v1 AND (f1 > v1 OR ...)
+        para que la base de datos pueda recorrer el índice desde v1.
+        """
+        condition = None
+        for field, value in reversed(list(zip(self.ordering, values))):
+            greater = Q(**{f'{field}__gt': value})
+            condition = greater if condition is None else greater | (Q(**{field: value}) & condition)
+        first_field, first_value = self.ordering[0], values[0]
+        if len(self.ordering) > 1:
+            condition = Q(**{f'{first_field}__gte': first_value}) & condition
+        return condition
+
+    def key_of(self, obj):
+        return [reduce(getattr, field.split('__'), obj) for field in self.ordering]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            return None
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.ordering)
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            values = self.coerce_cursor(queryset.model, self.decode_cursor(cursor))
+            queryset = queryset.filter(self.after(values))
+
+        rows = list(queryset[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        page = rows[:page_size]
+        self.next_cursor = self.encode_cursor(self.key_of(page[-1])) if self.has_next else None
+        return page
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.get_next_link(), 'results': data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class CardFilterPagination(KeysetPagination):
+    """Filtro por facetas: siempre paginado por cursor (el resultado sin filtros es todo el catálogo)"""
+
+    def is_requested(self, request):
+        return True
+
+
+class UserCardKeysetPagination(KeysetPagination):
+    """Colección del usuario paginada por id (índice (user, id))"""
+    ordering = ('id',)
+
+
+class SearchPagination(PageNumberPagination):
+    """Resultados de búsqueda: ordenados por relevancia, paginados por número de página (?page=, ?page_size=)"""
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class GroupedCardsPagination(PageNumberPagination):
+    """Grupos de la colección (una carta por grupo), por número de página (?page=, ?page_size=)"""
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
@@ -0,0 +1,237 @@
+# pokemon_tcg_tracker_project/collection_manager/pokemontcg_client.py
+import hashlib
+import json
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+
+from .telemetry import record_error, record_http
+
+logger = logging.getLogger(__name__)
+
+POKEMON_TCG_BASE_URL = "https://api.pokemontcg.io/v2"
+
+# Respuestas que se reintentan con backoff exponencial (rate limit y errores del servidor)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Limitador token bucket compartido entre hilos: `rate` peticiones por segundo de media,
+    con ráfagas de hasta `capacity` peticiones.
+    """
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity or max(1, rate)
+        self.tokens = self.capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Bloquea hasta que haya un token disponible y lo consume"""
+        while True:
+            with self.lock:
+                now = self.clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            self.sleep(wait)
+
+
+class PokemonTCGClient:
+    """
+    Cliente HTTP compartido para la API de Pokémon TCG.
+
+    - Reutiliza conexiones (keep-alive) con una requests.Session y un pool de conexiones.
+    - Guarda en disco las respuestas JSON, con clave URL + params.
+    - Dentro del TTL responde desde disco sin tocar la red; pasado el TTL revalida con
+      If-None-Match / If-Modified-Since y, si la API contesta 304, reutiliza el cuerpo guardado.
+    - Limita el ritmo de peticiones con un token bucket (rate_limit peticiones/segundo) y reintenta
+      429/5xx y errores de conexión con backoff exponencial con jitter (respetando Retry-After).
+    """
+
+    def __init__(self, base_url=POKEMON_TCG_BASE_URL, cache_dir=None, ttl=0, api_key=None,
+                 pool_size=10, session=None, rate_limit=None, rate_burst=None,
+                 max_retries=0, backoff_base=0.5, backoff_max=30, sleep=time.sleep):
+        self.base_url = base_url.rstrip('/')
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.ttl = ttl
+        self.rate_limiter = TokenBucket(rate_limit, rate_burst, sleep=sleep) if rate_limit else None
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.sleep = sleep
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+        if api_key:
+            session.headers['X-Api-Key'] = api_key
+        self.session = session
+
+    def build_url(self, path):
+        if path.startswith(('http://', 'https://')):
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def cache_key(self, url, params):
+        """Clave estable para URL + params (el orden de los params no importa)"""
+        normalized = json.dumps([url, sorted((params or {}).items())], default=str)
+        return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+    def _cache_path(self, key):
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _read_cache(self, key):
+        try:
+            with open(self._cache_path(key), encoding='utf-8') as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return None
+
+    def _write_cache(self, key, entry):
+        path = self._cache_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Escritura atómica: otro hilo nunca ve un fichero a medio escribir
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+                json.dump(entry, fh)
+            os.replace(tmp_name, path)
+        except OSError as e:
+            logger.warning(f"Could not write API cache entry {path}: {e}")
+
+    def backoff_delay(self, attempt, response=None):
+        """Segundos de espera antes del reintento `attempt` (0 = primer reintento)"""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after and retry_after.isdigit():
+                return min(self.backoff_max, int(retry_after))
+        # Full jitter: uniforme entre 0 y el backoff exponencial acotado
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _send(self, url, params, headers, timeout):
+        """GET con rate limit y reintentos; devuelve la última respuesta (o lanza el último error de red)"""
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, params=params, headers=headers, timeout=timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                record_error()
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff_delay(attempt)
+                logger.warning(f"Request to {url} failed ({e}), retrying in {delay:.1f}s")
+            else:
+                record_http(time.perf_counter() - start, len(response.content or b''))
+                if response.status_code >= 400:
+                    record_error()
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    return response
+                delay = self.backoff_delay(attempt, response)
+                logger.warning(f"Request to {url} returned {response.status_code}, retrying in {delay:.1f}s")
+            self.sleep(delay)
+            attempt += 1
+
+    def get_json(self, path, params=None, timeout=10):
+        """
+        GET a la API y devuelve el JSON decodificado.
+        Lanza requests.exceptions.RequestException igual que requests.get + raise_for_status.
+        """
+        url = self.build_url(path)
+
+        if self.cache_dir is None:
+            response = self._send(url, params, None, timeout)
+            response.raise_for_status()
+            return response.json()
+
+        key = self.cache_key(url, params)
+        entry = self._read_cache(key)
+        now = time.time()
+
+        if entry is not None and now - entry['fetched_at'] < self.ttl:
+            return json.loads(entry['body'])
+
+        headers = {}
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = self._send(url, params, headers, timeout)
+
+        if response.status_code == 304 and entry is not None:
+            logger.debug(f"Not modified, using cached response for {url} {params}")
+            entry['fetched_at'] = now
+            self._write_cache(key, entry)
+            return json.loads(entry['body'])
+
+        response.raise_for_status()
+        data = response.json()
+        body = response.text
+        self._write_cache(key, {
+            'url': url,
+            'params': params,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'fetched_at': now,
+            'body': body,
+        })
+        return data
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Devuelve el cliente compartido del proceso, configurado desde settings"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = PokemonTCGClient(
+                base_url=getattr(settings, 'POKEMON_TCG_BASE_URL', POKEMON_TCG_BASE_URL),
+                cache_dir=getattr(settings, 'POKEMON_TCG_CACHE_DIR', None),
+                ttl=getattr(settings, 'POKEMON_TCG_CACHE_TTL', 0),
+                api_key=getattr(settings, 'POKEMON_TCG_API_KEY', None),
+                pool_size=getattr(settings, 'POKEMON_TCG_POOL_SIZE', 10),
+                rate_limit=getattr(settings, 'POKEMON_TCG_RATE_LIMIT', None),
+                rate_burst=getattr(settings, 'POKEMON_TCG_RATE_BURST', None),
+                max_retries=getattr(settings, 'POKEMON_TCG_MAX_RETRIES', 0),
+                backoff_base=getattr(settings, 'POKEMON_TCG_BACKOFF_BASE', 0.5),
+                backoff_max=getattr(settings, 'POKEMON_TCG_BACKOFF_MAX', 30),
+            )
+        return _client
+
+
+@contextmanager
+def override_client(client):
+    """Sustituye temporalmente el cliente compartido (benchmarks contra el stub local)"""
+    global _client
+    with _client_lock:
+        previous, _client = _client, client
+    try:
+        yield client
+    finally:
+        with _client_lock:
+            _client = previous
@@ -0,0 +1,47 @@
+# pokemon_tcg_tracker_project/collection_manager/renderers.py
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import orjson
+except ImportError: # orjson es opcional: sin él se usa el JSONRenderer de DRF
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer con orjson (varias veces más rápido que json de la stdlib en listas grandes).
+    Salida compacta en UTF-8, igual que el JSONRenderer de DRF con la configuración por defecto.
+    Con indentación (API navegable, `; indent=`) o sin orjson instalado delega en JSONRenderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # default: tipos que orjson no conoce (Decimal, lazy strings, QuerySet...) se convierten como en DRF
+        ret = orjson.dumps(data, default=self.encoder_class().default)
+        # Igual que DRF: \u2028 y \u2029 escapados para que la salida sea JavaScript válido
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+
+class PassthroughRenderer(BaseRenderer):
+    """
+    Para vistas que devuelven su propia respuesta (p. ej. StreamingHttpResponse): solo sirve para
+    que la negociación de contenido acepte su media_type en lugar de responder 406.
+    """
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return data
+
+
+class CSVRenderer(PassthroughRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+
+
+class NDJSONRenderer(PassthroughRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
@@ -0,0 +1,63 @@
+# pokemon_tcg_tracker_project/collection_manager/search.py
+"""
+Búsqueda de cartas.
+
+En PostgreSQL cada carta guarda un tsvector (Card.search_vector, índice GIN) con el nombre (peso A),
+los nombres de ataques y habilidades (B), el artista (C) y el flavor text (D). La búsqueda combina
+full-text (websearch_to_tsquery) con similitud de trigramas sobre el nombre (pg_trgm, índice GIN
+gin_trgm_ops), así "charzard" sigue encontrando Charizard. Los resultados se ordenan por relevancia.
+
+El tsvector lo mantiene la ruta de importación (refresh_search_vectors tras escribir cartas).
+En otros motores (SQLite en desarrollo) se hace un icontains sin ranking.
+"""
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity
+from django.db import connection
+from django.db.models import F, Q, TextField
+from django.db.models.expressions import RawSQL
+
+from .models import Card
+
+# 'simple': sin stemming ni stopwords; los nombres de Pokémon no son palabras en inglés
+SEARCH_CONFIG = 'simple'
+
+
+def _json_names(column):
+    """Nombres ("name") de una lista JSON de la carta (attacks, abilities) separados por espacios"""
+    return RawSQL(
+        f"""(SELECT string_agg(elem->>'name', ' ') FROM jsonb_array_elements(
+                CASE WHEN jsonb_typeof("{column}") = 'array' THEN "{column}" ELSE '[]'::jsonb END
+            ) AS elem)""",
+        [],
+        output_field=TextField(),
+    )
+
+
+def card_search_vector():
+    return (
+        SearchVector('name', weight='A', config=SEARCH_CONFIG)
+        + SearchVector(_json_names('attacks'), _json_names('abilities'), weight='B', config=SEARCH_CONFIG)
+        + SearchVector('artist', weight='C', config=SEARCH_CONFIG)
+        + SearchVector('flavor_text', weight='D', config=SEARCH_CONFIG)
+    )
+
+
+def refresh_search_vectors(queryset):
+    """Recalcula search_vector de las cartas del queryset con un único UPDATE (solo PostgreSQL)"""
+    if connection.vendor != 'postgresql':
+        return 0
+    return queryset.update(search_vector=card_search_vector())
+
+
+def search_cards(text):
+    """Queryset de cartas que coinciden con `text`, de más a menos relevante"""
+    if connection.vendor != 'postgresql':
+        return Card.objects.filter(
+            Q(name__icontains=text) | Q(artist__icontains=text) | Q(flavor_text__icontains=text)
+        ).order_by('name', 'id')
+
+    query = SearchQuery(text, search_type='websearch', config=SEARCH_CONFIG)
+    return Card.objects.filter(
+        Q(search_vector=query) | Q(name__trigram_word_similar=text)
+    ).annotate(
+        rank=SearchRank(F('search_vector'), query) + TrigramWordSimilarity(text, 'name')
+    ).order_by('-rank', 'name', 'id').defer('search_vector')
@@ -1,12 +1,54 @@
 # pokemon_tcg_tracker_project/collection_manager/serializers.py
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
-from .models import Expansion, Card, UserCard
+from .models import Expansion, Card, UserCard, UserCollectionStats, UserExpansionStats
 
-class ExpansionSerializer(serializers.ModelSerializer):
+
+def requested_fields(request):
+    """Campos pedidos con ?fields=id,name,... (None si no se pide un subconjunto)"""
+    if request is None:
+        return None
+    fields = request.query_params.get('fields')
+    if not fields:
+        return None
+    return [name.strip() for name in fields.split(',') if name.strip()]
+
+
+class SparseFieldsetMixin:
+    """
+    Sparse fieldsets: con ?fields=id,name,image_url_small solo se serializan esos campos.
+    Los nombres desconocidos se ignoran; sin ?fields= se devuelven todos como siempre.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = requested_fields(self.context.get('request'))
+        if fields:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    @classmethod
+    def only_columns(cls, fields):
+        """Rutas ORM para queryset.only() que cubren los campos pedidos (id siempre incluido)"""
+        declared = cls._declared_fields
+        available = cls.Meta.fields
+        if available == serializers.ALL_FIELDS:
+            available = [field.name for field in cls.Meta.model._meta.concrete_fields]
+        columns = {'id'}
+        for name in set(fields) & set(available):
+            source = getattr(declared.get(name), 'source', None) or name
+            columns.add(source.replace('.', '__'))
+        return sorted(columns)
+
+
+class ExpansionSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Expansion
-        fields = '__all__' # Incluye todos los campos del modelo Expansion
+        # Campos públicos del modelo; content_hash es interno de la sincronización y no se expone
+        fields = [
+            'id', 'name', 'api_id', 'series', 'release_date', 'total_cards',
+            'symbol_url', 'logo_url', 'updated_at', 'created_at',
+        ]
 
 class ExpansionWithCountSerializer(serializers.ModelSerializer):
     """Serializer para expansiones con conteo de cartas del usuario"""
@@ -16,7 +58,7 @@ class ExpansionWithCountSerializer(serializers.ModelSerializer):
         model = Expansion
         fields = ['id', 'api_id', 'name', 'series', 'symbol_url', 'user_cards_count']
 
-class CardSerializer(serializers.ModelSerializer):
+class CardSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     # Para incluir el nombre de la expansión directamente en la respuesta de la carta
     expansion_name = serializers.CharField(source='expansion.name', read_only=True)
     class Meta:
@@ -32,6 +74,20 @@ class CardSerializer(serializers.ModelSerializer):
             'updated_at', 'created_at'
         ]
 
+class OwnedCardSerializer(CardSerializer):
+    """CardSerializer con lo que el usuario tiene de cada carta (anotaciones de user_collection.annotate_owned)"""
+    owned = serializers.SerializerMethodField()
+
+    class Meta(CardSerializer.Meta):
+        fields = CardSerializer.Meta.fields + ['owned']
+
+    def get_owned(self, obj):
+        return {
+            'quantity': obj.owned_quantity,
+            'variants': obj.owned_variants,
+            'is_favorite': obj.owned_favorites > 0,
+        }
+
 class UserCardSerializer(serializers.ModelSerializer):
     card_name = serializers.CharField(source='card.name', read_only=True)
     expansion_name = serializers.CharField(source='card.expansion.name', read_only=True)
@@ -47,6 +103,49 @@ class UserCardSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'user']  # No permitir cambiar el id, la carta ni el usuario
 
+class UserCardOperationSerializer(serializers.ModelSerializer):
+    """
+    Una operación de /api/user-cards/bulk/: {"op": "add", "card": <id>, ...campos de la variante},
+    {"op": "update", "id": <id>, ...campos a cambiar} o {"op": "delete", "id": <id>}.
+    """
+    op = serializers.ChoiceField(choices=['add', 'update', 'delete'])
+    id = serializers.IntegerField(required=False)
+    card = serializers.IntegerField(required=False) # Se valida en bloque en user_collection.py
+
+    class Meta:
+        model = UserCard
+        fields = [
+            'op', 'id', 'card', 'quantity', 'language', 'is_holographic', 'condition',
+            'is_first_edition', 'is_signed', 'grade', 'notes', 'is_favorite'
+        ]
+        extra_kwargs = {'quantity': {'required': False, 'min_value': 1}}
+
+    def validate(self, attrs):
+        if attrs['op'] == 'add' and 'card' not in attrs:
+            raise serializers.ValidationError({'card': 'Obligatorio para añadir.'})
+        if attrs['op'] != 'add' and 'id' not in attrs:
+            raise serializers.ValidationError({'id': 'Obligatorio para modificar o borrar.'})
+        return attrs
+
+class UserCardBulkSerializer(serializers.Serializer): # pylint: disable=abstract-method
+    operations = UserCardOperationSerializer(many=True, allow_empty=False, max_length=1000)
+
+class UserCollectionStatsSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = UserCollectionStats
+        fields = ['unique_cards', 'total_copies', 'variants', 'favorites', 'expansions', 'rarity_counts', 'updated_at']
+
+class UserExpansionStatsSerializer(serializers.ModelSerializer):
+    expansion_api_id = serializers.CharField(source='expansion.api_id', read_only=True)
+    expansion_name = serializers.CharField(source='expansion.name', read_only=True)
+
+    class Meta:
+        model = UserExpansionStats
+        fields = [
+            'expansion', 'expansion_api_id', 'expansion_name',
+            'unique_cards', 'total_copies', 'variants', 'favorites', 'rarity_counts', 'updated_at'
+        ]
+
 # Serializador para el registro de usuarios
 class UserSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True) # El campo password solo se usa para escribir, no se muestra en la respuesta
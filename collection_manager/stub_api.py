@@ -0,0 +1,155 @@
+# pokemon_tcg_tracker_project/collection_manager/stub_api.py
+"""
+Stub local de api.pokemontcg.io para benchmarks de ingesta sin red.
+
+Reproduce las respuestas grabadas de /v2/sets y /v2/cards (paginadas con page/pageSize y
+filtradas por q=set.id:<id>) a partir de un directorio con la misma estructura que los
+volcados de pokemon-tcg-data (ver catalog_loader):
+
+    <recordings_dir>/sets/<lang>.json         -> lista de expansiones
+    <recordings_dir>/cards/<lang>/<set>.json  -> lista de cartas de cada expansión
+
+Se puede añadir una latencia fija por respuesta y devolver un 429 (Retry-After: 0) cada N
+peticiones para ejercitar los reintentos del cliente.
+
+Solo usa la librería estándar: el servidor corre en un proceso aparte (start_stub_server)
+para que su CPU y su memoria no se mezclen con las medidas del proceso que importa.
+"""
+import json
+import multiprocessing
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+
+def load_recordings(recordings_dir, language='en'):
+    """Devuelve (lista de sets, {set_id: lista de cartas}) del directorio de grabaciones"""
+    recordings_dir = Path(recordings_dir)
+    with open(recordings_dir / 'sets' / f'{language}.json', encoding='utf-8') as fh:
+        sets = json.load(fh)
+    cards = {}
+    for path in sorted((recordings_dir / 'cards' / language).glob('*.json')):
+        with open(path, encoding='utf-8') as fh:
+            cards[path.stem] = json.load(fh)
+    return sets, cards
+
+
+def write_recordings(recordings_dir, sets, cards_by_set, language='en'):
+    """Escribe sets y cartas con la estructura que espera load_recordings"""
+    recordings_dir = Path(recordings_dir)
+    cards_dir = recordings_dir / 'cards' / language
+    cards_dir.mkdir(parents=True, exist_ok=True)
+    (recordings_dir / 'sets').mkdir(parents=True, exist_ok=True)
+    with open(recordings_dir / 'sets' / f'{language}.json', 'w', encoding='utf-8') as fh:
+        json.dump(sets, fh)
+    for set_id, cards in cards_by_set.items():
+        with open(cards_dir / f'{set_id}.json', 'w', encoding='utf-8') as fh:
+            json.dump(cards, fh)
+
+
+def paginate(items, page, page_size):
+    """Cuerpo de una respuesta paginada con la misma forma que la API v2"""
+    start = (page - 1) * page_size
+    data = items[start:start + page_size]
+    return {'data': data, 'page': page, 'pageSize': page_size, 'count': len(data), 'totalCount': len(items)}
+
+
+class RecordedAPIHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1' # keep-alive, como la API real
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.request_count += 1
+            throttled = server.throttle_every and server.request_count % server.throttle_every == 0
+        if server.latency:
+            time.sleep(server.latency)
+
+        if throttled:
+            self.send_json(429, {'error': {'message': 'Rate limit exceeded', 'code': 429}}, {'Retry-After': '0'})
+            return
+
+        url = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        try:
+            page = int(query.get('page', 1))
+            page_size = int(query.get('pageSize', 250))
+        except ValueError:
+            self.send_json(400, {'error': {'message': 'Bad Request', 'code': 400}})
+            return
+
+        path = url.path.rstrip('/')
+        if path.endswith('/sets'):
+            self.send_json(200, paginate(server.sets, page, page_size))
+        elif path.endswith('/cards'):
+            set_id = query.get('q', '').partition('set.id:')[2].strip()
+            self.send_json(200, paginate(server.cards.get(set_id, []), page, page_size))
+        else:
+            self.send_json(404, {'error': {'message': 'Not Found', 'code': 404}})
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_stub_server(recordings_dir, latency=0, throttle_every=0, host='127.0.0.1', port=0, language='en'):
+    """ThreadingHTTPServer con las grabaciones cargadas (sin arrancar)"""
+    server = ThreadingHTTPServer((host, port), RecordedAPIHandler)
+    server.daemon_threads = True
+    server.sets, server.cards = load_recordings(recordings_dir, language)
+    server.latency = latency
+    server.throttle_every = throttle_every
+    server.request_count = 0
+    server.lock = threading.Lock()
+    return server
+
+
+def _serve(recordings_dir, latency, throttle_every, language, conn):
+    server = make_stub_server(recordings_dir, latency, throttle_every, language=language)
+    conn.send(server.server_address[1])
+    conn.close()
+    server.serve_forever()
+
+
+class StubServerProcess:
+    """Stub arrancado en un proceso hijo; `base_url` apunta a su /v2"""
+
+    def __init__(self, process, port):
+        self.process = process
+        self.base_url = f'http://127.0.0.1:{port}/v2'
+
+    def stop(self):
+        self.process.terminate()
+        self.process.join(timeout=5)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def start_stub_server(recordings_dir, latency=0, throttle_every=0, language='en'):
+    """Arranca el stub en otro proceso y espera a que escuche. Úsalo como context manager."""
+    context = multiprocessing.get_context('spawn')
+    parent_conn, child_conn = context.Pipe(duplex=False)
+    process = context.Process(
+        target=_serve, args=(str(recordings_dir), latency, throttle_every, language, child_conn), daemon=True
+    )
+    process.start()
+    child_conn.close()
+    if not parent_conn.poll(30):
+        process.terminate()
+        raise RuntimeError('Stub API server did not start')
+    return StubServerProcess(process, parent_conn.recv())
@@ -0,0 +1,126 @@
+# pokemon_tcg_tracker_project/collection_manager/telemetry.py
+"""
+Telemetría de las importaciones del catálogo: cada paso (ImportStep) acumula tiempo HTTP,
+bytes descargados, tiempo de escritura en BD, filas y errores.
+
+El paso activo se guarda en un ContextVar; el cliente HTTP y el pipeline de importación
+registran sus métricas con record_http / record_error / db_timer sin tener que pasar
+el acumulador de función en función. Los hilos de prefetch de páginas heredan el contexto
+(ver iter_card_pages), por eso el acumulador es thread-safe.
+"""
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+from django.utils import timezone
+
+from .models import ImportRun, ImportStep
+
+_current_metrics = contextvars.ContextVar('import_step_metrics', default=None)
+
+
+class StepMetrics:
+    """Acumulador thread-safe de las métricas de un paso de importación"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.http_seconds = 0.0
+        self.http_requests = 0
+        self.bytes_downloaded = 0
+        self.db_seconds = 0.0
+        self.error_count = 0
+        self.counts = None # SyncCounts / ImportResult del paso
+        self.error = None
+
+    def add_http(self, seconds, nbytes):
+        with self.lock:
+            self.http_seconds += seconds
+            self.http_requests += 1
+            self.bytes_downloaded += nbytes
+
+    def add_db(self, seconds):
+        with self.lock:
+            self.db_seconds += seconds
+
+    def add_error(self):
+        with self.lock:
+            self.error_count += 1
+
+
+def record_http(seconds, nbytes):
+    metrics = _current_metrics.get()
+    if metrics is not None:
+        metrics.add_http(seconds, nbytes)
+
+
+def record_error():
+    metrics = _current_metrics.get()
+    if metrics is not None:
+        metrics.add_error()
+
+
+@contextmanager
+def db_timer():
+    """Mide el bloque como tiempo de escritura en BD del paso activo"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics = _current_metrics.get()
+        if metrics is not None:
+            metrics.add_db(time.perf_counter() - start)
+
+
+@contextmanager
+def track_step(run, name, expansion=None):
+    """
+    Activa un StepMetrics durante el bloque y, al salir, guarda un ImportStep en `run`.
+    Sin run (llamadas fuera de un comando) no se registra nada.
+    """
+    if run is None:
+        yield None
+        return
+
+    metrics = StepMetrics()
+    token = _current_metrics.set(metrics)
+    started_at = timezone.now()
+    start = time.perf_counter()
+    try:
+        yield metrics
+    except Exception as e:
+        metrics.error = str(e)
+        metrics.add_error()
+        raise
+    finally:
+        _current_metrics.reset(token)
+        duration = time.perf_counter() - start
+        created, updated, unchanged = (metrics.counts or (0, 0, 0))[:3]
+        rows = created + updated + unchanged
+        ImportStep.objects.create(
+            run=run,
+            expansion=expansion,
+            name=name,
+            started_at=started_at,
+            duration_seconds=duration,
+            http_seconds=metrics.http_seconds,
+            http_requests=metrics.http_requests,
+            bytes_downloaded=metrics.bytes_downloaded,
+            db_seconds=metrics.db_seconds,
+            rows_created=created,
+            rows_updated=updated,
+            rows_unchanged=unchanged,
+            rows_per_second=rows / duration if duration else 0,
+            error_count=metrics.error_count,
+            error=metrics.error,
+        )
+
+
+def start_run(command):
+    return ImportRun.objects.create(command=command)
+
+
+def finish_run(run, status):
+    run.status = status
+    run.finished_at = timezone.now()
+    run.save(update_fields=['status', 'finished_at'])
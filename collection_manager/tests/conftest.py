@@ -0,0 +1,13 @@
+import pytest
+from collection_manager.catalog_cache import get_blob_cache
+from collection_manager.typeahead import reset_typeahead
+
+
+@pytest.fixture(autouse=True)
+def clear_catalog_blobs():
+    """Cada test empieza con la versión 0 del catálogo: los blobs e índices de otro test no deben servirse"""
+    get_blob_cache().clear()
+    reset_typeahead()
+    yield
+    get_blob_cache().clear()
+    reset_typeahead()
@@ -0,0 +1,68 @@
+import threading
+from io import StringIO
+
+import pytest
+import requests
+from django.core.management import call_command
+from collection_manager.models import Card, Expansion
+from collection_manager.stub_api import make_stub_server, write_recordings
+
+
+@pytest.fixture
+def recordings(tmp_path):
+    sets = [{'id': 'base1', 'name': 'Base Set'}, {'id': 'jungle', 'name': 'Jungle'}]
+    cards = {
+        'base1': [{'id': f'base1-{i}', 'name': f'Card {i}'} for i in range(1, 8)],
+        'jungle': [{'id': 'jungle-1', 'name': 'Pikachu'}],
+    }
+    write_recordings(tmp_path, sets, cards)
+    return tmp_path
+
+
+def serve(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return f'http://127.0.0.1:{server.server_address[1]}/v2'
+
+
+def test_stub_paginates_recorded_cards_by_set(recordings):
+    server = make_stub_server(recordings)
+    base_url = serve(server)
+    try:
+        page = requests.get(f'{base_url}/cards', params={'q': 'set.id:base1', 'page': 2, 'pageSize': 3}).json()
+        sets = requests.get(f'{base_url}/sets').json()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert [card['id'] for card in page['data']] == ['base1-4', 'base1-5', 'base1-6']
+    assert (page['page'], page['count'], page['totalCount']) == (2, 3, 7)
+    assert [expansion['id'] for expansion in sets['data']] == ['base1', 'jungle']
+
+
+def test_stub_throttles_every_nth_request(recordings):
+    server = make_stub_server(recordings, throttle_every=2)
+    base_url = serve(server)
+    try:
+        responses = [requests.get(f'{base_url}/sets') for _ in range(4)]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert [response.status_code for response in responses] == [200, 429, 200, 429]
+    assert responses[1].headers['Retry-After'] == '0'
+
+
+@pytest.mark.django_db
+def test_benchmark_ingest_runs_every_scenario_and_rolls_back(recordings):
+    out = StringIO()
+    call_command('benchmark_ingest', '--recordings', str(recordings), '--throttle-every', '5', stdout=out)
+
+    output = out.getvalue()
+    for scenario in ('import_expansions', 'import_cards_for_expansion', 'import_cards_resync',
+                     'load_expansions', 'load_cards_by_expansion'):
+        assert scenario in output
+    assert '(8 rows)' in output
+    assert 'rows/s' in output and 'peak RSS' in output
+    assert not Expansion.objects.exists()
+    assert not Card.objects.exists()
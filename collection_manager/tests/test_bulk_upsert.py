@@ -0,0 +1,117 @@
+import pytest
+from collection_manager.api_service import save_cards_to_db, save_expansions_to_db
+from collection_manager.models import Card, Expansion
+
+
+def card_payload(api_id, name, **extra):
+    payload = {'id': api_id, 'name': name, 'number': api_id.split('-')[-1], 'images': {'small': 'https://example.com/s.png'}}
+    payload.update(extra)
+    return payload
+
+
+@pytest.mark.django_db
+class TestBulkUpsert:
+    """Tests para el modo bulk (INSERT ... ON CONFLICT) de save_*_to_db"""
+
+    def setup_method(self, method):
+        self.expansion = Expansion.objects.create(api_id='base1', name='Base Set')
+
+    def test_bulk_cards_returns_created_and_updated_counts(self):
+        Card.objects.create(api_id='base1-1', name='Old Name', expansion=self.expansion)
+
+        created, updated, unchanged = save_cards_to_db([
+            card_payload('base1-1', 'Alakazam', rarity='Rare Holo'),
+            card_payload('base1-2', 'Blastoise'),
+            card_payload('base1-3', 'Chansey'),
+        ], self.expansion, bulk=True)
+
+        assert (created, updated, unchanged) == (2, 1, 0)
+        assert Card.objects.count() == 3
+        alakazam = Card.objects.get(api_id='base1-1')
+        assert alakazam.name == 'Alakazam'
+        assert alakazam.rarity == 'Rare Holo'
+
+    def test_bulk_and_per_row_paths_write_the_same_rows(self):
+        payload = [card_payload(f'base1-{i}', f'Card {i}', types=['Fire'], hp='60') for i in range(1, 6)]
+
+        assert save_cards_to_db(payload, self.expansion) == (5, 0, 0)
+        per_row = list(Card.objects.order_by('api_id').values('api_id', 'name', 'types', 'hp', 'number'))
+        Card.objects.all().delete()
+
+        assert save_cards_to_db(payload, self.expansion, bulk=True) == (5, 0, 0)
+        bulk = list(Card.objects.order_by('api_id').values('api_id', 'name', 'types', 'hp', 'number'))
+
+        assert per_row == bulk
+
+    def test_bulk_skips_invalid_and_duplicate_cards(self):
+        created, updated, unchanged = save_cards_to_db([
+            card_payload('base1-1', 'Alakazam'),
+            {'id': 'base1-2'},  # Sin nombre
+            card_payload('base1-1', 'Alakazam Duplicado'),
+        ], self.expansion, bulk=True)
+
+        assert (created, updated, unchanged) == (1, 0, 0)
+        assert Card.objects.get(api_id='base1-1').name == 'Alakazam Duplicado'
+
+    def test_bulk_expansions(self):
+        created, updated, unchanged = save_expansions_to_db([
+            {'id': 'base1', 'name': 'Base Set', 'releaseDate': '1999/01/09', 'total': 102},
+            {'id': 'jungle', 'name': 'Jungle', 'releaseDate': '1999/06/16', 'total': 64},
+        ], bulk=True)
+
+        assert (created, updated, unchanged) == (1, 1, 0)
+        self.expansion.refresh_from_db()
+        assert self.expansion.total_cards == 102
+        assert str(self.expansion.release_date) == '1999-01-09'
+
+    def test_empty_payload_returns_zero_counts(self):
+        assert save_cards_to_db([], self.expansion, bulk=True) == (0, 0, 0)
+        assert save_expansions_to_db([], bulk=True) == (0, 0, 0)
+
+
+@pytest.mark.django_db
+class TestContentHashChangeDetection:
+    """Tests para la detección de cambios por content_hash en los resync"""
+
+    def setup_method(self, method):
+        self.expansion = Expansion.objects.create(api_id='base1', name='Base Set')
+        self.payload = [card_payload(f'base1-{i}', f'Card {i}', hp='60') for i in range(1, 5)]
+
+    @pytest.mark.parametrize('bulk', [True, False])
+    def test_resync_of_unchanged_payload_writes_nothing(self, bulk):
+        save_cards_to_db(self.payload, self.expansion, bulk=bulk)
+        before = dict(Card.objects.values_list('api_id', 'updated_at'))
+
+        counts = save_cards_to_db(self.payload, self.expansion, bulk=bulk)
+
+        assert counts == (0, 0, 4)
+        assert dict(Card.objects.values_list('api_id', 'updated_at')) == before
+
+    @pytest.mark.parametrize('bulk', [True, False])
+    def test_only_changed_cards_are_written(self, bulk):
+        save_cards_to_db(self.payload, self.expansion, bulk=bulk)
+        before = dict(Card.objects.values_list('api_id', 'updated_at'))
+
+        self.payload[1]['hp'] = '70'
+        self.payload.append(card_payload('base1-5', 'Card 5'))
+        counts = save_cards_to_db(self.payload, self.expansion, bulk=bulk)
+
+        assert (counts.created, counts.updated, counts.unchanged) == (1, 1, 3)
+        after = dict(Card.objects.values_list('api_id', 'updated_at'))
+        assert after['base1-2'] > before['base1-2']
+        assert after['base1-1'] == before['base1-1']
+        assert Card.objects.get(api_id='base1-2').hp == '70'
+
+    def test_rows_without_hash_are_rewritten_once(self):
+        Card.objects.create(api_id='base1-1', name='Card 1', expansion=self.expansion)
+
+        assert save_cards_to_db(self.payload, self.expansion, bulk=True) == (3, 1, 0)
+        assert save_cards_to_db(self.payload, self.expansion, bulk=True) == (0, 0, 4)
+
+    def test_unchanged_expansions_are_skipped(self):
+        sets = [{'id': 'base1', 'name': 'Base Set', 'total': 102}]
+
+        assert save_expansions_to_db(sets, bulk=True) == (0, 1, 0)
+        assert save_expansions_to_db(sets, bulk=True) == (0, 0, 1)
+        sets[0]['total'] = 103
+        assert save_expansions_to_db(sets, bulk=True) == (0, 1, 0)
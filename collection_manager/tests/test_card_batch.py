@@ -0,0 +1,51 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from collection_manager.models import Card, Expansion
+
+
+@pytest.mark.django_db
+class TestCardBatch:
+    """Tests del endpoint /api/cards/batch/"""
+
+    def setup_method(self, method):
+        self.client = APIClient()
+        base = Expansion.objects.create(api_id='base1', name='Base Set')
+        jungle = Expansion.objects.create(api_id='base2', name='Jungle')
+        self.charizard = Card.objects.create(api_id='base1-4', name='Charizard', expansion=base, hp='120')
+        self.pikachu = Card.objects.create(api_id='base2-60', name='Pikachu', expansion=jungle, hp='50')
+
+    def test_get_by_api_id_keys_results_and_reports_missing(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/cards/batch/?ids=base2-60,nope-1,base1-4,base2-60')
+
+        assert response.status_code == 200
+        assert list(response.data['results']) == ['base2-60', 'base1-4']
+        assert response.data['results']['base1-4']['expansion_name'] == 'Base Set'
+        assert response.data['missing'] == ['nope-1']
+        assert len(queries) == 1
+
+    def test_results_match_the_detail_view(self):
+        detail = self.client.get('/api/cards/base1-4/').data
+        batch = self.client.get('/api/cards/batch/?ids=base1-4').data
+
+        assert batch['results']['base1-4'] == detail
+
+    def test_post_by_pk_with_sparse_fieldsets(self):
+        response = self.client.post(
+            '/api/cards/batch/?fields=name', {'pks': [self.pikachu.id, 999999]}, format='json'
+        )
+
+        assert response.status_code == 200
+        assert response.data['results'] == {str(self.pikachu.id): {'name': 'Pikachu'}}
+        assert response.data['missing'] == ['999999']
+
+    def test_invalid_requests_return_400(self):
+        assert self.client.get('/api/cards/batch/').status_code == 400
+        assert self.client.get('/api/cards/batch/?pks=1,abc').status_code == 400
+        assert self.client.post('/api/cards/batch/', {'ids': 'base1-4'}, format='json').status_code == 400
+        assert self.client.post('/api/cards/batch/', ['base1-4'], format='json').status_code == 400
+        assert self.client.post('/api/cards/batch/', 'base1-4', format='json').status_code == 400
+        too_many = ','.join(f'base1-{n}' for n in range(501))
+        assert self.client.get(f'/api/cards/batch/?ids={too_many}').status_code == 400
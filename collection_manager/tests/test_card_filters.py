@@ -0,0 +1,108 @@
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from collection_manager.api_service import parse_hp, save_cards_to_db
+from collection_manager.models import Card, Expansion
+
+User = get_user_model()
+
+
+def test_parse_hp():
+    assert parse_hp('120') == 120
+    assert parse_hp('60+') == 60
+    assert parse_hp('') is None
+    assert parse_hp(None) is None
+
+
+@pytest.mark.django_db
+class TestCardFilter:
+    """Tests del endpoint /api/cards/filter/"""
+
+    def setup_method(self, method):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='collector', password='pass123')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+        base = Expansion.objects.create(api_id='base1', name='Base Set', series='Base')
+        jungle = Expansion.objects.create(api_id='base2', name='Jungle', series='Base')
+        sv = Expansion.objects.create(api_id='sv1', name='Scarlet & Violet', series='Scarlet & Violet')
+        save_cards_to_db([
+            {'id': 'base1-4', 'name': 'Charizard', 'hp': '120', 'types': ['Fire'], 'rarity': 'Rare Holo',
+             'artist': 'Mitsuhiro Arita', 'convertedRetreatCost': 3},
+            {'id': 'base1-2', 'name': 'Blastoise', 'hp': '100', 'types': ['Water'], 'rarity': 'Rare Holo',
+             'artist': 'Ken Sugimori', 'convertedRetreatCost': 3},
+            {'id': 'base1-58', 'name': 'Pikachu', 'hp': '40', 'types': ['Lightning'], 'rarity': 'Common',
+             'artist': 'Mitsuhiro Arita', 'convertedRetreatCost': 1},
+        ], base, bulk=True)
+        save_cards_to_db([
+            {'id': 'base2-60', 'name': 'Pikachu', 'hp': '50', 'types': ['Lightning'], 'rarity': 'Common',
+             'artist': 'Mitsuhiro Arita', 'convertedRetreatCost': 1},
+        ], jungle, bulk=True)
+        save_cards_to_db([
+            {'id': 'sv1-1', 'name': 'Koraidon ex', 'hp': '230', 'types': ['Fighting', 'Dragon'],
+             'rarity': 'Double Rare', 'artist': 'PLANETA Mochizuki', 'convertedRetreatCost': 2},
+        ], sv, bulk=True)
+
+    def get(self, query=''):
+        response = self.client.get(f'/api/cards/filter/?{query}')
+        assert response.status_code == 200
+        return response.data
+
+    def test_import_fills_hp_value(self):
+        assert Card.objects.get(api_id='base1-4').hp_value == 120
+
+    def test_unfiltered_counts_every_facet(self):
+        data = self.get()
+
+        assert data['count'] == 5
+        facets = data['facets']
+        assert {'value': 'Lightning', 'count': 2} in facets['types']
+        assert {'value': 'Dragon', 'count': 1} in facets['types']
+        assert facets['rarity'][0] == {'value': 'Common', 'count': 2}
+        assert facets['artist'][0] == {'value': 'Mitsuhiro Arita', 'count': 3}
+        assert facets['series'] == [{'value': 'Base', 'count': 4}, {'value': 'Scarlet & Violet', 'count': 1}]
+        assert facets['hp'] == [
+            {'value': '0-50', 'count': 2}, {'value': '100-150', 'count': 2}, {'value': '210+', 'count': 1},
+        ]
+        assert {'value': 3, 'count': 2} in facets['retreat_cost']
+
+    def test_filters_combine_and_counts_follow_the_filters(self):
+        data = self.get('types=lightning,fire&artist=Mitsuhiro%20Arita&hp_min=50')
+
+        assert data['count'] == 2
+        assert [card['api_id'] for card in data['results']] == ['base1-4', 'base2-60']
+        assert data['facets']['types'] == [{'value': 'Fire', 'count': 1}, {'value': 'Lightning', 'count': 1}]
+
+    def test_counts_within_a_facet_are_disjunctive(self):
+        data = self.get('types=Fire&series=Base')
+
+        assert data['count'] == 1
+        facets = data['facets']
+        # Sin el filtro de tipos (solo serie Base): lo que añadiría cada tipo a la selección
+        assert facets['types'] == [
+            {'value': 'Fire', 'count': 1}, {'value': 'Lightning', 'count': 2}, {'value': 'Water', 'count': 1},
+        ]
+        assert self.get('types=Fire,Lightning&series=Base')['count'] == 3
+        # Las demás facetas sí aplican el filtro de tipos
+        assert facets['rarity'] == [{'value': 'Rare Holo', 'count': 1}]
+        assert facets['series'] == [{'value': 'Base', 'count': 1}]
+        assert self.get('hp_min=200')['facets']['hp'] == self.get()['facets']['hp']
+
+    def test_series_and_retreat_cost(self):
+        data = self.get('series=Base&retreat_cost=1')
+
+        assert {card['api_id'] for card in data['results']} == {'base1-58', 'base2-60'}
+
+    def test_results_are_paginated_by_cursor(self):
+        first = self.get('page_size=2&fields=api_id,name')
+
+        assert first['count'] == 5
+        assert first['results'] == [{'api_id': 'base1-2', 'name': 'Blastoise'},
+                                    {'api_id': 'base1-4', 'name': 'Charizard'}]
+        second = self.client.get(first['next']).data
+        assert [card['api_id'] for card in second['results']] == ['sv1-1', 'base1-58']
+
+    def test_invalid_values_return_400(self):
+        assert self.client.get('/api/cards/filter/?types=Plasma').status_code == 400
+        assert self.client.get('/api/cards/filter/?hp_min=lots').status_code == 400
+        assert self.client.get('/api/cards/filter/?retreat_cost=one').status_code == 400
@@ -0,0 +1,73 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from collection_manager.api_service import save_cards_to_db
+from collection_manager.models import Expansion
+
+User = get_user_model()
+
+requires_postgres = pytest.mark.skipif(
+    connection.vendor != 'postgresql', reason='Full-text/trigram search needs PostgreSQL'
+)
+
+
+@pytest.mark.django_db
+class TestCardSearch:
+    """Tests del endpoint /api/cards/search/"""
+
+    def setup_method(self, method):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='collector', password='pass123')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+        self.expansion = Expansion.objects.create(api_id='base1', name='Base Set')
+        save_cards_to_db([
+            {'id': 'base1-4', 'name': 'Charizard', 'artist': 'Mitsuhiro Arita',
+             'attacks': [{'name': 'Fire Spin'}], 'abilities': [{'name': 'Energy Burn'}]},
+            {'id': 'base1-2', 'name': 'Blastoise', 'artist': 'Ken Sugimori',
+             'attacks': [{'name': 'Hydro Pump'}], 'flavorText': 'It crushes its foe under its heavy body.'},
+            {'id': 'base1-58', 'name': 'Pikachu', 'artist': 'Mitsuhiro Arita',
+             'attacks': [{'name': 'Gnaw'}, {'name': 'Thunder Jolt'}]},
+        ], self.expansion, bulk=True)
+
+    def search(self, query):
+        response = self.client.get(f'/api/cards/search/?{query}')
+        assert response.status_code == 200
+        return response.data
+
+    def test_query_is_required(self):
+        assert self.client.get('/api/cards/search/?q=%20').status_code == 400
+
+    def test_search_by_name_is_paginated(self):
+        data = self.search('q=pikachu')
+
+        assert data['count'] == 1
+        assert data['results'][0]['api_id'] == 'base1-58'
+        assert data['results'][0]['expansion_name'] == 'Base Set'
+
+    def test_search_by_artist_pages_results(self):
+        data = self.search('q=Arita&page_size=1')
+
+        assert data['count'] == 2
+        assert len(data['results']) == 1
+        assert data['next'] is not None
+
+    def test_search_supports_sparse_fieldsets(self):
+        data = self.search('q=blastoise&fields=id,name')
+
+        assert data['results'] == [{'id': data['results'][0]['id'], 'name': 'Blastoise'}]
+
+    @requires_postgres
+    def test_search_matches_attack_names(self):
+        assert [card['name'] for card in self.search('q=hydro pump')['results']] == ['Blastoise']
+
+    @requires_postgres
+    def test_search_tolerates_typos(self):
+        assert self.search('q=charzard')['results'][0]['name'] == 'Charizard'
+
+    @requires_postgres
+    def test_name_matches_rank_above_artist_matches(self):
+        save_cards_to_db([{'id': 'base1-99', 'name': 'Arita Tribute', 'artist': 'Someone'}], self.expansion, bulk=True)
+
+        assert self.search('q=arita')['results'][0]['name'] == 'Arita Tribute'
@@ -0,0 +1,125 @@
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from collection_manager.api_service import import_all_expansions_cards, import_cards_for_expansion
+from collection_manager.catalog_cache import EXPANSION_LIST_KEY, card_list_key, get_blob_cache
+from collection_manager.catalog_version import get_catalog_version
+from collection_manager.models import Card, Expansion
+from collection_manager.serializers import CardSerializer
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestCatalogBlobs:
+    """Tests de los blobs JSON precalculados de la lista de expansiones y de cartas"""
+
+    def setup_method(self, method):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='collector', password='pass123')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+        self.expansion = Expansion.objects.create(api_id='base1', name='Base Set')
+        for i in range(1, 6):
+            Card.objects.create(api_id=f'base1-{i}', name=f'Card {i}', expansion=self.expansion, number=str(i))
+
+    def test_cache_hit_skips_orm_and_serializer(self):
+        first = self.client.get('/api/expansions/base1/cards/')
+
+        with CaptureQueriesContext(connection) as queries, \
+                mock.patch.object(CardSerializer, 'to_representation') as to_representation:
+            second = self.client.get('/api/expansions/base1/cards/')
+
+        assert second.content == first.content
+        assert not to_representation.called
+        assert len(queries) == 1 # Solo el usuario (JWT): versión del catálogo y blob salen de la caché
+        assert 'users_customuser' in queries.captured_queries[0]['sql']
+
+    def test_blob_matches_the_serializer_output(self):
+        response = self.client.get('/api/expansions/base1/cards/')
+
+        cards = Card.objects.filter(expansion=self.expansion).select_related('expansion')
+        assert response['Content-Type'] == 'application/json'
+        assert response.json() == CardSerializer(cards, many=True).data
+
+    def test_expansion_list_is_served_from_the_blob(self):
+        self.client.get('/api/expansions/')
+
+        assert get_blob_cache().get(EXPANSION_LIST_KEY) is not None
+        assert self.client.get('/api/expansions/').json()[0]['api_id'] == 'base1'
+
+    def test_bookkeeping_columns_are_not_exposed(self):
+        Expansion.objects.filter(pk=self.expansion.pk).update(content_hash='abc')
+
+        expansion = self.client.get('/api/expansions/').json()[0]
+        card = self.client.get('/api/expansions/base1/cards/').json()[0]
+
+        assert 'content_hash' not in expansion
+        assert not {'content_hash', 'search_vector', 'set_position', 'hp_value'} & set(card)
+
+    def test_unknown_expansion_is_not_cached(self):
+        response = self.client.get('/api/expansions/nope/cards/')
+
+        assert response.status_code == 200
+        assert response.json() == []
+        assert get_blob_cache().get(card_list_key('nope')) is None
+
+    def test_sparse_and_paginated_requests_bypass_the_blob(self):
+        self.client.get('/api/expansions/base1/cards/')
+
+        assert set(self.client.get('/api/expansions/base1/cards/?fields=id,name').data[0]) == {'id', 'name'}
+        assert len(self.client.get('/api/expansions/base1/cards/?page_size=2').data['results']) == 2
+
+    def test_import_rebuilds_the_blob(self, django_capture_on_commit_callbacks):
+        self.client.get('/api/expansions/base1/cards/')
+        client = mock.Mock()
+        client.get_json.return_value = {'data': [{'id': 'base1-6', 'name': 'Card 6', 'number': '6'}], 'totalCount': 1}
+
+        with mock.patch('collection_manager.api_service.get_client', return_value=client), \
+                django_capture_on_commit_callbacks(execute=True):
+            import_cards_for_expansion('base1')
+
+        version, _ = get_catalog_version()
+        assert version == 1
+        blob = get_blob_cache().get(card_list_key('base1'))
+        assert blob is not None
+        with mock.patch.object(CardSerializer, 'to_representation') as to_representation:
+            response = self.client.get('/api/expansions/base1/cards/')
+        assert not to_representation.called
+        assert len(response.json()) == 6
+
+    def test_import_keeps_the_other_expansions_warm(self, django_capture_on_commit_callbacks):
+        jungle = Expansion.objects.create(api_id='base2', name='Jungle')
+        Card.objects.create(api_id='base2-1', name='Clefable', expansion=jungle, number='1')
+        self.client.get('/api/expansions/base2/cards/')
+        client = mock.Mock()
+        client.get_json.return_value = {'data': [{'id': 'base1-6', 'name': 'Card 6', 'number': '6'}], 'totalCount': 1}
+
+        with mock.patch('collection_manager.api_service.get_client', return_value=client), \
+                django_capture_on_commit_callbacks(execute=True):
+            import_all_expansions_cards(expansion_api_ids=['base1'])
+
+        with mock.patch.object(CardSerializer, 'to_representation') as to_representation:
+            self.client.get('/api/expansions/base2/cards/')
+        assert not to_representation.called
+
+
+@pytest.mark.django_db(transaction=True)
+def test_a_sync_run_bumps_the_catalog_version_once():
+    """Cada página confirma su transacción (y apunta el cambio); la versión sube una vez al final"""
+    for api_id in ('base1', 'base2'):
+        Expansion.objects.create(api_id=api_id, name=api_id)
+    client = mock.Mock()
+    client.get_json.side_effect = lambda path, params=None, **kwargs: {
+        'data': [{'id': f"{params['q'].split(':')[1]}-99", 'name': 'New', 'number': '99'}], 'totalCount': 1,
+    }
+
+    with mock.patch('collection_manager.api_service.get_client', return_value=client):
+        summary = import_all_expansions_cards(expansion_api_ids=['base1', 'base2'])
+
+    assert summary['created'] == 2
+    assert get_catalog_version()[0] == 1
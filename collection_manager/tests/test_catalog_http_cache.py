@@ -0,0 +1,84 @@
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from collection_manager.api_service import save_cards_to_db
+from collection_manager.catalog_version import bump_catalog_version, get_catalog_version
+from collection_manager.models import Card, Expansion
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestCatalogConditionalGet:
+    """Tests de ETag / Last-Modified / 304 en los endpoints públicos del catálogo"""
+
+    def setup_method(self, method):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='collector', password='pass123')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+        self.expansion = Expansion.objects.create(api_id='base1', name='Base Set')
+        Card.objects.create(api_id='base1-4', name='Charizard', expansion=self.expansion, number='4')
+        bump_catalog_version()
+
+    @pytest.mark.parametrize('url, visibility', [
+        ('/api/expansions/', 'private'), ('/api/expansions/base1/cards/', 'private'), ('/api/cards/base1-4/', 'public'),
+    ])
+    def test_etag_round_trip_returns_304(self, url, visibility):
+        response = self.client.get(url)
+        assert response.status_code == 200
+        assert response['ETag'].startswith('"catalog-v1')
+        assert 'Last-Modified' in response
+        assert visibility in response['Cache-Control'] and 'max-age=' in response['Cache-Control']
+        assert ('Authorization' in response['Vary']) == (visibility == 'private')
+
+        with mock.patch('collection_manager.views.CardSerializer.to_representation') as card_to_repr, \
+                mock.patch('collection_manager.views.ExpansionSerializer.to_representation') as exp_to_repr:
+            not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+        assert not_modified.status_code == 304
+        assert not_modified.content == b''
+        assert not card_to_repr.called and not exp_to_repr.called
+
+    def test_if_modified_since_returns_304(self):
+        response = self.client.get('/api/expansions/')
+
+        not_modified = self.client.get('/api/expansions/', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+
+        assert not_modified.status_code == 304
+
+    def test_import_that_changes_cards_invalidates_the_etag(self, django_capture_on_commit_callbacks):
+        etag = self.client.get('/api/expansions/base1/cards/')['ETag']
+
+        with django_capture_on_commit_callbacks(execute=True):
+            save_cards_to_db([{'id': 'base1-2', 'name': 'Blastoise', 'number': '2'}], self.expansion, bulk=True)
+
+        response = self.client.get('/api/expansions/base1/cards/', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response['ETag'] != etag
+        assert len(response.json()) == 2
+
+    def test_unchanged_resync_keeps_the_version(self, django_capture_on_commit_callbacks):
+        payload = [{'id': 'base1-2', 'name': 'Blastoise', 'number': '2'}]
+        with django_capture_on_commit_callbacks(execute=True):
+            save_cards_to_db(payload, self.expansion, bulk=True)
+        version = get_catalog_version()[0]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            save_cards_to_db(payload, self.expansion, bulk=True)
+
+        assert get_catalog_version()[0] == version
+
+    def test_not_found_card_has_no_etag(self):
+        response = self.client.get('/api/cards/missing/')
+
+        assert response.status_code == 404
+        assert not response.has_header('ETag')
+
+    def test_authentication_is_checked_before_the_etag(self):
+        etag = self.client.get('/api/expansions/')['ETag']
+        self.client.credentials()
+
+        assert self.client.get('/api/expansions/', HTTP_IF_NONE_MATCH=etag).status_code == 401
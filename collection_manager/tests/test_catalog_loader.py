@@ -0,0 +1,123 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from collection_manager.catalog_loader import iter_json_array, load_catalog_dump
+from collection_manager.models import Card, Expansion
+
+
+def write_dump(root, sets, cards_by_set):
+    """Crea un volcado con la estructura de pokemon-tcg-data en root"""
+    (root / 'sets').mkdir()
+    (root / 'sets' / 'en.json').write_text(json.dumps(sets, indent=2), encoding='utf-8')
+    (root / 'cards' / 'en').mkdir(parents=True)
+    for set_id, cards in cards_by_set.items():
+        (root / 'cards' / 'en' / f'{set_id}.json').write_text(json.dumps(cards, indent=2), encoding='utf-8')
+
+
+SETS = [
+    {'id': 'base1', 'name': 'Base', 'series': 'Base', 'total': 102, 'releaseDate': '1999/01/09',
+     'images': {'symbol': 'https://images.example.com/base1/symbol.png'}},
+    {'id': 'jungle', 'name': 'Jungle', 'series': 'Base', 'total': 64, 'releaseDate': '1999/06/16'},
+]
+CARDS = {
+    'base1': [
+        {'id': f'base1-{i}', 'name': f'Base Card {i}', 'number': str(i), 'hp': '60',
+         'types': ['Fire'], 'attacks': [{'name': 'Ember', 'damage': '30'}], 'convertedRetreatCost': 1}
+        for i in range(1, 31)
+    ],
+    'jungle': [{'id': 'jungle-1', 'name': 'Clefable', 'number': '1', 'flavorText': ''}],
+}
+
+
+class TestIterJsonArray:
+    """Tests del parser incremental de arrays JSON"""
+
+    @pytest.mark.parametrize('read_size', [1, 7, 64 * 1024])
+    def test_yields_every_element_with_any_read_size(self, tmp_path, read_size):
+        items = [{'id': 'a', 'nested': {'list': [1, 2, {'x': 'y]}'}]}}, 12345, 'text, with comma', None, [1, [2]]]
+        path = tmp_path / 'data.json'
+        path.write_text(json.dumps(items, indent=1), encoding='utf-8')
+
+        assert list(iter_json_array(path, read_size=read_size)) == items
+
+    def test_empty_array(self, tmp_path):
+        path = tmp_path / 'empty.json'
+        path.write_text(' [ ] ', encoding='utf-8')
+        assert list(iter_json_array(path)) == []
+
+    def test_rejects_non_array_and_truncated_files(self, tmp_path):
+        obj = tmp_path / 'obj.json'
+        obj.write_text('{"data": []}', encoding='utf-8')
+        truncated = tmp_path / 'truncated.json'
+        truncated.write_text('[{"id": "a"}, {"id": ', encoding='utf-8')
+
+        with pytest.raises(ValueError):
+            list(iter_json_array(obj))
+        with pytest.raises(ValueError):
+            list(iter_json_array(truncated, read_size=4))
+
+
+@pytest.mark.django_db
+class TestLoadCatalogDump:
+    """Tests de la carga offline de expansiones y cartas"""
+
+    def test_loads_expansions_and_cards(self, tmp_path):
+        write_dump(tmp_path, SETS, CARDS)
+
+        result = load_catalog_dump(tmp_path, chunk_size=7)
+
+        assert result['expansions'] == (2, 0, 0)
+        assert result['cards'] == (31, 0, 0)
+        card = Card.objects.get(api_id='base1-3')
+        assert card.expansion.api_id == 'base1'
+        assert card.types == ['Fire']
+        assert card.attacks == [{'name': 'Ember', 'damage': '30'}]
+        assert card.converted_retreat_cost == 1
+        assert Card.objects.get(api_id='jungle-1').flavor_text == ''
+        assert Card.objects.get(api_id='jungle-1').hp is None
+        assert str(Expansion.objects.get(api_id='base1').release_date) == '1999-01-09'
+
+    def test_reload_only_writes_changed_rows(self, tmp_path):
+        write_dump(tmp_path, SETS, CARDS)
+        load_catalog_dump(tmp_path)
+
+        (tmp_path / 'cards' / 'en' / 'jungle.json').write_text(
+            json.dumps([{'id': 'jungle-1', 'name': 'Clefable', 'number': '1', 'hp': '70'}]), encoding='utf-8'
+        )
+        result = load_catalog_dump(tmp_path)
+
+        assert result['expansions'] == (0, 0, 2)
+        assert result['cards'] == (0, 1, 30)
+        assert Card.objects.get(api_id='jungle-1').hp == '70'
+
+    def test_duplicates_keep_the_last_row_and_unknown_sets_are_skipped(self, tmp_path):
+        cards = dict(CARDS, jungle=CARDS['jungle'] + [{'id': 'jungle-1', 'name': 'Clefable', 'number': '1', 'hp': '70'}],
+                     promo=[{'id': 'promo-1', 'name': 'Mew', 'number': '1'}])
+        write_dump(tmp_path, SETS, cards)
+
+        result = load_catalog_dump(tmp_path, chunk_size=1)
+
+        assert Card.objects.get(api_id='jungle-1').hp == '70'
+        assert not Card.objects.filter(api_id='promo-1').exists()
+        assert result['skipped_cards'] == 1
+
+    def test_hashes_match_the_api_sync(self, tmp_path):
+        """Un resync por API después de la carga offline no reescribe nada"""
+        from collection_manager.api_service import save_cards_to_db
+
+        write_dump(tmp_path, SETS, CARDS)
+        load_catalog_dump(tmp_path)
+
+        assert save_cards_to_db(CARDS['base1'], Expansion.objects.get(api_id='base1'), bulk=True) == (0, 0, 30)
+
+    def test_command_output_and_missing_dump(self, tmp_path):
+        write_dump(tmp_path, SETS, CARDS)
+        out = StringIO()
+        call_command('load_catalog_dump', str(tmp_path), stdout=out)
+        assert 'Cartas: 31 creadas' in out.getvalue()
+
+        with pytest.raises(CommandError):
+            call_command('load_catalog_dump', str(tmp_path / 'missing'), stdout=StringIO())
@@ -0,0 +1,113 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from collection_manager.catalog_cache import get_blob_cache
+from collection_manager.models import Card, Expansion, UserCard
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestCatalogQueries:
+    """Tests de número de queries (sin N+1) y de ?fields= en los listados del catálogo"""
+
+    def setup_method(self, method):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='collector', password='pass123')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+        self.expansion = Expansion.objects.create(api_id='base1', name='Base Set')
+        self.cards = [
+            Card.objects.create(
+                api_id=f'base1-{i}', name=f'Card {i}', expansion=self.expansion, number=str(i),
+                image_url_small=f'https://images.example.com/{i}.png',
+                attacks=[{'name': 'Tackle', 'damage': '10'}],
+            )
+            for i in range(1, 11)
+        ]
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        assert response.status_code == 200
+        return response, len(queries)
+
+    def test_card_list_does_not_query_per_card(self):
+        response, queries = self.count_queries('/api/expansions/base1/cards/')
+
+        assert len(response.json()) == 10
+        assert response.json()[0]['expansion_name'] == 'Base Set'
+        Card.objects.create(api_id='base1-11', name='Card 11', expansion=self.expansion)
+        get_blob_cache().clear() # Fuerza otra vez el renderizado completo
+        _, queries_with_more_cards = self.count_queries('/api/expansions/base1/cards/')
+        assert queries_with_more_cards == queries
+
+    def test_card_detail_fetches_expansion_in_the_same_query(self):
+        self.client.credentials() # Endpoint público: sin la query del usuario autenticado
+        response, queries = self.count_queries('/api/cards/base1-1/')
+
+        assert response.data['expansion_name'] == 'Base Set'
+        assert queries == 2 # Versión del catálogo (ETag) + carta con su expansión
+
+    def test_user_card_list_does_not_query_per_row(self):
+        UserCard.objects.create(user=self.user, card=self.cards[0])
+        _, one_row = self.count_queries('/api/user-cards/')
+        for card in self.cards[1:]:
+            UserCard.objects.create(user=self.user, card=card)
+
+        response, many_rows = self.count_queries('/api/user-cards/')
+
+        assert len(response.data) == 10
+        assert response.data[0]['expansion_name'] == 'Base Set'
+        assert many_rows == one_row
+
+    def test_sparse_fieldset_returns_only_requested_fields(self):
+        response, _ = self.count_queries('/api/expansions/base1/cards/?fields=id,name,image_url_small,number')
+
+        assert set(response.data[0]) == {'id', 'name', 'image_url_small', 'number'}
+
+    def test_sparse_fieldset_does_not_load_unrequested_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/expansions/base1/cards/?fields=id,name,number')
+
+        sql = queries.captured_queries[-1]['sql']
+        assert '"attacks"' not in sql
+        assert 'collection_manager_expansion"."name' not in sql
+
+    def test_sparse_fieldset_with_expansion_name_and_pagination(self):
+        response, _ = self.count_queries('/api/expansions/base1/cards/?fields=name,expansion_name&page_size=4')
+
+        assert set(response.data['results'][0]) == {'name', 'expansion_name'}
+        assert response.data['results'][0]['expansion_name'] == 'Base Set'
+        assert response.data['next'] is not None
+
+    def test_unknown_fields_are_ignored(self):
+        response, _ = self.count_queries('/api/expansions/?fields=name,bogus')
+
+        assert response.data == [{'name': 'Base Set'}]
+
+    def test_owned_overlay_in_the_same_query(self):
+        UserCard.objects.create(user=self.user, card=self.cards[0], quantity=2)
+        UserCard.objects.create(user=self.user, card=self.cards[0], language='ES', is_favorite=True)
+        other = User.objects.create_user(username='other', password='pass123')
+        UserCard.objects.create(user=other, card=self.cards[1], quantity=5)
+
+        response, queries = self.count_queries('/api/expansions/base1/cards/?include=owned')
+
+        owned = {card['api_id']: card['owned'] for card in response.data}
+        assert owned['base1-1'] == {'quantity': 3, 'variants': 2, 'is_favorite': True}
+        assert owned['base1-2'] == {'quantity': 0, 'variants': 0, 'is_favorite': False}
+        assert queries == 2 # Usuario (JWT) + cartas con su expansión y lo que tiene el usuario
+        assert 'private' in response['Cache-Control']
+        assert 'ETag' not in response
+
+    def test_owned_overlay_with_sparse_fieldset_and_pagination(self):
+        UserCard.objects.create(user=self.user, card=self.cards[0])
+
+        response, _ = self.count_queries('/api/expansions/base1/cards/?include=owned&fields=api_id,owned&page_size=2')
+
+        assert response.data['results'][0] == {'api_id': 'base1-1', 'owned': {'quantity': 1, 'variants': 1, 'is_favorite': False}}
+        assert self.client.get(response.data['next']).status_code == 200
@@ -0,0 +1,84 @@
+import csv
+import io
+import json
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from collection_manager.collection_export import HEADER
+from collection_manager.models import Card, Expansion, UserCard
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestCollectionExport:
+    """Exportación en streaming de la colección (/api/user-cards/export/<formato>/ y export_collection)"""
+
+    def setup_method(self, method):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='collector', password='pass123')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+        base = Expansion.objects.create(api_id='base1', name='Base Set')
+        self.charizard = Card.objects.create(api_id='base1-4', name='Charizard', expansion=base, number='4')
+        self.pikachu = Card.objects.create(api_id='base1-58', name='Pikachu', expansion=base, number='58')
+        UserCard.objects.create(user=self.user, card=self.charizard, quantity=2, is_favorite=True, notes='Sleeved, "mint"')
+        UserCard.objects.create(user=self.user, card=self.pikachu, language='ES')
+        other = User.objects.create_user(username='other', password='pass123')
+        UserCard.objects.create(user=other, card=self.pikachu, quantity=9)
+
+    def download(self, export_format, **headers):
+        response = self.client.get(f'/api/user-cards/export/{export_format}/', **headers)
+        assert response.status_code == 200
+        assert response.streaming
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_csv_export(self):
+        response, content = self.download('csv')
+
+        assert response['Content-Type'] == 'text/csv; charset=utf-8'
+        assert 'collection-collector.csv' in response['Content-Disposition']
+        rows = list(csv.DictReader(io.StringIO(content)))
+        assert list(rows[0]) == HEADER
+        assert [(row['card_api_id'], row['quantity'], row['language']) for row in rows] == [
+            ('base1-4', '2', 'EN'), ('base1-58', '1', 'ES'),
+        ]
+        assert rows[0]['notes'] == 'Sleeved, "mint"'
+        assert rows[0]['is_favorite'] == 'True'
+
+    def test_ndjson_export(self):
+        response, content = self.download('ndjson')
+
+        assert response['Content-Type'] == 'application/x-ndjson'
+        items = [json.loads(line) for line in content.splitlines()]
+        assert [(item['card_name'], item['quantity'], item['is_favorite']) for item in items] == [
+            ('Charizard', 2, True), ('Pikachu', 1, False),
+        ]
+        assert items[0]['expansion_api_id'] == 'base1'
+
+    @pytest.mark.parametrize('export_format, accept', [
+        ('csv', 'text/csv'),
+        ('ndjson', 'application/x-ndjson'),
+        ('csv', 'text/csv, application/json;q=0.5'),
+    ])
+    def test_accept_header(self, export_format, accept):
+        response, content = self.download(export_format, HTTP_ACCEPT=accept)
+
+        assert response['Content-Type'].startswith(accept.split(',')[0])
+        assert 'base1-58' in content
+
+    def test_unknown_format_and_anonymous(self):
+        assert self.client.get('/api/user-cards/export/xml/').status_code == 404
+        self.client.credentials()
+        assert self.client.get('/api/user-cards/export/csv/').status_code == 401
+        assert self.client.get('/api/user-cards/export/csv/', HTTP_ACCEPT='text/csv').json()['detail']
+
+    def test_management_command(self, tmp_path):
+        out = io.StringIO()
+        call_command('export_collection', 'collector', '--format', 'ndjson', '--chunk-size', '1', stdout=out)
+        assert [json.loads(line)['card_api_id'] for line in out.getvalue().splitlines()] == ['base1-4', 'base1-58']
+
+        path = tmp_path / 'collection.csv'
+        call_command('export_collection', 'collector', '--output', str(path), stderr=io.StringIO())
+        assert len(path.read_text().splitlines()) == 3
@@ -0,0 +1,106 @@
+import pytest
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from collection_manager.models import Card, Expansion, UserCard, UserCollectionStats, UserExpansionStats
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestCollectionStats:
+    """UserCollectionStats / UserExpansionStats y sus endpoints"""
+
+    def setup_method(self, method):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='collector', password='pass123')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+        self.base = Expansion.objects.create(api_id='base1', name='Base Set')
+        self.jungle = Expansion.objects.create(api_id='base2', name='Jungle')
+        self.charizard = Card.objects.create(api_id='base1-4', name='Charizard', expansion=self.base, rarity='Rare Holo')
+        self.pikachu = Card.objects.create(api_id='base1-58', name='Pikachu', expansion=self.base, rarity='Common')
+        self.snorlax = Card.objects.create(api_id='base2-11', name='Snorlax', expansion=self.jungle, rarity='Rare Holo')
+
+    def stats(self):
+        return UserCollectionStats.objects.get(user=self.user)
+
+    def test_single_row_changes_keep_stats_current(self):
+        UserCard.objects.create(user=self.user, card=self.charizard, quantity=2, is_favorite=True)
+        spanish = UserCard.objects.create(user=self.user, card=self.charizard, language='ES')
+        pikachu = UserCard.objects.create(user=self.user, card=self.pikachu, quantity=4)
+
+        stats = self.stats()
+        assert (stats.unique_cards, stats.total_copies, stats.variants, stats.favorites, stats.expansions) == (2, 7, 3, 1, 1)
+        assert stats.rarity_counts == {'Rare Holo': 1, 'Common': 1}
+
+        spanish.delete()
+        pikachu.card = self.snorlax # Cambia de expansión: se recalculan las dos
+        pikachu.save()
+
+        stats = self.stats()
+        assert (stats.unique_cards, stats.total_copies, stats.variants, stats.expansions) == (2, 6, 2, 2)
+        assert stats.rarity_counts == {'Rare Holo': 2}
+        base = UserExpansionStats.objects.get(user=self.user, expansion=self.base)
+        assert (base.unique_cards, base.total_copies, base.variants) == (1, 2, 1)
+
+    def test_bulk_operations_update_stats_once(self):
+        response = self.client.post('/api/user-cards/bulk/', {'operations': [
+            {'op': 'add', 'card': self.charizard.id, 'quantity': 3},
+            {'op': 'add', 'card': self.snorlax.id, 'is_favorite': True},
+        ]}, format='json')
+        assert response.status_code == 200
+
+        stats = self.stats()
+        assert (stats.unique_cards, stats.total_copies, stats.favorites, stats.expansions) == (2, 4, 1, 2)
+
+    def test_empty_expansions_are_removed(self):
+        user_card = UserCard.objects.create(user=self.user, card=self.snorlax)
+        user_card.delete()
+
+        assert not UserExpansionStats.objects.filter(user=self.user).exists()
+        assert self.stats().unique_cards == 0
+
+    def test_stats_endpoints(self):
+        UserCard.objects.create(user=self.user, card=self.charizard, quantity=2)
+        UserCard.objects.create(user=self.user, card=self.snorlax)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/user-stats/')
+        assert response.status_code == 200
+        assert response.data['unique_cards'] == 2
+        assert response.data['total_copies'] == 3
+        assert len(queries) == 2 # usuario (JWT) + fila de estadísticas
+
+        response = self.client.get('/api/user-stats/expansions/')
+        assert [row['expansion_name'] for row in response.data] == ['Base Set', 'Jungle']
+        assert response.data[0]['rarity_counts'] == {'Rare Holo': 1}
+
+    def test_stats_endpoint_for_an_empty_collection(self):
+        response = self.client.get('/api/user-stats/')
+
+        assert response.status_code == 200
+        assert response.data['unique_cards'] == 0
+
+    def test_user_expansions_do_not_mix_users(self):
+        other = User.objects.create_user(username='other', password='pass123')
+        UserCard.objects.create(user=other, card=self.charizard)
+        UserCard.objects.create(user=other, card=self.pikachu)
+        UserCard.objects.create(user=self.user, card=self.charizard)
+
+        response = self.client.get('/api/user-expansions/')
+
+        assert [(row['name'], row['user_cards_count']) for row in response.data] == [('Base Set', 1)]
+
+    def test_rebuild_command(self):
+        UserCard.objects.create(user=self.user, card=self.charizard, quantity=2)
+        UserCard.objects.bulk_create([UserCard(user=self.user, card=self.snorlax)]) # Sin señales
+        UserCollectionStats.objects.all().delete()
+
+        call_command('rebuild_collection_stats', stdout=StringIO())
+
+        stats = self.stats()
+        assert (stats.unique_cards, stats.total_copies, stats.expansions) == (2, 3, 2)
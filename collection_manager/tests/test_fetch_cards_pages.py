@@ -0,0 +1,215 @@
+import threading
+import time
+from unittest import mock
+
+import pytest
+import requests
+from collection_manager import api_service
+from collection_manager.api_service import fetch_cards_from_api, import_cards_for_expansion, iter_card_pages
+from collection_manager.models import Card, Expansion, ImportCheckpoint, ImportRun, ImportStep
+from collection_manager.pokemontcg_client import PokemonTCGClient
+
+
+class FakeCardsAPI:
+    """Sustituye Session.get: sirve `total` cartas paginadas y puede fallar en una página concreta"""
+
+    def __init__(self, total, fail_page=None, delay=0):
+        self.total = total
+        self.fail_page = fail_page
+        self.delay = delay
+        self.requested_pages = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, url, params=None, headers=None, timeout=None):
+        page, page_size = params['page'], params['pageSize']
+        with self.lock:
+            self.requested_pages.append(page)
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            response = mock.Mock(status_code=200, content=b'{}')
+            if page == self.fail_page:
+                response.status_code = 500
+                response.raise_for_status.side_effect = requests.exceptions.HTTPError('500 Server Error')
+            start = (page - 1) * page_size
+            ids = range(start, min(start + page_size, self.total))
+            response.json.return_value = {
+                'data': [{'id': f'sv1-{i}', 'name': f'Card {i}'} for i in ids],
+                'totalCount': self.total,
+            }
+            return response
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+def fake_client(api):
+    """Cliente sin caché cuya sesión HTTP es el FakeCardsAPI"""
+    return PokemonTCGClient(session=mock.Mock(get=api))
+
+
+def test_pages_are_fetched_concurrently_and_returned_in_order():
+    api = FakeCardsAPI(total=258, delay=0.02)
+    with mock.patch('collection_manager.api_service.get_client', return_value=fake_client(api)):
+        cards = fetch_cards_from_api('sv1', page_size=25, concurrency=4)
+
+    assert [card['id'] for card in cards] == [f'sv1-{i}' for i in range(258)]
+    assert sorted(api.requested_pages) == list(range(1, 12))
+    assert api.requested_pages[0] == 1
+    assert 1 < api.peak_in_flight <= 4
+
+
+def test_single_page_set_makes_one_request():
+    api = FakeCardsAPI(total=102)
+    with mock.patch('collection_manager.api_service.get_client', return_value=fake_client(api)):
+        cards = fetch_cards_from_api('base1')
+
+    assert len(cards) == 102
+    assert api.requested_pages == [1]
+
+
+def test_failed_page_keeps_only_the_pages_before_it():
+    api = FakeCardsAPI(total=100, fail_page=3)
+    with mock.patch('collection_manager.api_service.get_client', return_value=fake_client(api)):
+        cards = fetch_cards_from_api('sv1', page_size=20, concurrency=2)
+
+    assert [card['id'] for card in cards] == [f'sv1-{i}' for i in range(40)]
+
+
+def test_failed_first_page_returns_empty_list():
+    api = FakeCardsAPI(total=100, fail_page=1)
+    with mock.patch('collection_manager.api_service.get_client', return_value=fake_client(api)):
+        assert fetch_cards_from_api('sv1', page_size=20) == []
+
+
+def test_iter_card_pages_yields_one_page_at_a_time():
+    api = FakeCardsAPI(total=95)
+    with mock.patch('collection_manager.api_service.get_client', return_value=fake_client(api)):
+        pages = list(iter_card_pages('sv1', page_size=20, concurrency=2))
+
+    assert [len(page.cards) for page in pages] == [20, 20, 20, 20, 15]
+    assert [(page.page, page.last_page) for page in pages] == [(1, 5), (2, 5), (3, 5), (4, 5), (5, 5)]
+
+
+@pytest.mark.django_db
+def test_import_streams_pages_and_keeps_written_pages_on_failure():
+    expansion = Expansion.objects.create(api_id='sv1', name='Scarlet & Violet')
+    api = FakeCardsAPI(total=100, fail_page=4)
+    with mock.patch('collection_manager.api_service.get_client', return_value=fake_client(api)):
+        assert import_cards_for_expansion('sv1', page_size=20) == (60, 0, 0, False)
+
+    assert Card.objects.filter(expansion=expansion).count() == 60
+
+
+@pytest.mark.django_db
+def test_db_failure_mid_set_keeps_pages_already_committed():
+    expansion = Expansion.objects.create(api_id='sv1', name='Scarlet & Violet')
+    api = FakeCardsAPI(total=60)
+    real_save = api_service.save_cards_to_db
+    calls = []
+
+    def flaky_save(cards_data, expansion_instance, bulk=False):
+        calls.append(len(cards_data))
+        if len(calls) == 2:
+            raise RuntimeError('disk full')
+        return real_save(cards_data, expansion_instance, bulk=bulk)
+
+    with mock.patch('collection_manager.api_service.get_client', return_value=fake_client(api)), \
+            mock.patch('collection_manager.api_service.save_cards_to_db', side_effect=flaky_save):
+        with pytest.raises(RuntimeError):
+            import_cards_for_expansion('sv1', page_size=20)
+
+    assert list(Card.objects.filter(expansion=expansion).values_list('api_id', flat=True).order_by('id')) == [
+        f'sv1-{i}' for i in range(20)
+    ]
+
+
+@pytest.mark.django_db
+class TestImportCheckpoints:
+    """Tests de los checkpoints por página y la reanudación de importaciones"""
+
+    def setup_method(self, method):
+        self.expansion = Expansion.objects.create(api_id='sv1', name='Scarlet & Violet')
+
+    def run_import(self, api, **kwargs):
+        with mock.patch('collection_manager.api_service.get_client', return_value=fake_client(api)):
+            return import_cards_for_expansion('sv1', page_size=20, **kwargs)
+
+    def test_partial_fetch_is_flagged_and_checkpointed(self):
+        result = self.run_import(FakeCardsAPI(total=100, fail_page=3))
+
+        assert result == (40, 0, 0, False)
+        checkpoint = ImportCheckpoint.objects.get(expansion=self.expansion)
+        assert checkpoint.status == ImportCheckpoint.STATUS_PARTIAL
+        assert (checkpoint.last_page, checkpoint.total_pages) == (2, 5)
+
+    def test_resume_continues_after_last_committed_page(self):
+        self.run_import(FakeCardsAPI(total=100, fail_page=3))
+
+        api = FakeCardsAPI(total=100)
+        result = self.run_import(api, resume=True)
+
+        assert result == (60, 0, 0, True)
+        assert sorted(api.requested_pages) == [3, 4, 5]
+        assert Card.objects.filter(expansion=self.expansion).count() == 100
+        assert ImportCheckpoint.objects.get(expansion=self.expansion).status == ImportCheckpoint.STATUS_COMPLETE
+
+    def test_resume_skips_completed_expansions(self):
+        self.run_import(FakeCardsAPI(total=30))
+
+        api = FakeCardsAPI(total=30)
+        assert self.run_import(api, resume=True) == (0, 0, 0, True)
+        assert api.requested_pages == []
+
+    def test_without_resume_the_import_restarts_from_page_one(self):
+        self.run_import(FakeCardsAPI(total=100, fail_page=3))
+
+        api = FakeCardsAPI(total=100)
+        assert self.run_import(api) == (60, 0, 40, True)
+        assert sorted(api.requested_pages) == [1, 2, 3, 4, 5]
+
+    def test_failed_first_page_is_partial(self):
+        assert self.run_import(FakeCardsAPI(total=100, fail_page=1)) == (0, 0, 0, False)
+        assert ImportCheckpoint.objects.get(expansion=self.expansion).status == ImportCheckpoint.STATUS_PARTIAL
+
+
+@pytest.mark.django_db
+class TestImportTelemetry:
+    """Tests de las métricas ImportStep registradas durante una importación"""
+
+    def setup_method(self, method):
+        self.expansion = Expansion.objects.create(api_id='sv1', name='Scarlet & Violet')
+        self.run = ImportRun.objects.create(command='test')
+
+    def run_import(self, api):
+        with mock.patch('collection_manager.api_service.get_client', return_value=fake_client(api)):
+            return import_cards_for_expansion('sv1', page_size=20, run=self.run)
+
+    def test_step_records_requests_bytes_and_rows(self):
+        self.run_import(FakeCardsAPI(total=50))
+
+        step = self.run.steps.get()
+        assert step.expansion == self.expansion
+        assert step.http_requests == 3
+        assert step.bytes_downloaded == 3 * len(b'{}')
+        assert (step.rows_created, step.rows_updated, step.rows_unchanged) == (50, 0, 0)
+        assert step.db_seconds > 0
+        assert step.duration_seconds >= step.db_seconds
+        assert step.error_count == 0
+
+    def test_step_records_partial_fetch_errors(self):
+        self.run_import(FakeCardsAPI(total=100, fail_page=3))
+
+        step = self.run.steps.get()
+        assert step.rows_created == 40
+        assert step.error_count == 1
+        assert step.error.startswith('Partial import')
+
+    def test_import_without_run_records_nothing(self):
+        with mock.patch('collection_manager.api_service.get_client', return_value=fake_client(FakeCardsAPI(total=20))):
+            import_cards_for_expansion('sv1', page_size=20)
+
+        assert not ImportStep.objects.exists()
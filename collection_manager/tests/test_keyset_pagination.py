@@ -0,0 +1,92 @@
+import base64
+import json
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from collection_manager.models import Card, Expansion, UserCard
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+    """Tests de la paginación por cursor opcional de los listados"""
+
+    def setup_method(self, method):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='collector', password='pass123')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+        self.expansion = Expansion.objects.create(api_id='base1', name='Base Set')
+        # Nombres repetidos: el desempate por id no puede saltarse ni repetir cartas
+        names = ['Pikachu', 'Abra', 'Pikachu', 'Zubat', 'Abra', 'Pikachu', 'Machop']
+        self.cards = [
+            Card.objects.create(api_id=f'base1-{i}', name=name, expansion=self.expansion, number=str(i))
+            for i, name in enumerate(names, start=1)
+        ]
+
+    def walk(self, url):
+        """Sigue los enlaces `next` y devuelve todas las páginas"""
+        pages = []
+        while url:
+            response = self.client.get(url)
+            assert response.status_code == 200
+            pages.append(response.data['results'])
+            url = response.data['next']
+        return pages
+
+    def test_without_cursor_the_response_is_the_full_list(self):
+        response = self.client.get('/api/expansions/base1/cards/')
+
+        assert response.status_code == 200
+        assert isinstance(response.json(), list)
+        assert len(response.json()) == 7
+
+    def test_pages_cover_every_card_once_in_name_id_order(self):
+        pages = self.walk('/api/expansions/base1/cards/?page_size=3')
+
+        assert [len(page) for page in pages] == [3, 3, 1]
+        ids = [card['id'] for page in pages for card in page]
+        expected = sorted(self.cards, key=lambda card: (card.name, card.id))
+        assert ids == [card.id for card in expected]
+
+    def test_empty_cursor_starts_at_the_first_page(self):
+        response = self.client.get('/api/expansions/?cursor=')
+
+        assert response.data['next'] is None
+        assert [expansion['api_id'] for expansion in response.data['results']] == ['base1']
+
+    def test_cursor_pages_do_not_use_offset(self):
+        first = self.client.get('/api/expansions/base1/cards/?page_size=2')
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(first.data['next'])
+
+        sql = queries.captured_queries[-1]['sql'].upper()
+        assert 'OFFSET' not in sql
+
+    def test_user_cards_are_paginated_by_id(self):
+        for card in self.cards:
+            UserCard.objects.create(user=self.user, card=card)
+        other = User.objects.create_user(username='other', password='pass123')
+        UserCard.objects.create(user=other, card=self.cards[0])
+
+        pages = self.walk('/api/user-cards/?page_size=4')
+
+        ids = [user_card['id'] for page in pages for user_card in page]
+        assert ids == list(UserCard.objects.filter(user=self.user).order_by('id').values_list('id', flat=True))
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get('/api/expansions/base1/cards/?cursor=not-a-cursor')
+        assert response.status_code == 404
+
+    @pytest.mark.parametrize('values', [['x', 'abc'], ['x', None], ['x', [1]]])
+    def test_cursor_with_values_of_the_wrong_type_returns_404(self, values):
+        cursor = base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+        response = self.client.get(f'/api/expansions/base1/cards/?cursor={cursor}')
+        assert response.status_code == 404
+
+        cursor = base64.urlsafe_b64encode(json.dumps(['abc']).encode()).decode()
+        assert self.client.get(f'/api/user-cards/?cursor={cursor}').status_code == 404
@@ -0,0 +1,191 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from collection_manager.pokemontcg_client import PokemonTCGClient, TokenBucket
+
+
+class StubAPIHandler(BaseHTTPRequestHandler):
+    """Stub local de api.pokemontcg.io: sirve un JSON con ETag y responde 304 a If-None-Match"""
+    protocol_version = 'HTTP/1.1' # keep-alive
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append({
+            'path': self.path,
+            'if_none_match': self.headers.get('If-None-Match'),
+            'client_port': self.client_address[1],
+        })
+        if self.path.startswith('/v2/broken'):
+            self.send_response(500)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        etag = f'"v{server.version}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        body = json.dumps({'data': [{'id': 'base1', 'name': 'Base Set'}], 'version': server.version}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', 'Sat, 09 Jan 1999 00:00:00 GMT')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubAPIHandler)
+    server.requests = []
+    server.version = 1
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_client(server, tmp_path, ttl):
+    return PokemonTCGClient(base_url=f'http://127.0.0.1:{server.server_port}/v2', cache_dir=tmp_path, ttl=ttl)
+
+
+def test_within_ttl_responses_are_served_from_disk(stub_server, tmp_path):
+    client = make_client(stub_server, tmp_path, ttl=3600)
+
+    first = client.get_json('/sets')
+    second = client.get_json('/sets')
+
+    assert first == second
+    assert len(stub_server.requests) == 1
+
+
+def test_expired_entries_are_revalidated_with_etag(stub_server, tmp_path):
+    client = make_client(stub_server, tmp_path, ttl=0)
+
+    first = client.get_json('/sets')
+    second = client.get_json('/sets')
+
+    assert first == second
+    assert [r['if_none_match'] for r in stub_server.requests] == [None, '"v1"']
+
+
+def test_changed_resources_are_downloaded_again(stub_server, tmp_path):
+    client = make_client(stub_server, tmp_path, ttl=0)
+
+    assert client.get_json('/sets')['version'] == 1
+    stub_server.version = 2
+    assert client.get_json('/sets')['version'] == 2
+    assert client.get_json('/sets')['version'] == 2
+
+
+def test_cache_key_includes_params(stub_server, tmp_path):
+    client = make_client(stub_server, tmp_path, ttl=3600)
+
+    client.get_json('/cards', params={'q': 'set.id:base1', 'page': 1})
+    client.get_json('/cards', params={'page': 1, 'q': 'set.id:base1'})
+    client.get_json('/cards', params={'q': 'set.id:base1', 'page': 2})
+
+    assert len(stub_server.requests) == 2
+
+
+def test_cache_is_shared_between_client_instances(stub_server, tmp_path):
+    make_client(stub_server, tmp_path, ttl=3600).get_json('/sets')
+    make_client(stub_server, tmp_path, ttl=3600).get_json('/sets')
+
+    assert len(stub_server.requests) == 1
+
+
+def test_http_errors_raise_request_exception(stub_server, tmp_path):
+    client = make_client(stub_server, tmp_path, ttl=3600)
+
+    with pytest.raises(requests.exceptions.RequestException):
+        client.get_json('/broken')
+
+
+def test_connections_are_reused(stub_server):
+    client = PokemonTCGClient(base_url=f'http://127.0.0.1:{stub_server.server_port}/v2')
+
+    for _ in range(3):
+        client.get_json('/sets')
+
+    assert len({r['client_port'] for r in stub_server.requests}) == 1
+
+
+class FlakyHandler(StubAPIHandler):
+    """Responde 429 (con Retry-After) o 503 a las primeras peticiones y luego delega en el stub normal"""
+
+    def do_GET(self):
+        server = self.server
+        if server.failures:
+            status, retry_after = server.failures.pop(0)
+            server.requests.append({'path': self.path, 'status': status})
+            self.send_response(status)
+            if retry_after is not None:
+                self.send_header('Retry-After', str(retry_after))
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        super().do_GET()
+
+
+@pytest.fixture
+def flaky_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FlakyHandler)
+    server.requests = []
+    server.version = 1
+    server.failures = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_429_and_5xx_are_retried_with_backoff(flaky_server):
+    flaky_server.failures = [(429, 3), (503, None)]
+    sleeps = []
+    client = PokemonTCGClient(base_url=f'http://127.0.0.1:{flaky_server.server_port}/v2',
+                              max_retries=3, backoff_base=0.5, sleep=sleeps.append)
+
+    assert client.get_json('/sets')['data'][0]['id'] == 'base1'
+    assert len(flaky_server.requests) == 3
+    assert sleeps[0] == 3 # Retry-After
+    assert 0 <= sleeps[1] <= 1.0 # backoff_base * 2 ** 1 con jitter
+
+
+def test_gives_up_after_max_retries(flaky_server):
+    flaky_server.failures = [(503, None)] * 5
+    client = PokemonTCGClient(base_url=f'http://127.0.0.1:{flaky_server.server_port}/v2',
+                              max_retries=2, sleep=lambda seconds: None)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.get_json('/sets')
+    assert len(flaky_server.requests) == 3
+
+
+def test_token_bucket_limits_request_rate():
+    now = [0.0]
+    sleeps = []
+
+    def fake_sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    bucket = TokenBucket(rate=2, capacity=2, clock=lambda: now[0], sleep=fake_sleep)
+    for _ in range(6):
+        bucket.acquire()
+
+    # 2 de ráfaga y luego 4 más a 2 por segundo
+    assert now[0] == pytest.approx(2.0)
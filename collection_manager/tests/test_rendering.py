@@ -0,0 +1,108 @@
+import gzip
+import json
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from rest_framework.renderers import JSONRenderer
+from collection_manager.middleware import CompressionMiddleware
+from collection_manager.renderers import ORJSONRenderer
+
+
+def test_orjson_renderer_matches_drf_json_renderer():
+    data = [{'name': 'Pokémon Trainer', 'hp': None, 'types': ['Fire'], 'quantity': 3, 'flavor': 'a b'}]
+
+    assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+def test_orjson_renderer_handles_types_drf_encodes():
+    data = {'price': Decimal('1.50')}
+
+    assert json.loads(ORJSONRenderer().render(data)) == json.loads(JSONRenderer().render(data))
+
+
+def test_orjson_renderer_delegates_indented_output():
+    rendered = ORJSONRenderer().render({'a': 1}, 'application/json; indent=4', {})
+
+    assert rendered == JSONRenderer().render({'a': 1}, 'application/json; indent=4', {})
+    assert ORJSONRenderer().render(None) == b''
+
+
+def compress(content, accept_encoding, etag=None, cache_control=None, **headers):
+    request = RequestFactory().get('/api/user-cards/', HTTP_ACCEPT_ENCODING=accept_encoding, **headers)
+    response = HttpResponse(content, content_type='application/json')
+    if etag:
+        response['ETag'] = etag
+    if cache_control:
+        response['Cache-Control'] = cache_control
+    return CompressionMiddleware(lambda request: response)(request)
+
+
+@override_settings(RESPONSE_COMPRESSION_MIN_BYTES=1024)
+def test_small_responses_are_not_compressed():
+    response = compress(b'[' + b'1,' * 100 + b'1]', 'gzip, br')
+
+    assert not response.has_header('Content-Encoding')
+
+
+@override_settings(RESPONSE_COMPRESSION_MIN_BYTES=1024)
+def test_large_responses_are_gzipped_with_weak_etag(monkeypatch):
+    monkeypatch.setattr('collection_manager.middleware.brotli', None)
+    body = json.dumps([{'name': f'Card {i}', 'language': 'EN'} for i in range(200)]).encode()
+
+    response = compress(body, 'gzip, br', etag='"catalog-v1-json"')
+
+    assert response['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.content) == body
+    assert response['ETag'] == 'W/"catalog-v1-json"'
+    assert 'Accept-Encoding' in response['Vary']
+
+
+@override_settings(RESPONSE_COMPRESSION_MIN_BYTES=1024)
+def test_large_responses_prefer_brotli():
+    brotli = pytest.importorskip('brotli')
+    body = json.dumps([{'name': f'Card {i}', 'language': 'EN'} for i in range(200)]).encode()
+
+    response = compress(body, 'gzip, deflate, br')
+
+    assert response['Content-Encoding'] == 'br'
+    assert brotli.decompress(response.content) == body
+
+
+@override_settings(RESPONSE_COMPRESSION_MIN_BYTES=1024)
+def test_authenticated_responses_use_padded_gzip_instead_of_brotli(monkeypatch):
+    fake_brotli = mock.Mock()
+    monkeypatch.setattr('collection_manager.middleware.brotli', fake_brotli)
+    body = json.dumps([{'name': f'Card {i}', 'language': 'EN'} for i in range(200)]).encode()
+
+    private = compress(body, 'gzip, br', HTTP_AUTHORIZATION='Bearer token')
+    with_cookie = compress(body, 'gzip, br', HTTP_COOKIE='sessionid=abc')
+
+    assert private['Content-Encoding'] == with_cookie['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(private.content) == body
+    assert not fake_brotli.compress.called
+
+
+@override_settings(RESPONSE_COMPRESSION_MIN_BYTES=1024)
+def test_public_responses_keep_brotli_for_authenticated_clients():
+    brotli = pytest.importorskip('brotli')
+    body = json.dumps([{'name': f'Card {i}', 'language': 'EN'} for i in range(200)]).encode()
+
+    response = compress(body, 'br', cache_control='public, max-age=60', HTTP_AUTHORIZATION='Bearer token')
+
+    assert response['Content-Encoding'] == 'br'
+    assert brotli.decompress(response.content) == body
+
+
+@pytest.mark.django_db
+def test_benchmark_rendering_command():
+    out = StringIO()
+    call_command('benchmark_rendering', '--rows', '30', '--repeat', '1', stdout=out)
+
+    output = out.getvalue()
+    assert 'render orjson' in output and 'gzip' in output
+    assert 'user-cards/grouped' in output
@@ -0,0 +1,115 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from collection_manager.api_service import save_cards_to_db
+from collection_manager.collection_stats import decode_bitmap
+from collection_manager.completion import collector_number_key
+from collection_manager.models import Card, Expansion, UserCard, UserExpansionStats
+
+User = get_user_model()
+
+
+def test_collector_number_order():
+    numbers = ['SV10', '10a', 'H1', '2', None, '10', 'SV2']
+    assert sorted(numbers, key=collector_number_key) == ['2', '10', '10a', 'H1', 'SV2', 'SV10', None]
+
+
+@pytest.mark.django_db
+class TestSetCompletion:
+    """Bitmaps de compleción por expansión y endpoints /api/user-completion/"""
+
+    def setup_method(self, method):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='collector', password='pass123')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+        self.base = Expansion.objects.create(api_id='base1', name='Base Set')
+        self.jungle = Expansion.objects.create(api_id='base2', name='Jungle')
+        save_cards_to_db([
+            {'id': 'base1-10', 'name': 'Mewtwo', 'number': '10'},
+            {'id': 'base1-2', 'name': 'Blastoise', 'number': '2'},
+            {'id': 'base1-4', 'name': 'Charizard', 'number': '4'},
+        ], self.base, bulk=True)
+        save_cards_to_db([
+            {'id': 'base2-11', 'name': 'Snorlax', 'number': '11'},
+            {'id': 'base2-60', 'name': 'Pikachu', 'number': '60'},
+        ], self.jungle, bulk=True)
+
+    def card(self, api_id):
+        return Card.objects.get(api_id=api_id)
+
+    def bitmap(self, expansion):
+        return decode_bitmap(UserExpansionStats.objects.get(user=self.user, expansion=expansion).owned_bitmap)
+
+    def test_import_assigns_positions_by_collector_number(self):
+        positions = dict(Card.objects.filter(expansion=self.base).values_list('api_id', 'set_position'))
+        assert positions == {'base1-2': 0, 'base1-4': 1, 'base1-10': 2}
+
+    def test_bitmap_follows_collection_changes(self):
+        UserCard.objects.create(user=self.user, card=self.card('base1-10'))
+        spanish = UserCard.objects.create(user=self.user, card=self.card('base1-2'), language='ES')
+        assert self.bitmap(self.base) == 0b101
+
+        spanish.delete()
+        assert self.bitmap(self.base) == 0b100
+
+    def test_expansion_lists_owned_and_missing_cards(self):
+        UserCard.objects.create(user=self.user, card=self.card('base1-4'), quantity=2)
+
+        response = self.client.get('/api/user-completion/base1/')
+
+        assert response.status_code == 200
+        assert (response.data['total'], response.data['owned_count'], response.data['completion']) == (3, 1, 33.33)
+        assert [card['api_id'] for card in response.data['owned']] == ['base1-4']
+        assert [card['api_id'] for card in response.data['missing']] == ['base1-2', 'base1-10']
+        assert self.client.get('/api/user-completion/nope/').status_code == 404
+
+    def test_all_sets_in_one_call(self):
+        UserCard.objects.create(user=self.user, card=self.card('base2-11'))
+        UserCard.objects.create(user=self.user, card=self.card('base2-60'))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/user-completion/')
+
+        assert len(queries) <= 3 # usuario (JWT), bitmaps y resumen del catálogo
+        completion = {row['expansion_api_id']: (row['owned'], row['total'], row['completion']) for row in response.data}
+        assert completion == {'base1': (0, 3, 0.0), 'base2': (2, 2, 100.0)}
+        started = self.client.get('/api/user-completion/?started=true').data
+        assert [row['expansion_api_id'] for row in started] == ['base2']
+
+    def test_new_card_shifts_positions_and_rebuilds_bitmaps(self):
+        UserCard.objects.create(user=self.user, card=self.card('base1-10'))
+        assert self.bitmap(self.base) == 0b100
+
+        save_cards_to_db([{'id': 'base1-3', 'name': 'Venusaur', 'number': '3'}], self.base, bulk=True)
+
+        assert self.card('base1-10').set_position == 3
+        assert self.bitmap(self.base) == 0b1000
+
+    def test_card_created_outside_imports_gets_a_position(self):
+        self.client.get('/api/user-completion/base1/') # Cartas de la expansión en caché
+        promo = Card.objects.create(api_id='base1-102', name='Mew', expansion=self.base, number='102')
+        UserCard.objects.create(user=self.user, card=promo)
+
+        assert self.card('base1-102').set_position == 3
+        assert self.bitmap(self.base) == 0b1000
+        response = self.client.get('/api/user-completion/base1/')
+        assert (response.data['total'], response.data['owned_count']) == (4, 1)
+        assert [card['api_id'] for card in response.data['owned']] == ['base1-102']
+        summary = {row['expansion_api_id']: row['total'] for row in self.client.get('/api/user-completion/').data}
+        assert summary == {'base1': 4, 'base2': 2}
+
+    def test_deleted_card_leaves_a_gap_without_shifting_owned_cards(self):
+        UserCard.objects.create(user=self.user, card=self.card('base1-10'))
+        self.card('base1-4').delete() # Posición 1 libre hasta la siguiente importación
+        promo = Card.objects.create(api_id='base1-102', name='Mew', expansion=self.base, number='102')
+        UserCard.objects.create(user=self.user, card=promo)
+
+        assert promo.set_position == 3
+        response = self.client.get('/api/user-completion/base1/')
+        assert (response.data['total'], response.data['owned_count']) == (3, 2)
+        assert [card['api_id'] for card in response.data['owned']] == ['base1-10', 'base1-102']
+        assert [card['api_id'] for card in response.data['missing']] == ['base1-2']
+        summary = {row['expansion_api_id']: (row['owned'], row['total']) for row in self.client.get('/api/user-completion/').data}
+        assert summary['base1'] == (2, 3)
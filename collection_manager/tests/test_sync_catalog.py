@@ -0,0 +1,126 @@
+import threading
+from io import StringIO
+from unittest import mock
+
+import pytest
+import requests
+from django.core.management import call_command
+from django.utils import timezone
+from collection_manager.api_service import ImportResult, import_all_expansions_cards
+from collection_manager.models import ImportRun
+
+
+def fake_import(api_id, resume=False, run=None):
+    """Simula import_cards_for_expansion: 'broken' falla, 'missing' no existe en la BD, 'jungle' queda a medias"""
+    if api_id == 'broken':
+        raise RuntimeError('upstream exploded')
+    if api_id == 'missing':
+        return None
+    return ImportResult(2, 1, 4, api_id != 'jungle')
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_failures_are_collected_without_stopping_the_run(workers):
+    with mock.patch('collection_manager.api_service.import_cards_for_expansion', side_effect=fake_import):
+        summary = import_all_expansions_cards(
+            workers=workers, expansion_api_ids=['base1', 'broken', 'jungle', 'missing', 'fossil']
+        )
+
+    assert summary['expansions'] == 5
+    assert summary['created'] == 6
+    assert summary['updated'] == 3
+    assert summary['unchanged'] == 12
+    assert summary['partial'] == ['jungle']
+    assert summary['failed'] == {
+        'broken': 'upstream exploded',
+        'missing': 'Expansion not found in database',
+    }
+
+
+def test_worker_pool_is_bounded():
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+    release = threading.Event()
+
+    def slow_import(api_id, resume=False, run=None):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        release.wait(0.05)
+        with lock:
+            active -= 1
+        return ImportResult(0, 0, 0, True)
+
+    with mock.patch('collection_manager.api_service.import_cards_for_expansion', side_effect=slow_import):
+        summary = import_all_expansions_cards(workers=3, expansion_api_ids=[f'set{i}' for i in range(12)])
+
+    assert summary['failed'] == {}
+    assert 1 < peak <= 3
+
+
+@pytest.mark.django_db
+def test_sync_catalog_command_reports_failures():
+    out = StringIO()
+    with mock.patch('collection_manager.api_service.import_cards_for_expansion', side_effect=fake_import):
+        call_command('sync_catalog', '--workers', '2', '--skip-expansions',
+                     '--expansions', 'base1', 'broken', 'jungle', stdout=out)
+
+    output = out.getvalue()
+    assert '2/3 expansiones sincronizadas' in output
+    assert 'parcialmente (usa --resume para continuar): jungle' in output
+    assert 'broken: upstream exploded' in output
+    assert 'import_stats --run' in output
+
+    run = ImportRun.objects.get()
+    assert run.command == 'sync_catalog'
+    assert run.status == ImportRun.STATUS_PARTIAL
+    assert run.finished_at is not None
+
+
+@pytest.mark.django_db
+def test_import_stats_lists_slowest_steps():
+    run = ImportRun.objects.create(command='sync_catalog', status=ImportRun.STATUS_SUCCESS)
+    run.steps.create(name='base1', started_at=timezone.now(), duration_seconds=1.5, http_requests=1, rows_created=102, rows_per_second=68)
+    run.steps.create(name='sv1', started_at=timezone.now(), duration_seconds=9.0, http_requests=2, rows_created=258, bytes_downloaded=4096)
+
+    out = StringIO()
+    call_command('import_stats', '--limit', '1', stdout=out)
+
+    output = out.getvalue()
+    assert f'sync_catalog #{run.pk}' in output
+    assert 'sv1' in output and '4KB' in output
+    assert 'base1' not in output
+
+
+@pytest.mark.django_db
+def test_load_commands_record_import_runs():
+    client = mock.Mock()
+    client.get_json.side_effect = [
+        {'data': [{'id': 'base1', 'name': 'Base', 'releaseDate': '1999/01/09'}]},
+        {'data': [{'id': 'base1-4', 'name': 'Charizard', 'number': '4'}]},
+    ]
+    with mock.patch('collection_manager.management.commands.load_expansions.get_client', return_value=client), \
+            mock.patch('collection_manager.management.commands.load_cards_by_expansion.get_client', return_value=client):
+        call_command('load_expansions', stdout=StringIO())
+        call_command('load_cards_by_expansion', 'base1', stdout=StringIO())
+
+    expansions_run, cards_run = ImportRun.objects.order_by('pk')
+    assert (expansions_run.command, expansions_run.status) == ('load_expansions', ImportRun.STATUS_SUCCESS)
+    assert expansions_run.steps.get().rows_created == 1
+    step = cards_run.steps.get()
+    assert (cards_run.command, cards_run.status) == ('load_cards_by_expansion', ImportRun.STATUS_SUCCESS)
+    assert (step.expansion.api_id, step.rows_created) == ('base1', 1)
+
+
+@pytest.mark.django_db
+def test_load_command_failure_marks_the_run_failed():
+    client = mock.Mock()
+    client.get_json.side_effect = requests.ConnectionError('offline')
+    with mock.patch('collection_manager.management.commands.load_expansions.get_client', return_value=client):
+        call_command('load_expansions', stdout=StringIO())
+
+    run = ImportRun.objects.get()
+    assert run.status == ImportRun.STATUS_FAILED
+    assert run.steps.get().error == 'offline'
@@ -0,0 +1,62 @@
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from collection_manager.catalog_version import bump_catalog_version
+from collection_manager.models import Card, Expansion
+from collection_manager.typeahead import PrefixIndex
+
+
+def test_prefix_index_matches_name_and_word_prefixes():
+    index = PrefixIndex([
+        ('Charizard', 'charizard'), ('Dark Charizard', 'dark-charizard'),
+        ('Charmander', 'charmander'), ('Flabébé', 'flabebe'), ('Pikachu', 'pikachu'),
+    ])
+
+    assert index.search('chari', 10) == ['charizard', 'dark-charizard']
+    assert index.search('CHAR', 3) == ['charizard', 'dark-charizard', 'charmander']
+    assert index.search('dark  char', 10) == ['dark-charizard']
+    assert index.search('flabe', 10) == ['flabebe']
+    assert index.search('', 10) == []
+    assert index.search('zzz', 10) == []
+
+
+@pytest.mark.django_db
+class TestTypeaheadView:
+    """Tests del endpoint /api/typeahead/"""
+
+    def setup_method(self, method):
+        self.client = APIClient()
+        base = Expansion.objects.create(api_id='base1', name='Base Set', series='Base')
+        Card.objects.create(api_id='base1-4', name='Charizard', expansion=base, number='4')
+        Card.objects.create(api_id='base1-46', name='Charmander', expansion=base, number='46')
+
+    def test_suggests_cards_and_expansions(self):
+        data = self.client.get('/api/typeahead/?q=ba').data
+        assert [expansion['api_id'] for expansion in data['expansions']] == ['base1']
+        assert data['cards'] == []
+
+        data = self.client.get('/api/typeahead/?q=char&limit=1&kind=cards').data
+        assert data['cards'] == [{'id': data['cards'][0]['id'], 'api_id': 'base1-4', 'name': 'Charizard',
+                                  'number': '4', 'image_url_small': None, 'expansion_name': 'Base Set'}]
+        assert data['expansions'] == []
+
+    def test_lookups_do_not_query_the_database(self):
+        self.client.get('/api/typeahead/?q=c')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/typeahead/?q=cha')
+
+        assert len(response.data['cards']) == 2
+        assert len(queries) == 0
+
+    @override_settings(TYPEAHEAD_VERSION_CHECK_SECONDS=0)
+    def test_index_is_rebuilt_when_the_catalog_version_changes(self):
+        assert len(self.client.get('/api/typeahead/?q=char').data['cards']) == 2
+
+        Card.objects.create(api_id='base1-99', name='Charmeleon', expansion=Expansion.objects.get())
+        assert len(self.client.get('/api/typeahead/?q=char').data['cards']) == 2
+
+        bump_catalog_version()
+        assert len(self.client.get('/api/typeahead/?q=char').data['cards']) == 3
@@ -0,0 +1,95 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from collection_manager.models import Card, Expansion, UserCard
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestUserCardsBulk:
+    """Tests del endpoint /api/user-cards/bulk/"""
+
+    def setup_method(self, method):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='collector', password='pass123')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+        expansion = Expansion.objects.create(api_id='base1', name='Base Set')
+        self.charizard = Card.objects.create(api_id='base1-4', name='Charizard', expansion=expansion)
+        self.pikachu = Card.objects.create(api_id='base1-58', name='Pikachu', expansion=expansion)
+
+    def bulk(self, *operations):
+        return self.client.post('/api/user-cards/bulk/', {'operations': list(operations)}, format='json')
+
+    def test_add_increments_existing_variants(self):
+        existing = UserCard.objects.create(user=self.user, card=self.charizard, quantity=1)
+
+        response = self.bulk(
+            {'op': 'add', 'card': self.charizard.id, 'quantity': 2},
+            {'op': 'add', 'card': self.charizard.id},
+            {'op': 'add', 'card': self.pikachu.id, 'language': 'JP', 'is_holographic': True},
+        )
+
+        assert response.status_code == 200
+        existing.refresh_from_db()
+        assert existing.quantity == 4
+        pikachu = UserCard.objects.get(card=self.pikachu)
+        assert (pikachu.quantity, pikachu.language, pikachu.is_holographic) == (1, 'JP', True)
+        assert response.data['added'] == sorted([existing.id, pikachu.id])
+
+    def test_mixed_operations_in_a_few_statements(self):
+        keep = UserCard.objects.create(user=self.user, card=self.charizard, quantity=1)
+        gone = UserCard.objects.create(user=self.user, card=self.pikachu, quantity=1)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.bulk(
+                {'op': 'update', 'id': keep.id, 'quantity': 5, 'is_favorite': True},
+                {'op': 'delete', 'id': gone.id},
+                *[{'op': 'add', 'card': self.pikachu.id, 'language': language}
+                  for language in ('EN', 'ES', 'FR', 'DE', 'IT')],
+            )
+
+        assert response.status_code == 200
+        assert response.data['updated'] == [keep.id]
+        assert response.data['deleted'] == [gone.id]
+        assert len(response.data['added']) == 5
+        keep.refresh_from_db()
+        assert (keep.quantity, keep.is_favorite) == (5, True)
+        assert not UserCard.objects.filter(id=gone.id).exists()
+        # auth + card check + owned rows + update + delete + insert, y el recálculo de estadísticas
+        # (collection_stats) una sola vez: no crece con el número de operaciones
+        assert len([q for q in queries if 'SAVEPOINT' not in q['sql']]) <= 14
+
+    def test_errors_roll_back_everything(self):
+        other = User.objects.create_user(username='other', password='pass123')
+        foreign = UserCard.objects.create(user=other, card=self.charizard)
+
+        response = self.bulk(
+            {'op': 'add', 'card': self.pikachu.id},
+            {'op': 'delete', 'id': foreign.id},
+        )
+
+        assert response.status_code == 400
+        assert not UserCard.objects.filter(user=self.user).exists()
+        assert UserCard.objects.filter(id=foreign.id).exists()
+
+    def test_conflicting_update_is_a_400(self):
+        UserCard.objects.create(user=self.user, card=self.charizard, language='EN')
+        spanish = UserCard.objects.create(user=self.user, card=self.charizard, language='ES')
+
+        response = self.bulk({'op': 'update', 'id': spanish.id, 'language': 'EN'})
+
+        assert response.status_code == 400
+        spanish.refresh_from_db()
+        assert spanish.language == 'ES'
+
+    def test_invalid_operations_return_400(self):
+        assert self.bulk().status_code == 400
+        assert self.bulk({'op': 'add'}).status_code == 400
+        assert self.bulk({'op': 'delete'}).status_code == 400
+        assert self.bulk({'op': 'add', 'card': 999999}).status_code == 400
+        assert self.bulk({'op': 'add', 'card': self.pikachu.id, 'language': 'XX'}).status_code == 400
+        assert self.client.post('/api/user-cards/bulk/', {}, format='json').status_code == 400
@@ -215,4 +215,26 @@ class TestUserCardsGroupedView:
         
         # Base Set debería venir antes que Jungle (alfabéticamente)
         # Y dentro de la misma expansión, por nombre de carta
-        assert len(response.data) >= 2
\ No newline at end of file
+        assert len(response.data) >= 2
+
+    def test_grouped_cards_filter_by_expansion(self):
+        """T9: ?expansion_id= devuelve solo los grupos de esa expansión"""
+        response = self.client.get(f'/api/user-cards/grouped/?expansion_id={self.expansion2.id}')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [group['card_name'] for group in response.data] == ['Vileplume']
+        assert self.client.get('/api/user-cards/grouped/?expansion_id=abc').status_code == 400
+
+    def test_grouped_cards_pagination(self):
+        """T10: con ?page= se pagina por grupos"""
+        response = self.client.get('/api/user-cards/grouped/?page=1&page_size=1')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['count'] == 2
+        assert [group['card_name'] for group in response.data['results']] == ['Charizard']
+        assert response.data['results'][0]['is_any_favorite'] is True
+        assert response.data['next'] is not None
+
+        second = self.client.get('/api/user-cards/grouped/?page=2&page_size=1')
+        assert [group['card_name'] for group in second.data['results']] == ['Vileplume']
+        assert second.data['results'][0]['instances'][0]['is_favorite'] is False
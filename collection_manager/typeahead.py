@@ -0,0 +1,128 @@
+# pokemon_tcg_tracker_project/collection_manager/typeahead.py
+"""
+Índice en memoria para el autocompletado de nombres de cartas y expansiones.
+
+Cada proceso guarda una lista ordenada de claves normalizadas (minúsculas, sin acentos) y busca
+los prefijos con bisect, así una pulsación de tecla se resuelve en microsegundos sin ir a la BD.
+Se indexa el nombre completo y cada palabra a partir de la segunda, de modo que "chari"
+encuentra "Dark Charizard".
+
+El índice se construye al arrancar el worker (wsgi.py) o en la primera petición, y se reconstruye
+cuando cambia la versión del catálogo (catalog_version). La versión se comprueba como mucho cada
+TYPEAHEAD_VERSION_CHECK_SECONDS; mientras un hilo reconstruye, los demás siguen usando el índice anterior.
+"""
+import logging
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+
+from django.conf import settings
+
+from .catalog_version import get_catalog_version
+from .models import Card, Expansion
+
+logger = logging.getLogger(__name__)
+
+
+def normalize(text):
+    """Minúsculas y sin acentos: 'Pokémon' -> 'pokemon'"""
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def _name_keys(name):
+    """Clave del nombre completo y de cada sufijo que empieza en una palabra"""
+    words = normalize(name).split()
+    return [' '.join(words[i:]) for i in range(len(words))]
+
+
+class PrefixIndex:
+    """Lista ordenada de (clave, entrada) con búsqueda de prefijos por bisect"""
+
+    def __init__(self, entries):
+        pairs = sorted(
+            (key, position) for position, (name, _) in enumerate(entries) for key in _name_keys(name)
+        )
+        self.keys = [key for key, _ in pairs]
+        self.positions = [position for _, position in pairs]
+        self.entries = [entry for _, entry in entries]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def search(self, prefix, limit):
+        """Hasta `limit` entradas cuyo nombre (o una de sus palabras) empieza por `prefix`"""
+        prefix = ' '.join(normalize(prefix).split())
+        if not prefix:
+            return []
+        results, seen = [], set()
+        start = bisect_left(self.keys, prefix)
+        for i in range(start, len(self.keys)):
+            if not self.keys[i].startswith(prefix) or len(results) >= limit:
+                break
+            position = self.positions[i]
+            if position not in seen:
+                seen.add(position)
+                results.append(self.entries[position])
+        return results
+
+
+class CatalogTypeahead:
+    """Índices de cartas y expansiones de una versión del catálogo"""
+
+    def __init__(self, version):
+        self.version = version
+        self.expansions = PrefixIndex([
+            (name, {'id': pk, 'api_id': api_id, 'name': name, 'series': series})
+            for pk, api_id, name, series in Expansion.objects.values_list('id', 'api_id', 'name', 'series').iterator()
+        ])
+        self.cards = PrefixIndex([
+            (name, {'id': pk, 'api_id': api_id, 'name': name, 'number': number,
+                    'image_url_small': image, 'expansion_name': expansion_name})
+            for pk, api_id, name, number, image, expansion_name in Card.objects.values_list(
+                'id', 'api_id', 'name', 'number', 'image_url_small', 'expansion__name'
+            ).iterator(chunk_size=5000)
+        ])
+
+
+_lock = threading.Lock()
+_current = None
+_checked_at = 0.0
+
+
+def _check_interval():
+    return getattr(settings, 'TYPEAHEAD_VERSION_CHECK_SECONDS', 5)
+
+
+def get_typeahead():
+    """Índice de la versión actual del catálogo (lo construye o reconstruye si hace falta)"""
+    global _current, _checked_at
+    current = _current
+    if current is not None and time.monotonic() - _checked_at < _check_interval():
+        return current
+
+    # Si ya hay un índice y otro hilo está reconstruyendo, se sirve el anterior
+    if not _lock.acquire(blocking=current is None):
+        return current
+    try:
+        if _current is None or time.monotonic() - _checked_at >= _check_interval():
+            version, _ = get_catalog_version()
+            if _current is None or _current.version != version:
+                start = time.perf_counter()
+                _current = CatalogTypeahead(version)
+                logger.info(
+                    f"Typeahead index built for catalog v{version}: {len(_current.cards)} cards, "
+                    f"{len(_current.expansions)} expansions in {time.perf_counter() - start:.2f}s"
+                )
+            _checked_at = time.monotonic()
+        return _current
+    finally:
+        _lock.release()
+
+
+def reset_typeahead():
+    """Descarta el índice del proceso (tests)"""
+    global _current, _checked_at
+    with _lock:
+        _current, _checked_at = None, 0.0
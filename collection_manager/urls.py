@@ -4,23 +4,37 @@ from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from .views import (
     ExpansionListView, CardListView, UserCardCreateView, UserCardListView, 
     CardDetailView, RegisterView, UserCardDetailView, UserExpansionsView,
-    UserCardsGroupedView  
+    UserCardsGroupedView, CardSearchView, CardFilterView, CardBatchView,
+    TypeaheadView, UserCardBulkView, UserCollectionStatsView, UserExpansionStatsView,
+    UserCompletionView, UserExpansionCompletionView, UserCardExportView
 )
 
 urlpatterns = [
     path('expansions/', ExpansionListView.as_view(), name='expansion-list'),
     path('user-expansions/', UserExpansionsView.as_view(), name='user-expansions'),
     path('expansions/<str:expansion_api_id>/cards/', CardListView.as_view(), name='cards-by-expansion'),
+    path('cards/search/', CardSearchView.as_view(), name='card-search'), # Antes de cards/<api_id>/
+    path('cards/filter/', CardFilterView.as_view(), name='card-filter'),
+    path('cards/batch/', CardBatchView.as_view(), name='card-batch'),
+    path('typeahead/', TypeaheadView.as_view(), name='typeahead'),
     path('cards/<str:api_id>/', CardDetailView.as_view(), name='card-detail'),
 
     # URLs para la colección del usuario
     path('user-cards/add/', UserCardCreateView.as_view(), name='usercard-add'),
+    path('user-cards/bulk/', UserCardBulkView.as_view(), name='usercard-bulk'),
+    path('user-cards/export/<str:export_format>/', UserCardExportView.as_view(), name='usercard-export'),
     path('user-cards/', UserCardListView.as_view(), name='usercard-list'),
     path('user-cards/<int:pk>/', UserCardDetailView.as_view(), name='usercard-detail'),
     
     # Endpoint para cartas agrupadas
     path('user-cards/grouped/', UserCardsGroupedView.as_view(), name='user-cards-grouped'),
 
+    # Estadísticas precalculadas de la colección
+    path('user-stats/', UserCollectionStatsView.as_view(), name='user-stats'),
+    path('user-stats/expansions/', UserExpansionStatsView.as_view(), name='user-expansion-stats'),
+    path('user-completion/', UserCompletionView.as_view(), name='user-completion'),
+    path('user-completion/<str:expansion_api_id>/', UserExpansionCompletionView.as_view(), name='user-expansion-completion'),
+
     path('register/', RegisterView.as_view(), name='auth_register'),
     path('token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
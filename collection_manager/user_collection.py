@@ -0,0 +1,220 @@
+# pokemon_tcg_tracker_project/collection_manager/user_collection.py
+"""
+Escrituras en bloque sobre la colección de un usuario (UserCard).
+
+apply_operations() aplica una lista de operaciones add/update/delete en una sola transacción:
+- add: INSERT ... ON CONFLICT (user, card, language, is_holographic, is_first_edition, condition)
+  DO UPDATE quantity = quantity + excluded.quantity, así añadir una variante que ya existe suma
+  copias en lugar de fallar por el unique_together. Una sentencia por cada ADD_BATCH_SIZE filas.
+- update: una lectura de las filas del usuario y un bulk_update por cada combinación de campos.
+- delete: un único DELETE.
+Todo se valida antes de escribir (cartas existentes, filas del usuario); si algo falla no se aplica nada.
+Las estadísticas de la colección (collection_stats) se recalculan una vez, en la misma transacción.
+
+grouped_user_cards() agrupa la colección por carta en SQL (GROUP BY card_id con las instancias
+agregadas en un array JSON) para UserCardsGroupedView.
+
+annotate_owned() añade a un queryset de cartas lo que el usuario tiene de cada una (copias,
+variantes, favorita) con un LEFT JOIN a sus UserCards y GROUP BY carta, en la misma consulta.
+"""
+from collections import Counter
+
+from django.contrib.postgres.aggregates import BoolOr, JSONBAgg
+from django.db import connection, transaction
+from django.db.models import Aggregate, Count, F, FilteredRelation, JSONField, Max, Q, Sum
+from django.db.models.functions import Coalesce, JSONObject
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .collection_stats import batch_collection_stats, mark_changed
+from .models import Card, UserCard
+
+ADD_BATCH_SIZE = 500
+
+# Columnas que identifican una variante (unique_together de UserCard)
+VARIANT_COLUMNS = ['user_id', 'card_id', 'language', 'is_holographic', 'is_first_edition', 'condition']
+ADD_FIELDS = ['quantity', 'language', 'is_holographic', 'condition', 'is_first_edition',
+              'is_signed', 'grade', 'notes', 'is_favorite']
+
+
+def _field_default(name):
+    return UserCard._meta.get_field(name).get_default()
+
+
+def _add_rows(user, operations):
+    """
+    Filas a insertar, una por variante: varias operaciones sobre la misma variante se suman
+    (ON CONFLICT no puede tocar la misma fila dos veces en una sentencia).
+    """
+    rows = {}
+    for operation in operations:
+        row = {'user_id': user.pk, 'card_id': operation['card']}
+        for name in ADD_FIELDS:
+            row[name] = operation[name] if name in operation else _field_default(name)
+        key = tuple(row[column] for column in VARIANT_COLUMNS)
+        if key in rows:
+            rows[key]['quantity'] += row['quantity']
+        else:
+            rows[key] = row
+    return list(rows.values())
+
+
+def upsert_user_cards(rows):
+    """
+    INSERT ... ON CONFLICT DO UPDATE que suma las cantidades de las variantes existentes.
+    Devuelve los ids de las filas insertadas o incrementadas.
+    """
+    if not rows:
+        return []
+    quote = connection.ops.quote_name
+    table = quote(UserCard._meta.db_table)
+    now = timezone.now()
+    columns = ['user_id', 'card_id', *ADD_FIELDS, 'created_at', 'updated_at']
+    fields = [UserCard._meta.get_field(column) for column in columns]
+
+    ids = []
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), ADD_BATCH_SIZE):
+            batch = rows[start:start + ADD_BATCH_SIZE]
+            values = ', '.join(['(' + ', '.join(['%s'] * len(columns)) + ')'] * len(batch))
+            params = [
+                field.get_db_prep_save(row.get(column, now), connection)
+                for row in batch
+                for column, field in zip(columns, fields)
+            ]
+            cursor.execute(
+                f"INSERT INTO {table} ({', '.join(quote(column) for column in columns)}) VALUES {values} "
+                f"ON CONFLICT ({', '.join(quote(column) for column in VARIANT_COLUMNS)}) DO UPDATE SET "
+                f"{quote('quantity')} = {table}.{quote('quantity')} + excluded.{quote('quantity')}, "
+                f"{quote('updated_at')} = excluded.{quote('updated_at')} "
+                f"RETURNING {quote('id')}",
+                params,
+            )
+            ids.extend(row[0] for row in cursor.fetchall())
+    return sorted(ids)
+
+
+def _owned(user, ids):
+    """UserCards del usuario por id; error si alguno no existe o es de otro usuario"""
+    owned = UserCard.objects.filter(user=user).in_bulk(ids)
+    missing = [pk for pk in ids if pk not in owned]
+    if missing:
+        raise ValidationError({'operations': f"UserCards no encontradas: {', '.join(map(str, missing))}."})
+    return owned
+
+
+def apply_operations(user, operations):
+    """
+    Aplica operaciones ya validadas (UserCardOperationSerializer) en una transacción.
+    Devuelve {'added': [...], 'updated': [...], 'deleted': [...]} con los ids afectados.
+    """
+    adds = [operation for operation in operations if operation['op'] == 'add']
+    updates = [operation for operation in operations if operation['op'] == 'update']
+    deletes = [operation['id'] for operation in operations if operation['op'] == 'delete']
+
+    targets = [operation['id'] for operation in updates] + deletes
+    duplicated = sorted(pk for pk, count in Counter(targets).items() if count > 1)
+    if duplicated:
+        raise ValidationError(
+            {'operations': f"Cada UserCard solo puede aparecer en una operación: {', '.join(map(str, duplicated))}."}
+        )
+
+    card_ids = {operation['card'] for operation in adds}
+    if card_ids:
+        unknown = card_ids - set(Card.objects.filter(id__in=card_ids).values_list('id', flat=True)) # pylint: disable=no-member
+        if unknown:
+            raise ValidationError({'operations': f"Cartas no encontradas: {', '.join(map(str, sorted(unknown)))}."})
+
+    with transaction.atomic(), batch_collection_stats():
+        owned = _owned(user, targets) if targets else {}
+
+        # Una sentencia por combinación de campos modificados
+        by_fields = {}
+        for operation in updates:
+            instance = owned[operation['id']]
+            changed = tuple(sorted(name for name in ADD_FIELDS if name in operation))
+            for name in changed:
+                setattr(instance, name, operation[name])
+            instance.updated_at = timezone.now()
+            by_fields.setdefault(changed, []).append(instance)
+        for changed, instances in by_fields.items():
+            UserCard.objects.bulk_update(instances, [*changed, 'updated_at']) # pylint: disable=no-member
+        # bulk_update y el INSERT en crudo no emiten señales (el DELETE sí)
+        mark_changed(user.pk, {instance.card_id for instances in by_fields.values() for instance in instances})
+        mark_changed(user.pk, card_ids)
+
+        if deletes:
+            UserCard.objects.filter(user=user, id__in=deletes).delete() # pylint: disable=no-member
+
+        added = upsert_user_cards(_add_rows(user, adds))
+
+    return {
+        'added': added,
+        'updated': sorted(operation['id'] for operation in updates),
+        'deleted': sorted(deletes),
+    }
+
+
+# Campos de cada instancia dentro de un grupo (mismo orden que la respuesta histórica)
+INSTANCE_FIELDS = ['id', 'quantity', 'language', 'condition', 'is_holographic', 'is_first_edition',
+                   'is_signed', 'grade', 'notes', 'is_favorite', 'created_at', 'updated_at']
+BOOLEAN_INSTANCE_FIELDS = ['is_holographic', 'is_first_edition', 'is_signed', 'is_favorite']
+
+
+class _JSONGroupArray(Aggregate): # pylint: disable=abstract-method
+    """json_group_array() de SQLite, equivalente a JSONB_AGG"""
+    function = 'JSON_GROUP_ARRAY'
+    output_field = JSONField()
+
+
+def grouped_user_cards(user, expansion_id=None):
+    """
+    Colección del usuario agrupada por carta, un dict por carta con sus totales y la lista de
+    instancias, ordenada por expansión y nombre. Es un queryset: se puede contar y paginar en SQL.
+    """
+    queryset = UserCard.objects.filter(user=user) # pylint: disable=no-member
+    if expansion_id is not None:
+        queryset = queryset.filter(card__expansion_id=expansion_id)
+
+    instance = JSONObject(**{name: F(name) for name in INSTANCE_FIELDS})
+    if connection.vendor == 'postgresql':
+        instances, any_favorite = JSONBAgg(instance, order_by='id'), BoolOr('is_favorite')
+    else:
+        instances, any_favorite = _JSONGroupArray(instance), Max('is_favorite')
+
+    return queryset.values('card_id').annotate(
+        card_name=F('card__name'),
+        expansion_name=F('card__expansion__name'),
+        expansion_id=F('card__expansion_id'),
+        card_image=F('card__image_url_small'),
+        total_quantity=Sum('quantity'),
+        instances_count=Count('id'),
+        is_any_favorite=any_favorite,
+        instances=instances,
+    ).order_by('expansion_name', 'card_name', 'card_id')
+
+
+def normalize_groups(groups):
+    """En SQLite los booleanos llegan como 0/1 (también dentro del JSON): se devuelven como bool"""
+    groups = list(groups)
+    if connection.vendor != 'postgresql':
+        for group in groups:
+            group['is_any_favorite'] = bool(group['is_any_favorite'])
+            for item in group['instances']:
+                for name in BOOLEAN_INSTANCE_FIELDS:
+                    item[name] = bool(item[name])
+    return groups
+
+
+def annotate_owned(queryset, user):
+    """
+    Cartas con owned_quantity, owned_variants y owned_favorites del usuario: LEFT JOIN a sus UserCards
+    (FilteredRelation, la condición va en el ON) agregado por carta. Las que no tiene quedan a 0.
+    """
+    return queryset.annotate(
+        owned_rows=FilteredRelation('user_instances', condition=Q(user_instances__user=user)),
+    ).annotate(
+        owned_quantity=Coalesce(Sum('owned_rows__quantity'), 0),
+        owned_variants=Count('owned_rows__id'),
+        owned_favorites=Count('owned_rows__id', filter=Q(owned_rows__is_favorite=True)),
+    )
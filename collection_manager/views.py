@@ -1,32 +1,188 @@
 # pokemon_tcg_tracker_project/collection_manager/views.py
-from django.db import IntegrityError
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from django.contrib.auth import get_user_model
-from django.db.models import Count, Q
+from django.db.models import F
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework import generics, permissions, status, serializers
 from rest_framework.permissions import IsAuthenticated
 from rest_framework_simplejwt.authentication import JWTAuthentication
-from .models import Expansion, Card, UserCard
+from .models import Expansion, Card, UserCard, UserCollectionStats, UserExpansionStats
 from rest_framework.response import Response
-from .serializers import ExpansionSerializer, CardSerializer, UserCardSerializer, UserSerializer, ExpansionWithCountSerializer
+from .pagination import CardFilterPagination, GroupedCardsPagination, KeysetPagination, SearchPagination, UserCardKeysetPagination
+from .serializers import ExpansionSerializer, CardSerializer, UserCardSerializer, UserSerializer, ExpansionWithCountSerializer, requested_fields
+from .serializers import OwnedCardSerializer, UserCardBulkSerializer, UserCollectionStatsSerializer, UserExpansionStatsSerializer
 from django.shortcuts import render, get_object_or_404
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from .renderers import CSVRenderer, NDJSONRenderer, ORJSONRenderer
+from .catalog_cache import get_card_list_blob, get_expansion_list_blob
+from .catalog_version import get_catalog_version
+from .collection_export import EXPORT_FORMATS, export_collection
+from .completion import completion_for_user, expansion_completion
+from .facets import apply_facet_filters, facet_counts, facet_filters
+from .search import search_cards
+from .typeahead import get_typeahead
+from .user_collection import annotate_owned, apply_operations, grouped_user_cards, normalize_groups
 
 
-class ExpansionListView(generics.ListAPIView):
+class CatalogConditionalGetMixin:
+    """
+    GET condicional para endpoints del catálogo: el ETag y Last-Modified salen de CatalogVersion,
+    que solo cambia cuando una importación escribe en el catálogo. Si el cliente ya tiene esa
+    versión se responde 304 sin consultar las cartas ni ejecutar el serializer.
+    Se evalúa después de la autenticación/permisos de DRF. Cache-Control es public solo en las
+    vistas sin autenticación; las que piden token responden private con Vary: Authorization.
+    """
+
+    def get(self, request, *args, **kwargs):
+        version, updated_at = get_catalog_version()
+        etag = f'"catalog-v{version}-{request.accepted_renderer.format}"' # JSON y API navegable son representaciones distintas
+        last_modified = int(updated_at.timestamp()) if updated_at else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        if self.is_public():
+            patch_cache_control(response, public=True, max_age=settings.CATALOG_CACHE_MAX_AGE)
+            patch_vary_headers(response, ['Accept'])
+        else:
+            # Requiere token: un proxy/CDN compartido no debe servirla a otros clientes
+            patch_cache_control(response, private=True, max_age=settings.CATALOG_CACHE_MAX_AGE)
+            patch_vary_headers(response, ['Accept', 'Authorization'])
+        return response
+
+    def is_public(self):
+        """Sin autenticación (CardDetailView): la respuesta puede guardarse en cachés compartidas"""
+        return all(isinstance(permission, permissions.AllowAny) for permission in self.get_permissions())
+
+
+def only_requested_card_columns(queryset, request, keys=('name',)):
+    """
+    ?fields=: no leer de la BD las columnas que no se van a serializar (attacks, abilities...).
+    `keys` son columnas que la vista necesita aunque no se pidan (por defecto name, la clave del cursor).
+    """
+    fields = requested_fields(request)
+    if not fields:
+        return queryset
+    columns = CardSerializer.only_columns(fields)
+    if not any(column.startswith('expansion') for column in columns):
+        queryset = queryset.select_related(None)
+    return queryset.only(*keys, *columns)
+
+
+def requested_includes(request):
+    """Anotaciones opcionales pedidas con ?include=owned,..."""
+    return {name.strip() for name in request.query_params.get('include', '').split(',') if name.strip()}
+
+
+def serves_catalog_blob(request):
+    """La respuesta por defecto (JSON, sin ?fields= ni paginación) se sirve desde los blobs precalculados"""
+    params = request.query_params
+    return request.accepted_renderer.format == 'json' and not any(
+        name in params for name in ('fields', 'cursor', 'page_size')
+    )
+
+
+class ExpansionListView(CatalogConditionalGetMixin, generics.ListAPIView):
     queryset = Expansion.objects.all() # pylint: disable=no-member
     serializer_class = ExpansionSerializer
     permission_classes = [IsAuthenticated] # No se requiere autenticación para listar expansiones (datos públicos)
+    pagination_class = KeysetPagination # Opcional: ?cursor= / ?page_size=
+
+    def list(self, request, *args, **kwargs):
+        if serves_catalog_blob(request):
+            return HttpResponse(get_expansion_list_blob(), content_type='application/json')
+        return super().list(request, *args, **kwargs)
 
-class CardListView(generics.ListAPIView): # <--- AÑADE ESTO
+class CardListView(CatalogConditionalGetMixin, generics.ListAPIView): # <--- AÑADE ESTO
+    """
+    Cartas de una expansión. Con ?include=owned cada carta lleva "owned" {quantity, variants, is_favorite}
+    del usuario autenticado, calculado en la misma consulta (con ?fields= hay que pedir también owned).
+    """
     serializer_class = CardSerializer
     permission_classes = [IsAuthenticated] # No se requiere autenticación para listar cartas (datos públicos)
+    pagination_class = KeysetPagination # Opcional: ?cursor= / ?page_size=
+
+    def includes_owned(self):
+        return 'owned' in requested_includes(self.request)
+
+    def get(self, request, *args, **kwargs):
+        if self.includes_owned():
+            # Respuesta por usuario: sin el ETag público del catálogo
+            response = super(CatalogConditionalGetMixin, self).get(request, *args, **kwargs)
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+        return super().get(request, *args, **kwargs)
+
+    def get_serializer_class(self):
+        return OwnedCardSerializer if self.includes_owned() else CardSerializer
 
     def get_queryset(self):
         # Obtiene el api_id de la expansión desde los parámetros de la URL
         expansion_api_id = self.kwargs['expansion_api_id']
-        # Filtra las cartas que pertenecen a esa expansión
-        return Card.objects.filter(expansion__api_id=expansion_api_id) # pylint: disable=no-member
+        # Filtra las cartas que pertenecen a esa expansión; expansion_name sale del mismo JOIN
+        queryset = Card.objects.filter(expansion__api_id=expansion_api_id).select_related('expansion') # pylint: disable=no-member
+        queryset = only_requested_card_columns(queryset, self.request)
+        if self.includes_owned():
+            queryset = annotate_owned(queryset, self.request.user)
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        if serves_catalog_blob(request) and not self.includes_owned():
+            blob = get_card_list_blob(self.kwargs['expansion_api_id'])
+            if blob is not None:
+                return HttpResponse(blob, content_type='application/json')
+        return super().list(request, *args, **kwargs)
     
+class CardSearchView(generics.ListAPIView):
+    """
+    Búsqueda de cartas por nombre, ataques/habilidades, artista y flavor text (?q=),
+    ordenada por relevancia y paginada (?page=, ?page_size=). Admite ?fields=.
+    """
+    serializer_class = CardSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = SearchPagination
+
+    def get_queryset(self):
+        text = self.request.query_params.get('q', '').strip()
+        if not text:
+            raise serializers.ValidationError({'q': 'Este parámetro es obligatorio.'})
+        return search_cards(text).select_related('expansion')
+
+class CardFilterView(generics.ListAPIView):
+    """
+    Cartas filtradas por facetas (?types=, ?rarity=, ?artist=, ?series=, ?retreat_cost=, ?hp_min=, ?hp_max=;
+    ver facets.py) con el recuento de cada faceta (sin su propio filtro). Paginado por cursor; admite ?fields=.
+    Respuesta: {"count", "facets", "next", "results"}.
+    """
+    queryset = Card.objects.all() # pylint: disable=no-member
+    serializer_class = CardSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = CardFilterPagination
+
+    def list(self, request, *args, **kwargs):
+        filters = facet_filters(request.query_params)
+        queryset = apply_facet_filters(self.get_queryset(), filters)
+        total, facets = facet_counts(self.get_queryset(), filters)
+        page = self.paginate_queryset(
+            only_requested_card_columns(queryset.select_related('expansion'), request)
+        )
+        serializer = self.get_serializer(page, many=True)
+        return Response({
+            'count': total,
+            'facets': facets,
+            'next': self.paginator.get_next_link(),
+            'results': serializer.data,
+        })
+
 class UserCardCreateView(generics.CreateAPIView):
     queryset = UserCard.objects.all() # pylint: disable=no-member
     serializer_class = UserCardSerializer
@@ -35,29 +191,155 @@ class UserCardCreateView(generics.CreateAPIView):
 
     def perform_create(self, serializer):
         try:
-            serializer.save(user=self.request.user)
+            with transaction.atomic(): # La carta y las estadísticas de la colección juntas
+                serializer.save(user=self.request.user)
         except IntegrityError as exc:
             raise serializers.ValidationError(
                 {"detail": "Ya tienes esta carta con esos atributos en tu colección."}
             ) from exc
 
+class UserCardBulkView(generics.GenericAPIView):
+    """
+    Varias altas/cambios/bajas en la colección en una sola petición y transacción
+    (importar o escanear cientos de cartas). Añadir una variante que ya existe suma su cantidad.
+    Respuesta: {"added": [ids], "updated": [ids], "deleted": [ids]}.
+    """
+    serializer_class = UserCardBulkSerializer
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            result = apply_operations(request.user, serializer.validated_data['operations'])
+        except IntegrityError as exc:
+            raise serializers.ValidationError(
+                {"detail": "Un cambio choca con otra variante de la misma carta en tu colección."}
+            ) from exc
+        return Response(result)
+
 # (Opcional, pero muy recomendado para la prueba y futuro)
 # Esta vista te permitirá listar todas las cartas que posee un usuario específico.
 class UserCardListView(generics.ListAPIView):
     serializer_class = UserCardSerializer
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated] # Solo usuarios autenticados pueden ver su colección
+    pagination_class = UserCardKeysetPagination # Opcional: ?cursor= / ?page_size=
 
     def get_queryset(self):
         # Filtra el queryset para devolver solo las UserCards que pertenecen al usuario autenticado.
-        return UserCard.objects.filter(user=self.request.user) # pylint: disable=no-member
+        return UserCard.objects.filter(user=self.request.user).select_related('card__expansion') # pylint: disable=no-member
+
+class UserCardExportView(generics.GenericAPIView):
+    """
+    Exporta la colección completa del usuario en streaming: /api/user-cards/export/csv/ o .../ndjson/.
+    Las filas se leen por bloques (collection_export.py), la memoria no depende del tamaño de la colección.
+    """
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    # Accept: text/csv o application/x-ndjson no da 406; los errores siguen saliendo en JSON
+    renderer_classes = [ORJSONRenderer, CSVRenderer, NDJSONRenderer]
 
-class CardDetailView(generics.RetrieveAPIView):
-    queryset = Card.objects.all() # pylint: disable=no-member Define el conjunto de objetos donde la vista buscará
+    def finalize_response(self, request, response, *args, **kwargs):
+        if isinstance(response, Response): # Error (401, 404...): JSON aunque se pidiera CSV / NDJSON
+            request.accepted_renderer = ORJSONRenderer()
+            request.accepted_media_type = ORJSONRenderer.media_type
+        return super().finalize_response(request, response, *args, **kwargs)
+
+    def get(self, request, export_format):
+        if export_format not in EXPORT_FORMATS:
+            raise Http404(f"Formato de exportación desconocido: {export_format}")
+        response = StreamingHttpResponse(
+            export_collection(request.user.pk, export_format), content_type=EXPORT_FORMATS[export_format]
+        )
+        response['Content-Disposition'] = f'attachment; filename="collection-{request.user.username}.{export_format}"'
+        patch_cache_control(response, private=True, no_store=True)
+        return response
+
+class CardDetailView(CatalogConditionalGetMixin, generics.RetrieveAPIView):
+    queryset = Card.objects.select_related('expansion') # pylint: disable=no-member Define el conjunto de objetos donde la vista buscará
     serializer_class = CardSerializer # Usa el serializador que ya tienes para Card
     lookup_field = 'api_id' # ¡IMPORTANTE! Le dice a DRF que use el campo 'api_id' del modelo Card para buscar la carta, no el 'id' por defecto.
     permission_classes = [] # Permite el acceso sin necesidad de autenticación (son datos públicos)
     
+class CardBatchView(generics.GenericAPIView):
+    """
+    Varias cartas en una petición (listas de mazo, intercambios, wishlists):
+    GET ?ids=base1-4,base1-2 (api_id) o ?pks=12,15 (id), o POST {"ids": [...]} / {"pks": [...]}
+    para listas largas. Se resuelven con una sola consulta IN. Admite ?fields= como el detalle.
+    Respuesta: {"results": {<id pedido>: carta}, "missing": [ids no encontrados]}.
+    """
+    serializer_class = CardSerializer
+    permission_classes = [] # Datos públicos, igual que CardDetailView
+    max_ids = 500
+
+    def get(self, request, *args, **kwargs):
+        params = request.query_params
+        if 'pks' in params:
+            return self.lookup('pks', params.get('pks').split(','))
+        return self.lookup('ids', params.get('ids', '').split(','))
+
+    def post(self, request, *args, **kwargs):
+        if not isinstance(request.data, dict): # p. ej. un array JSON en lugar de {"ids": [...]}
+            raise serializers.ValidationError({'ids': 'El cuerpo debe ser un objeto {"ids": [...]} o {"pks": [...]}.'})
+        key = 'pks' if 'pks' in request.data else 'ids'
+        values = request.data.get(key)
+        if not isinstance(values, list):
+            raise serializers.ValidationError({key: 'Debe ser una lista.'})
+        return self.lookup(key, values)
+
+    def lookup(self, key, values):
+        # Sin vacíos ni duplicados, en el orden pedido
+        values = list(dict.fromkeys(str(value).strip() for value in values if str(value).strip()))
+        if not values:
+            raise serializers.ValidationError({key: 'Indica al menos una carta.'})
+        if len(values) > self.max_ids:
+            raise serializers.ValidationError({key: f'Como máximo {self.max_ids} cartas por petición.'})
+
+        if key == 'pks':
+            if not all(value.isdigit() for value in values):
+                raise serializers.ValidationError({key: 'Los ids deben ser números enteros.'})
+            column, lookup_values = 'id', [int(value) for value in values]
+        else:
+            column, lookup_values = 'api_id', values
+
+        queryset = Card.objects.filter(**{f'{column}__in': lookup_values}).select_related('expansion') # pylint: disable=no-member
+        queryset = only_requested_card_columns(queryset, self.request, keys=(column,))
+        cards = {str(getattr(card, column)): card for card in queryset}
+
+        found = [value for value in values if value in cards]
+        data = self.get_serializer([cards[value] for value in found], many=True).data
+        return Response({
+            'results': dict(zip(found, data)),
+            'missing': [value for value in values if value not in cards],
+        })
+
+class TypeaheadView(generics.GenericAPIView):
+    """
+    Autocompletado de nombres (?q=char&limit=10&kind=cards|expansions) desde el índice en memoria
+    de typeahead.py: no consulta la BD salvo para comprobar de vez en cuando la versión del catálogo.
+    Respuesta: {"expansions": [...], "cards": [...]}.
+    """
+    permission_classes = [] # Datos públicos, igual que CardDetailView
+    default_limit = 10
+    max_limit = 50
+
+    def get(self, request, *args, **kwargs):
+        text = request.query_params.get('q', '')
+        try:
+            limit = int(request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            limit = self.default_limit
+        limit = min(max(limit, 1), self.max_limit)
+        kind = request.query_params.get('kind')
+
+        index = get_typeahead()
+        return Response({
+            'expansions': index.expansions.search(text, limit) if kind in (None, 'expansions') else [],
+            'cards': index.cards.search(text, limit) if kind in (None, 'cards') else [],
+        })
+
 User = get_user_model()
 
 class RegisterView(generics.CreateAPIView):
@@ -72,92 +354,88 @@ class UserCardDetailView(generics.RetrieveUpdateDestroyAPIView):
     lookup_field = 'pk'
 
     def get_queryset(self):
-        return UserCard.objects.filter(user=self.request.user) # pylint: disable=no-member Define el conjunto de objetos donde la vista buscará
-    
+        return UserCard.objects.filter(user=self.request.user).select_related('card__expansion') # pylint: disable=no-member Define el conjunto de objetos donde la vista buscará
+
+    # Cambio y estadísticas de la colección (collection_stats) en la misma transacción
+    @transaction.atomic
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        super().perform_destroy(instance)
+
 class UserExpansionsView(generics.ListAPIView):
     serializer_class = ExpansionWithCountSerializer
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        # Query corregida con el related_name correcto
-        expansion_ids = UserCard.objects.filter(
-            user=self.request.user
-        ).values_list('card__expansion_id', flat=True).distinct()
-        
-        user_expansions = Expansion.objects.filter(
-            id__in=expansion_ids
+        # Conteos precalculados en UserExpansionStats (collection_stats.py)
+        return Expansion.objects.filter(
+            user_stats__user=self.request.user
         ).annotate(
-            user_cards_count=Count(
-                'cards__user_instances',  # ← CORRECTO: usar 'user_instances'
-                filter=Q(cards__user_instances__user=self.request.user)
-            )
+            user_cards_count=F('user_stats__variants')
         ).order_by('name')
-        
-        return user_expansions
+
+class UserCollectionStatsView(generics.RetrieveAPIView):
+    """Totales de la colección del usuario (una lectura por clave primaria)"""
+    serializer_class = UserCollectionStatsSerializer
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get_object(self):
+        # Sin fila todavía = colección vacía
+        return UserCollectionStats.objects.filter(pk=self.request.user.pk).first() or UserCollectionStats(user=self.request.user)
+
+class UserExpansionStatsView(generics.ListAPIView):
+    """Totales de la colección del usuario por expansión"""
+    serializer_class = UserExpansionStatsSerializer
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return UserExpansionStats.objects.filter(user=self.request.user).select_related('expansion').order_by('expansion__name')
+
+class UserCompletionView(generics.GenericAPIView):
+    """
+    Compleción de todas las expansiones para el usuario (completion.py): cartas poseídas, que faltan
+    y porcentaje por expansión. ?started=true devuelve solo las expansiones con alguna carta.
+    """
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        started_only = request.query_params.get('started', '').lower() in ('1', 'true')
+        return Response(completion_for_user(request.user.pk, started_only=started_only))
+
+class UserExpansionCompletionView(generics.GenericAPIView):
+    """Compleción de una expansión con las cartas que tiene el usuario y las que le faltan"""
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, expansion_api_id):
+        expansion = get_object_or_404(Expansion, api_id=expansion_api_id)
+        return Response(expansion_completion(request.user.pk, expansion))
 
 class UserCardsGroupedView(generics.GenericAPIView):
     """
-    Vista para obtener cartas del usuario agrupadas por carta y expansión
+    Vista para obtener cartas del usuario agrupadas por carta y expansión.
+    La agrupación se hace en SQL (user_collection.grouped_user_cards). ?expansion_id= filtra por
+    expansión; con ?page= (y ?page_size=) se devuelve una página de grupos {"count", "next",
+    "previous", "results"}; sin ?page= la lista completa como siempre.
     """
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
-    
+    pagination_class = GroupedCardsPagination
+
     def get(self, request):
-        """
-        Agrupa cartas del usuario por carta y expansión, devolviendo información resumida
-        y todas las instancias de cada grupo
-        """
-        user_cards = UserCard.objects.filter(
-            user=request.user
-        ).select_related('card', 'card__expansion').order_by('card__name', 'card__expansion__name')
-        
-        # Agrupar por carta y expansión
-        grouped_cards = {}
-        
-        for user_card in user_cards:
-            # Crear clave única para cada combinación carta-expansión
-            key = f"{user_card.card.id}_{user_card.card.expansion.id}"
-            
-            if key not in grouped_cards:
-                grouped_cards[key] = {
-                    'card_id': user_card.card.id,
-                    'card_name': user_card.card.name,
-                    'expansion_name': user_card.card.expansion.name,
-                    'expansion_id': user_card.card.expansion.id,
-                    'card_image': user_card.card.image_url_small,
-                    'total_quantity': 0,
-                    'instances_count': 0,
-                    'is_any_favorite': False,
-                    'instances': []
-                }
-            
-            # Agregar a los totales
-            grouped_cards[key]['total_quantity'] += user_card.quantity
-            grouped_cards[key]['instances_count'] += 1
-            
-            # Si cualquier instancia es favorita, marcar el grupo como favorito
-            if user_card.is_favorite:
-                grouped_cards[key]['is_any_favorite'] = True
-            
-            # Agregar instancia individual
-            grouped_cards[key]['instances'].append({
-                'id': user_card.id,
-                'quantity': user_card.quantity,
-                'language': user_card.language,
-                'condition': user_card.condition,
-                'is_holographic': user_card.is_holographic,
-                'is_first_edition': user_card.is_first_edition,
-                'is_signed': user_card.is_signed,
-                'grade': user_card.grade,
-                'notes': user_card.notes,
-                'is_favorite': user_card.is_favorite,
-                'created_at': user_card.created_at.isoformat(),
-                'updated_at': user_card.updated_at.isoformat()
-            })
-        
-        # Convertir a lista y ordenar por nombre de carta
-        result = list(grouped_cards.values())
-        result.sort(key=lambda x: (x['expansion_name'], x['card_name']))
-        
-        return Response(result)
\ No newline at end of file
+        expansion_id = request.query_params.get('expansion_id')
+        if expansion_id and not expansion_id.isdigit():
+            raise serializers.ValidationError({'expansion_id': 'Debe ser un número entero.'})
+        groups = grouped_user_cards(request.user, int(expansion_id) if expansion_id else None)
+
+        if 'page' in request.query_params:
+            page = self.paginate_queryset(groups)
+            return self.get_paginated_response(normalize_groups(page))
+        return Response(normalize_groups(groups))
@@ -19,6 +19,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 # API_KEY = os.getenv('POKEMON_TCG_API_KEY') # Así la cargarías si la necesitaras
 # ...
 
+import tempfile
 from pathlib import Path
 from datetime import timedelta
 
@@ -47,6 +48,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',     # Búsqueda full-text y trigramas (collection_manager/search.py)
     'rest_framework',              # Agregado
     'corsheaders',                 # Agregado
     'collection_manager',          # Agregado (nombre de mi app)
@@ -58,9 +60,50 @@ INSTALLED_APPS = [
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
-    )
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'collection_manager.renderers.ORJSONRenderer', # JSON con orjson (collection_manager/renderers.py)
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
 }
 
+# Cliente HTTP de la API de Pokémon TCG (collection_manager/pokemontcg_client.py)
+POKEMON_TCG_CACHE_DIR = BASE_DIR / '.cache' / 'pokemontcg' # Caché en disco de respuestas; None la desactiva
+POKEMON_TCG_CACHE_TTL = 60 * 60 * 6 # Segundos en los que se sirve desde disco sin revalidar (ETag/Last-Modified)
+POKEMON_TCG_POOL_SIZE = 16 # Conexiones keep-alive reutilizables (>= workers de sync_catalog x páginas en paralelo)
+POKEMON_TCG_RATE_LIMIT = 5 # Peticiones por segundo (token bucket compartido por todos los hilos)
+POKEMON_TCG_RATE_BURST = 10 # Ráfaga máxima permitida por el token bucket
+POKEMON_TCG_MAX_RETRIES = 5 # Reintentos ante 429/5xx/errores de conexión, con backoff exponencial + jitter
+POKEMON_TCG_BACKOFF_BASE = 0.5 # Segundos del primer backoff (se duplica en cada reintento)
+POKEMON_TCG_BACKOFF_MAX = 30 # Tope del backoff en segundos
+
+# Caché HTTP de los endpoints públicos del catálogo (ETag derivado de CatalogVersion)
+CATALOG_CACHE_MAX_AGE = 60 # Segundos que navegador/proxy pueden reutilizar la respuesta antes de revalidar
+CATALOG_BLOB_CACHE = 'catalog' # Alias de CACHES para el JSON precalculado del catálogo (collection_manager/catalog_cache.py)
+CATALOG_BLOB_TIMEOUT = 60 * 60 * 24 # Las importaciones reescriben los blobs; esto acota los cambios hechos a mano (admin)
+
+# 'default' es la LocMemCache por proceso de Django. Los blobs del catálogo van en su propia caché,
+# que tiene que ser compartida entre procesos: el comando de importación los reconstruye y los
+# workers web los sirven. FileBasedCache lo es en un mismo host/contenedor; con varios hosts usar
+# Redis/Memcached (p. ej. django.core.cache.backends.redis.RedisCache).
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'catalog': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': Path(tempfile.gettempdir()) / 'pokemon_tcg_ai' / 'catalog',
+        'OPTIONS': {'MAX_ENTRIES': 5000}, # ~ un blob por expansión
+    },
+}
+
+# Autocompletado en memoria (collection_manager/typeahead.py)
+TYPEAHEAD_VERSION_CHECK_SECONDS = 5 # Cada cuánto comprueba un worker si el catálogo cambió (y reconstruye el índice)
+
+# Compresión de respuestas (collection_manager/middleware.py)
+RESPONSE_COMPRESSION_MIN_BYTES = 1024 # Por debajo de esto no compensa comprimir
+RESPONSE_BROTLI_QUALITY = 5 # 0-11: 5 da casi la ratio de 11 con una fracción del tiempo de CPU
+
 # CORS CONFIGURATION
 #CORS_ALLOW_ALL_ORIGINS = True # Para desarrollo, permite cualquier origen
 #En producción, esto debería ser False y especificar CORS_ALLOWED_ORIGINS
@@ -90,6 +133,7 @@ CORS_ALLOW_METHODS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'collection_manager.middleware.CompressionMiddleware', # brotli/gzip por encima de RESPONSE_COMPRESSION_MIN_BYTES
     'corsheaders.middleware.CorsMiddleware', # Agregado para CORS
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -7,10 +7,20 @@ For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/wsgi/
 """
 
+import logging
 import os
 
 from django.core.wsgi import get_wsgi_application
+from django.db import DatabaseError
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'pokemon_tcg_ai.settings')
 
 application = get_wsgi_application()
+
+# Índice de autocompletado construido al arrancar el worker, no en la primera pulsación
+from collection_manager.typeahead import get_typeahead  # noqa: E402
+
+try:
+    get_typeahead()
+except DatabaseError as exc:
+    logging.getLogger(__name__).warning(f"Typeahead index not built at startup: {exc}")